@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hackathons.models import Hackathon, HackathonApplication
+from teams.models import Team, TeamInvitation, TeamMembership
+from users.models import User
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        self.other = User.objects.create_user(username='bob', email='bob@example.com', password='pass12345', name='Bob')
+        for i, status in enumerate(['applied', 'team_pending', 'confirmed']):
+            hackathon = Hackathon.objects.create(
+                title=f'Hack {i}', organizer=self.other, max_participants=50,
+                start_date=now + timedelta(days=10), end_date=now + timedelta(days=12),
+                registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=5),
+            )
+            HackathonApplication.objects.create(user=self.user, hackathon=hackathon, status=status)
+            led = Team.objects.create(name=f'Led {i}', hackathon=hackathon, team_leader=self.user)
+            TeamMembership.objects.create(team=led, user=self.user, role='leader', status='active', joined_at=now)
+            TeamMembership.objects.create(team=led, user=self.other, status='active', joined_at=now)
+            other = Team.objects.create(name=f'Other {i}', hackathon=hackathon, team_leader=self.other)
+            TeamMembership.objects.create(team=other, user=self.user, invited_by=self.user, status='pending')
+            TeamInvitation.objects.create(team=other, inviter=self.other, invitee=self.user, expires_at=now + timedelta(days=7))
+            TeamInvitation.objects.create(team=led, inviter=self.user, invitee=self.other, expires_at=now + timedelta(days=7))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_sections_match_standalone_endpoints(self):
+        data = self.client.get('/api/dashboard/').data
+
+        self.assertEqual(data['user'], self.client.get('/api/auth/profile/').data['user'])
+        self.assertEqual(data['applications'], self.client.get('/api/hackathons/my/applications/').data['applications'])
+        self.assertEqual(data['teams'], self.client.get('/api/teams/my/').data['teams'])
+        self.assertEqual(data['requests'], self.client.get('/api/teams/all-requests/').data['data'])
+        self.assertEqual(data['available_hackathons'], self.client.get('/api/teams/available-hackathons/').data['hackathons'])
+        self.assertEqual(data['user_hackathons'], self.client.get('/api/hackathons/matching/user-hackathons/').data['hackathons'])
+        self.assertEqual(len(data['teams']), 3)
+        self.assertEqual(data['teams'][0]['current_member_count'], 2)
+
+    def test_query_count_is_bounded(self):
+        # applications, memberships, teams, active members, invitations
+        with self.assertNumQueries(5):
+            self.client.get('/api/dashboard/')
+
+        hackathon = Hackathon.objects.first()
+        for i in range(5):
+            team = Team.objects.create(name=f'More {i}', hackathon=hackathon, team_leader=self.user)
+            TeamMembership.objects.create(team=team, user=self.user, role='leader', status='active')
+        with self.assertNumQueries(5):
+            self.client.get('/api/dashboard/')
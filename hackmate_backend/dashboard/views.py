@@ -0,0 +1,57 @@
+from django.db.models import Q
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from hackathons.serializers import HackathonApplicationSerializer
+from hackathons.views import PARTICIPATING_STATUSES, serialize_user_hackathon
+from teams import inbox
+from teams.models import Team, TeamInvitation
+from teams.serializers import TeamListSerializer
+from teams.views import TEAM_ELIGIBLE_STATUSES, serialize_available_hackathon
+from users.serializers import UserSerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard(request):
+    """
+    The sections the dashboard used to fetch separately (profile, applications,
+    teams, requests, available and participated hackathons) in one response.
+    Each section matches its standalone endpoint; overlapping data is loaded
+    once: applications with their hackathons, the user's memberships with their
+    teams, and sent and received invitations together.
+    """
+    user = request.user
+
+    # Through the reverse manager so application.user is this user, not a query
+    applications = list(user.hackathon_applications.select_related('hackathon'))
+
+    memberships = list(user.team_memberships.select_related('team__hackathon').order_by('-invited_at'))
+    active_team_ids = [m.team_id for m in memberships if m.status == 'active']
+    teams = Team.objects.filter(
+        Q(team_leader=user) | Q(id__in=active_team_ids)
+    ).select_related('hackathon', 'team_leader').with_active_members()
+
+    invitations = list(
+        TeamInvitation.objects.unexpired().filter(Q(invitee=user) | Q(inviter=user))
+        .select_related('team__hackathon', 'inviter', 'invitee').order_by('-created_at')
+    )
+
+    return Response({
+        'success': True,
+        'user': UserSerializer(user).data,
+        'applications': HackathonApplicationSerializer(applications, many=True).data,
+        'teams': TeamListSerializer(teams, many=True).data,
+        'requests': {
+            'join_requests': [inbox.serialize_join_request(m) for m in memberships if m.invited_by_id == user.id],
+            'invitations_received': [inbox.serialize_invitation_received(i) for i in invitations if i.invitee_id == user.id],
+            'invitation_requests_sent': [inbox.serialize_invitation_sent(i) for i in invitations if i.inviter_id == user.id]
+        },
+        'available_hackathons': [
+            serialize_available_hackathon(a) for a in applications if a.status in TEAM_ELIGIBLE_STATUSES
+        ],
+        'user_hackathons': [
+            serialize_user_hackathon(a) for a in applications if a.status in PARTICIPATING_STATUSES
+        ]
+    })
@@ -0,0 +1,69 @@
+from django.db.models import Count, Exists, OuterRef
+
+from users.models import User, UserSkill
+from users.skills import parse_skill_ids
+
+# Applications that still count as registered for directory purposes
+REGISTERED_STATUSES = ['applied', 'team_pending', 'payment_pending', 'confirmed']
+EXPERIENCE_LEVELS = {'beginner', 'intermediate', 'advanced'}
+
+
+def search_participants(hackathon, params, exclude_user=None):
+    """
+    Registered applicants of a hackathon matching the directory filters in
+    `params` (a QueryDict):
+
+    - skills: comma separated, users must have all of them
+    - experience: comma separated experience levels
+    - location: case-insensitive prefix
+    - available: 'true' / 'false' against availability_status
+    - q: case-insensitive name prefix, for autocomplete
+
+    Skills are resolved to canonical ids through the taxonomy (so 'reactjs'
+    finds React users) and each is an EXISTS probe on the UserSkill index,
+    so no JSON is scanned.
+    """
+    users = User.objects.filter(
+        hackathon_applications__hackathon=hackathon,
+        hackathon_applications__status__in=REGISTERED_STATUSES
+    )
+    if exclude_user is not None:
+        users = users.exclude(pk=exclude_user.pk)
+
+    ids, all_known = parse_skill_ids(params.get('skills'))
+    if not all_known:
+        # A skill nobody has ever listed can't match anyone
+        return users.none()
+    for skill_id in ids:
+        users = users.filter(Exists(UserSkill.objects.filter(user=OuterRef('pk'), kind='skill', skill_id=skill_id)))
+
+    levels = {level.strip().lower() for level in params.get('experience', '').split(',')} & EXPERIENCE_LEVELS
+    if levels:
+        users = users.filter(experience_level__in=levels)
+
+    location = params.get('location', '').strip()
+    if location:
+        users = users.filter(location__istartswith=location)
+
+    available = params.get('available', '').lower()
+    if available in ('true', 'false'):
+        users = users.filter(availability_status=available == 'true')
+
+    name = params.get('q', '').strip()
+    if name:
+        users = users.filter(name__istartswith=name)
+
+    return users.only(
+        'id', 'name', 'location', 'experience_level', 'skills',
+        'availability_status', 'github_url', 'average_rating'
+    ).order_by('name', 'id')
+
+
+def skill_facets(users, limit=20):
+    """Most common skills among a directory result set, as [{'id', 'name', 'count'}]"""
+    return list(
+        UserSkill.objects.filter(kind='skill', user__in=users.order_by().values('pk'))
+        .values('skill_id', 'skill__name')
+        .annotate(count=Count('user_id'))
+        .order_by('-count', 'skill__name')[:limit]
+    )
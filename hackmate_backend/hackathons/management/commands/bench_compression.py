@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from hackathons.models import Hackathon
+from hackathons.serializers import HackathonSerializer
+from hackmate_backend.middleware import ENCODERS, compress
+from .bench_json import participant_rows
+
+
+def with_github_info(rows):
+    """Participant matches embed a githubInfo blob per user"""
+    for i, row in enumerate(rows):
+        row['githubInfo'] = {
+            'login': f'user{i}', 'public_repos': i % 40, 'followers': i % 300,
+            'top_languages': ['Python', 'TypeScript', 'Go'][:1 + i % 3],
+            'bio': 'Open source contributor and hackathon regular',
+        }
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure what CompressionMiddleware saves on representative API payloads: '
+        'bytes on the wire, compression time, and transfer time at a given bandwidth.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=500,
+            help='Rows in the synthetic participant matches payload (default: 500)'
+        )
+        parser.add_argument(
+            '--mbps', type=float, default=10.0,
+            help='Link speed used to turn bytes into transfer time (default: 10 Mbit/s)'
+        )
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        payloads = {
+            'participants': renderer.render({'participants': with_github_info(participant_rows(options['rows']))}),
+            'hackathon_list': renderer.render({'hackathons': HackathonSerializer(Hackathon.objects.all(), many=True).data}),
+        }
+        bytes_per_ms = options['mbps'] * 1_000_000 / 8 / 1000
+
+        for name, body in payloads.items():
+            self.stdout.write(f'{name}: {len(body)} bytes, {len(body) / bytes_per_ms:.1f} ms to send')
+            for encoding in ENCODERS:
+                started = time.perf_counter()
+                compressed = compress(encoding, body)
+                cost = (time.perf_counter() - started) * 1000
+                send = len(compressed) / bytes_per_ms
+                self.stdout.write(
+                    f'  {encoding:<5} {len(compressed):>9} bytes ({len(compressed) / len(body):.0%})  '
+                    f'compress {cost:6.2f} ms + send {send:6.1f} ms  '
+                    f'saves {len(body) / bytes_per_ms - send - cost:6.1f} ms'
+                )
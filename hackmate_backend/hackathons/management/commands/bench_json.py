@@ -0,0 +1,72 @@
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from hackathons.models import Hackathon
+from hackathons.serializers import HackathonSerializer
+from hackmate_backend.fastjson import OrjsonRenderer
+
+
+def participant_rows(count):
+    """Rows shaped like the matching participants list, with raw values the encoder must convert"""
+    now = timezone.now()
+    return [{
+        'id': i,
+        'user_id': uuid.UUID(int=i),
+        'name': f'Participant {i} – Zoë',
+        'skills': ['React', 'Python', 'Machine Learning', 'Kubernetes'][:1 + i % 4],
+        'match_score': Decimal(f'{i % 100}.{i % 7}5'),
+        'compatibility': (i % 97) / 97,
+        'looking_for_team': i % 2 == 0,
+        'bio': None if i % 5 else 'Builds things on weekends',
+        'applied_at': now - timedelta(minutes=i),
+    } for i in range(count)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare OrjsonRenderer with DRF JSONRenderer on large API payloads: '
+        'checks the bytes are identical, then reports renders per second.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=2000,
+            help='Rows in the synthetic participants payload (default: 2000)'
+        )
+        parser.add_argument(
+            '--seconds', type=float, default=2.0,
+            help='How long to time each renderer per payload (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        payloads = {
+            'participants': {'success': True, 'participants': participant_rows(options['rows'])},
+            'hackathon_list': {'success': True, 'hackathons': HackathonSerializer(Hackathon.objects.all(), many=True).data},
+        }
+        stdlib, fast = JSONRenderer(), OrjsonRenderer()
+
+        for name, payload in payloads.items():
+            expected = stdlib.render(payload)
+            if fast.render(payload) != expected:
+                raise CommandError(f'{name}: orjson output differs from JSONRenderer')
+
+            before = self._measure(stdlib, payload, options['seconds'])
+            after = self._measure(fast, payload, options['seconds'])
+            self.stdout.write(
+                f'{name:<16} {len(expected):>9} bytes  identical  '
+                f'stdlib {before:8.1f}/s  orjson {after:8.1f}/s  ({after / before:.1f}x)'
+            )
+
+    def _measure(self, renderer, payload, seconds):
+        renders = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            renderer.render(payload)
+            renders += 1
+        return renders / (time.perf_counter() - started)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:12
+
+from django.db import migrations, models
+
+from users.taxonomy import Resolver
+
+
+def backfill_skill_ids(apps, schema_editor):
+    Hackathon = apps.get_model('hackathons', 'Hackathon')
+    HackathonApplication = apps.get_model('hackathons', 'HackathonApplication')
+    resolver = Resolver(apps)
+
+    hackathons = list(Hackathon.objects.only('id', 'tech_stack'))
+    for hackathon in hackathons:
+        hackathon.tech_stack_ids = resolver.ids(hackathon.tech_stack)
+        hackathon.tech_stack = resolver.names_for(hackathon.tech_stack_ids)
+    Hackathon.objects.bulk_update(hackathons, ['tech_stack', 'tech_stack_ids'], batch_size=500)
+
+    applications = list(HackathonApplication.objects.only('id', 'skills_bringing'))
+    for application in applications:
+        application.skill_ids = resolver.ids(application.skills_bringing)
+        application.skills_bringing = resolver.names_for(application.skill_ids)
+    HackathonApplication.objects.bulk_update(applications, ['skills_bringing', 'skill_ids'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0005_alter_hackathon_description'),
+        ('users', '0008_skill_skillalias_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hackathon',
+            name='tech_stack_ids',
+            field=models.JSONField(blank=True, default=list, help_text='Canonical skill ids for tech_stack'),
+        ),
+        migrations.AddField(
+            model_name='hackathonapplication',
+            name='skill_ids',
+            field=models.JSONField(blank=True, default=list, help_text='Canonical skill ids for skills_bringing'),
+        ),
+        # Nothing to undo: the id columns are dropped by reversing the
+        # AddFields, and the lists keep their canonical spellings since the
+        # original ones aren't stored anywhere
+        migrations.RunPython(backfill_skill_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0006_hackathon_tech_stack_ids_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hackathonapplication',
+            index=models.Index(fields=['updated_at'], name='hackathons__updated_f1e779_idx'),
+        ),
+    ]
@@ -49,6 +49,35 @@ APPROVAL_CHOICES = [
 ]
 
 
+class HackathonQuerySet(models.QuerySet):
+    def refresh_statuses(self, now=None):
+        """
+        Bulk version of Hackathon.update_status_based_on_dates(): one UPDATE
+        per target status instead of a load and save per hackathon. The
+        windows are checked in the same order as that method's if/elif chain,
+        which leaves a hackathon alone until its registration starts, even
+        when its other dates are already past.
+        """
+        now = now or timezone.now()
+        opened = models.Q(registration_start__lte=now)
+        registration_window = opened & models.Q(registration_end__gte=now)
+        before_start = models.Q(registration_end__lt=now, start_date__gt=now)
+        running = models.Q(start_date__lte=now, end_date__gte=now)
+        has_room = models.Q(confirmed_participants__lt=models.F('max_participants'))
+        after_registration = opened & ~registration_window
+
+        transitions = [
+            ('registration_open', registration_window & has_room),
+            ('registration_closed', (registration_window & ~has_room) | (after_registration & before_start)),
+            ('ongoing', after_registration & ~before_start & running),
+            ('completed', after_registration & ~before_start & models.Q(end_date__lt=now)),
+        ]
+        return sum(
+            self.filter(condition).exclude(status=status).update(status=status)
+            for status, condition in transitions
+        )
+
+
 class Hackathon(models.Model):
     # Basic Information
     title = models.CharField(max_length=200)
@@ -58,6 +87,7 @@ class Hackathon(models.Model):
     # Categories and Tags (as JSON fields)
     categories = models.JSONField(default=list, help_text="e.g., ['AI/ML', 'Web Dev', 'Mobile Apps']")
     tech_stack = models.JSONField(default=list, help_text="e.g., ['React', 'Python', 'TensorFlow']")
+    tech_stack_ids = models.JSONField(default=list, blank=True, help_text="Canonical skill ids for tech_stack")
     themes = models.JSONField(default=list, help_text="e.g., ['Healthcare', 'Education', 'Environment']")
     
     # Timing
@@ -103,6 +133,8 @@ class Hackathon(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = HackathonQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
@@ -206,6 +238,7 @@ class HackathonApplication(models.Model):
     
     # Application Details (minimal - most fetched from user profile)
     skills_bringing = models.JSONField(default=list, help_text="Specific skills for this hackathon")
+    skill_ids = models.JSONField(default=list, blank=True, help_text="Canonical skill ids for skills_bringing")
     
     # Team Formation Preferences
     looking_for_team = models.BooleanField(default=False, help_text="Are you looking to join a team?")
@@ -253,6 +286,8 @@ class HackathonApplication(models.Model):
             models.Index(fields=['hackathon', 'status']),
             models.Index(fields=['user', '-applied_at']),
             models.Index(fields=['status', 'payment_status']),
+            # Incremental reconcile_user_stats runs pick up changes by this
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
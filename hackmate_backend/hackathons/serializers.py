@@ -1,7 +1,32 @@
+from django.db import transaction
 from rest_framework import serializers
+from hackmate_backend.serializers import DynamicFieldsMixin
+from users import autocomplete
+from users.skills import resolve_skills
 from .models import Hackathon, HackathonApplication
 
-class HackathonSerializer(serializers.ModelSerializer):
+
+def canonicalize(validated_data, field, ids_field):
+    """Replace a free-text skill list with canonical names and store the matching skill ids"""
+    if isinstance(validated_data.get(field), list):
+        skills = resolve_skills(validated_data[field])
+        validated_data[field] = [skill.name for skill in skills]
+        validated_data[ids_field] = [skill.id for skill in skills]
+    return validated_data
+
+
+def record_uses(kind, names, previous=()):
+    """
+    Count the names newly added to a list field in the autocomplete index,
+    once the save commits so a rolled back write isn't counted
+    """
+    names = names if isinstance(names, list) else []
+    previous = set(previous) if isinstance(previous, list) else set()
+    added = [name for name in names if name not in previous]
+    if added:
+        transaction.on_commit(lambda: autocomplete.record(kind, added))
+
+class HackathonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     organizer_name = serializers.CharField(source='organizer.name', read_only=True)
     
     class Meta:
@@ -11,9 +36,22 @@ class HackathonSerializer(serializers.ModelSerializer):
 class HackathonCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Hackathon
-        exclude = ['organizer', 'total_views', 'total_registrations', 'completion_rate', 'current_participants', 'confirmed_participants']
+        exclude = ['organizer', 'total_views', 'total_registrations', 'completion_rate', 'current_participants', 'confirmed_participants', 'tech_stack_ids']
 
-class HackathonApplicationSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        hackathon = super().create(canonicalize(validated_data, 'tech_stack', 'tech_stack_ids'))
+        record_uses('tech_stack', hackathon.tech_stack)
+        record_uses('theme', hackathon.themes)
+        return hackathon
+
+    def update(self, instance, validated_data):
+        tech_stack, themes = instance.tech_stack, instance.themes
+        hackathon = super().update(instance, canonicalize(validated_data, 'tech_stack', 'tech_stack_ids'))
+        record_uses('tech_stack', hackathon.tech_stack, tech_stack)
+        record_uses('theme', hackathon.themes, themes)
+        return hackathon
+
+class HackathonApplicationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     hackathon_title = serializers.CharField(source='hackathon.title', read_only=True)
     user_name = serializers.CharField(source='user.name', read_only=True)
     
@@ -34,8 +72,14 @@ class HackathonApplicationCreateSerializer(serializers.ModelSerializer):
             'rejection_details', 
             'applied_at',  # Auto-generated
             'confirmed_at', 
-            'updated_at'  # Auto-generated
+            'updated_at',  # Auto-generated
+            'skill_ids'  # Derived from skills_bringing
         ]
+
+    def create(self, validated_data):
+        application = super().create(canonicalize(validated_data, 'skills_bringing', 'skill_ids'))
+        record_uses('skill', application.skills_bringing)
+        return application
         
     def validate(self, data):
         """Custom validation for application data"""
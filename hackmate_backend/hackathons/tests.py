@@ -1,3 +1,331 @@
-from django.test import TestCase
+import gzip
+import json
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
 
-# Create your tests here.
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from hackmate_backend.fastjson import OrjsonParser, OrjsonRenderer
+from hackmate_backend.middleware import CompressionMiddleware, QueryCountMiddleware
+from hackmate_backend.testing import Budget, QueryBudgetMixin
+from users import autocomplete
+from users.models import User
+from users.skills import index_user_skills
+from .models import Hackathon, HackathonApplication
+from .serializers import HackathonCreateSerializer
+
+
+class ParticipantSearchTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.organizer = User.objects.create_user(username='org@example.com', email='org@example.com', password='pass12345', name='Org')
+        self.hackathon = Hackathon.objects.create(
+            title='Test Hack', organizer=self.organizer, max_participants=50,
+            start_date=now + timedelta(days=10), end_date=now + timedelta(days=12),
+            registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=5),
+        )
+        self.leader = self.register('Leader', ['Python'])
+        self.client = APIClient()
+        self.client.force_authenticate(self.leader)
+
+    def register(self, name, skills, status='team_pending', **fields):
+        user = User.objects.create_user(
+            username=name, email=f'{name}@example.com', password='pass12345', name=name, skills=skills, **fields
+        )
+        index_user_skills(user)
+        HackathonApplication.objects.create(user=user, hackathon=self.hackathon, status=status)
+        return user
+
+    def search(self, **params):
+        return self.client.get(f'/api/hackathons/{self.hackathon.id}/participants/search/', params)
+
+    def test_filters_by_all_skills_case_insensitively(self):
+        match = self.register('Ada', ['React', 'Python'])
+        self.register('Bob', ['React'])
+        self.register('Cy', ['react', 'python'], status='cancelled')
+
+        response = self.search(skills='reactjs, PYTHON', facets='true')
+        self.assertEqual([p['id'] for p in response.data['participants']], [match.id])
+        self.assertEqual({f['skill__name'] for f in response.data['skill_facets']}, {'React', 'Python'})
+
+    def test_unknown_skill_matches_nobody(self):
+        self.register('Ada', ['React'])
+        response = self.search(skills='react,cobol')
+        self.assertEqual(response.data['participants'], [])
+
+    def test_experience_availability_and_name_prefix(self):
+        match = self.register('Ravi', [], experience_level='advanced', location='Pune')
+        self.register('Rita', [], experience_level='beginner', location='Pune')
+        self.register('Raj', [], experience_level='advanced', availability_status=False)
+
+        response = self.search(q='ra', experience='advanced', available='true', location='pu')
+        self.assertEqual([p['id'] for p in response.data['participants']], [match.id])
+
+    def test_outsiders_cannot_search(self):
+        outsider = User.objects.create_user(username='out', email='out@example.com', password='pass12345', name='Out')
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.search().status_code, 403)
+
+    def test_applications_with_sparse_fieldset(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/hackathons/my/applications/', {'fields': 'id,status,hackathon_title'})
+        self.assertEqual(response.data['applications'], [
+            {'id': HackathonApplication.objects.get(user=self.leader).id, 'status': 'team_pending', 'hackathon_title': 'Test Hack'}
+        ])
+
+        response = self.client.get(f'/api/hackathons/{self.hackathon.id}/', {'fields': 'title,organizer_name'})
+        self.assertEqual(response.data['hackathon'], {'title': 'Test Hack', 'organizer_name': 'Org'})
+
+
+class JsonRendererParityTests(TestCase):
+    payload = {
+        'when': timezone.now(),
+        'day': timezone.now().date(),
+        'fee': Decimal('499.50'),
+        'id': uuid.UUID(int=7),
+        'label': gettext_lazy('Confirmed'),
+        'text': 'Zoë line',
+        'big': 2 ** 70,
+        3: [None, True, 0.1, {'nested': timedelta(minutes=5)}],
+    }
+
+    def test_output_matches_stdlib_renderer_byte_for_byte(self):
+        self.assertEqual(OrjsonRenderer().render(self.payload), JSONRenderer().render(self.payload))
+        self.assertEqual(
+            OrjsonRenderer().render(self.payload, 'application/json; indent=2'),
+            JSONRenderer().render(self.payload, 'application/json; indent=2'),
+        )
+
+    def test_floats_are_spelled_like_the_stdlib(self):
+        for value in [1e20, -1e100, 1e-7, 1.5e-7, 1e-5, 0.0001, 1e16, 1e15, 2.5]:
+            with self.subTest(value=value):
+                data = {'values': [value], 'value': value}
+                self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_are_rejected_like_the_stdlib(self):
+        for value in [float('nan'), float('inf'), -float('inf')]:
+            with self.subTest(value=value):
+                data = {'rating': None, 'scores': [1.0, value]}
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    OrjsonRenderer().render(data)
+
+    def test_parser_matches_stdlib_parser(self):
+        body = b'{"a": [1, 2.5, "\\u00e9"], "big": 123456789012345678901234567890}'
+        self.assertEqual(OrjsonParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        with self.assertRaises(ParseError):
+            OrjsonParser().parse(BytesIO(b'{"a": NaN}'))
+
+
+class CompressionMiddlewareTests(TestCase):
+    body = json.dumps([{'title': f'Hack {i}', 'themes': ['AI', 'FinTech']} for i in range(200)]).encode()
+
+    def run_middleware(self, response, accept_encoding='gzip, deflate', path='/'):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response).process_response(request, response)
+
+    def test_large_json_is_gzipped(self):
+        response = self.run_middleware(HttpResponse(self.body, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertLess(len(response.content), len(self.body) // 5)
+
+    def test_small_refused_and_precompressed_responses_are_left_alone(self):
+        cases = [
+            (HttpResponse(b'{"ok": true}', content_type='application/json'), 'gzip'),
+            (HttpResponse(self.body, content_type='application/json'), 'gzip;q=0, identity'),
+            (HttpResponse(self.body, content_type='image/png'), 'gzip'),
+        ]
+        for response, accept_encoding in cases:
+            with self.subTest(content_type=response['Content-Type'], accept_encoding=accept_encoding):
+                self.assertFalse(self.run_middleware(response, accept_encoding).has_header('Content-Encoding'))
+
+    def test_downloads_and_token_responses_are_left_alone(self):
+        ranged = HttpResponse(self.body, content_type='text/plain')
+        ranged['Accept-Ranges'] = 'bytes'
+        attachment = HttpResponse(self.body, content_type='text/csv')
+        attachment['Content-Disposition'] = 'attachment; filename="export.csv"'
+        self.assertFalse(self.run_middleware(ranged).has_header('Content-Encoding'))
+        self.assertFalse(self.run_middleware(attachment).has_header('Content-Encoding'))
+
+        tokens = HttpResponse(self.body, content_type='application/json')
+        self.assertFalse(self.run_middleware(tokens, path='/api/auth/token/refresh/').has_header('Content-Encoding'))
+
+    def test_streaming_responses_are_compressed_incrementally(self):
+        chunks = [self.body[i:i + 500] for i in range(0, len(self.body), 500)]
+        response = self.run_middleware(StreamingHttpResponse(iter(chunks), content_type='text/plain'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        parts = list(response.streaming_content)
+        self.assertGreater(len(parts), 2)
+        self.assertEqual(gzip.decompress(b''.join(parts)), self.body)
+
+    def test_api_responses_are_compressed_end_to_end(self):
+        organizer = User.objects.create_user(username='org', email='org@example.com', password='pass12345', name='Org')
+        now = timezone.now()
+        for i in range(10):
+            Hackathon.objects.create(
+                title=f'Hack {i}', organizer=organizer, max_participants=50, approval_status='approved',
+                start_date=now + timedelta(days=10), end_date=now + timedelta(days=12),
+                registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=5),
+            )
+        client = APIClient()
+        client.force_authenticate(organizer)
+        response = client.get('/api/hackathons/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['hackathons']), 10)
+
+
+class HackathonStatusRefreshTests(TestCase):
+    def test_bulk_refresh_matches_per_hackathon_update(self):
+        now = timezone.now()
+        organizer = User.objects.create_user(username='org', email='org@example.com', password='pass12345', name='Org')
+        day = timedelta(days=1)
+        windows = {
+            'upcoming': (now + day, now + 2 * day, now + 3 * day, now + 4 * day, 0),
+            'open': (now - day, now + day, now + 3 * day, now + 4 * day, 0),
+            'full': (now - day, now + day, now + 3 * day, now + 4 * day, 10),
+            'closed': (now - 3 * day, now - day, now + day, now + 2 * day, 0),
+            'running': (now - 4 * day, now - 3 * day, now - day, now + day, 0),
+            'done': (now - 6 * day, now - 5 * day, now - 4 * day, now - day, 0),
+        }
+        for title, (reg_start, reg_end, start, end, confirmed) in windows.items():
+            for status in ['published', 'registration_open']:
+                Hackathon.objects.create(
+                    title=title, organizer=organizer, max_participants=10, confirmed_participants=confirmed,
+                    registration_start=reg_start, registration_end=reg_end, start_date=start, end_date=end, status=status
+                )
+
+        expected = {}
+        for hackathon in Hackathon.objects.all():
+            hackathon.update_status_based_on_dates()
+            expected[hackathon.id] = hackathon.status
+        Hackathon.objects.update(status='published')
+        Hackathon.objects.filter(id__in=[h for h in expected][::2]).update(status='registration_open')
+
+        Hackathon.objects.all().refresh_statuses(now)
+        self.assertEqual(dict(Hackathon.objects.values_list('id', 'status')), expected)
+
+
+    def test_hackathons_before_registration_are_left_alone(self):
+        now = timezone.now()
+        organizer = User.objects.create_user(username='org', email='org@example.com', password='pass12345', name='Org')
+        day = timedelta(days=1)
+        # Inconsistent dates: registration opens after the event has started or ended
+        for reg_end, start, end in [(now - day, now + day, now + 2 * day), (now + 2 * day, now - day, now + day),
+                                    (now + 2 * day, now - 2 * day, now - day)]:
+            Hackathon.objects.create(
+                title='Early', organizer=organizer, max_participants=10, status='draft',
+                registration_start=now + day, registration_end=reg_end, start_date=start, end_date=end
+            )
+
+        expected = {}
+        for hackathon in Hackathon.objects.all():
+            hackathon.update_status_based_on_dates()
+            expected[hackathon.id] = hackathon.status
+        Hackathon.objects.update(status='draft')
+
+        Hackathon.objects.all().refresh_statuses(now)
+        self.assertEqual(dict(Hackathon.objects.values_list('id', 'status')), expected)
+        self.assertEqual(set(expected.values()), {'draft'})
+
+class TechStackAutocompleteTests(TestCase):
+    def setUp(self):
+        autocomplete.reset()
+        self.addCleanup(autocomplete.reset)
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='pass12345', name='Org')
+
+    def uses(self, kind, name):
+        return autocomplete.get_index(kind).weights.get(name, 0)
+
+    def save(self, data, instance=None):
+        serializer = HackathonCreateSerializer(instance, data={**HACKATHON, **data}, partial=instance is not None)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(organizer=self.organizer)
+
+    def test_uses_are_counted_once_the_save_commits(self):
+        self.assertEqual(self.uses('theme', 'Climate'), 0)  # build the index
+        with self.captureOnCommitCallbacks() as callbacks:
+            hackathon = self.save({'tech_stack': ['Elixir'], 'themes': ['Climate']})
+        self.assertEqual(self.uses('theme', 'Climate'), 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.uses('theme', 'Climate'), 1)
+        self.assertEqual(self.uses('tech_stack', 'Elixir'), 1)
+
+        # An edit counts only what it adds
+        with self.captureOnCommitCallbacks(execute=True):
+            self.save({'tech_stack': ['Elixir', 'Gleam'], 'themes': ['Climate']}, hackathon)
+        self.assertEqual(self.uses('tech_stack', 'Elixir'), 1)
+        self.assertEqual(self.uses('tech_stack', 'Gleam'), 1)
+        self.assertEqual(self.uses('theme', 'Climate'), 1)
+
+
+class QueryCountMiddlewareTests(TestCase):
+    def view(self, request):
+        for _ in range(3):
+            list(User.objects.filter(email='ada@example.com'))
+        User.objects.count()
+        return HttpResponse('ok')
+
+    @override_settings(QUERY_LOG_ENABLED=True, QUERY_LOG_THRESHOLD=20)
+    def test_counts_duplicates_and_database_time(self):
+        with self.assertLogs('hackmate_backend.middleware', 'WARNING') as logs:
+            response = QueryCountMiddleware(self.view)(RequestFactory().get('/api/teams/'))
+
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="4 queries"$')
+        self.assertIn('GET /api/teams/ 200: 4 queries, 2 duplicates', logs.output[0])
+        self.assertIn('3x SELECT', logs.output[1])
+
+    @override_settings(QUERY_LOG_ENABLED=True)
+    def test_quiet_requests_log_at_info(self):
+        with self.assertLogs('hackmate_backend.middleware', 'INFO') as logs:
+            QueryCountMiddleware(lambda request: HttpResponse('ok'))(RequestFactory().get('/'))
+        self.assertEqual([record.levelname for record in logs.records], ['INFO'])
+
+    @override_settings(QUERY_LOG_ENABLED=None, DEBUG=False)
+    def test_follows_debug_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryCountMiddleware(self.view)
+
+HACKATHON = {
+    'title': 'Budget Hack', 'description': 'Fast APIs', 'max_participants': 50,
+    'start_date': '2030-01-10T09:00:00Z', 'end_date': '2030-01-12T18:00:00Z',
+    'registration_start': '2029-12-01T00:00:00Z', 'registration_end': '2030-01-05T00:00:00Z',
+    'prizes': {}, 'categories': ['AI/ML'], 'tech_stack': ['Python'], 'themes': []
+}
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    prefix = 'api/hackathons/'
+    budgets = {
+        ('GET', 'api/hackathons/'): Budget(6),
+        ('POST', 'api/hackathons/'): Budget(3, 201, data=HACKATHON),
+        ('GET', 'api/hackathons/<int:id>/'): Budget(3),
+        ('PUT', 'api/hackathons/<int:id>/'): Budget(5, data=HACKATHON),
+        ('PATCH', 'api/hackathons/<int:id>/'): Budget(4, data={'description': 'Faster APIs'}),
+        ('DELETE', 'api/hackathons/<int:id>/'): Budget(7),
+        ('POST', 'api/hackathons/<int:id>/apply/'): Budget(17, 201, url={'id': 'open_hackathon.id'}),
+        ('GET', 'api/hackathons/<int:id>/applications/'): Budget(4),
+        ('GET', 'api/hackathons/<int:id>/participants/search/'): Budget(6, data={'skills': 'python'}),
+        ('PATCH', 'api/hackathons/applications/<int:application_id>/withdraw/'): Budget(5),
+        ('GET', 'api/hackathons/applications/<int:application_id>/'): Budget(5),
+        ('PATCH', 'api/hackathons/applications/<int:application_id>/payment/'): Budget(15, url={'application_id': 'paid_application.id'}),
+        ('GET', 'api/hackathons/my/applications/'): Budget(2),
+        ('GET', 'api/hackathons/my/organized/'): Budget(3),
+        ('GET', 'api/hackathons/api/categories/'): Budget(2),
+        ('GET', 'api/hackathons/matching/user-hackathons/'): Budget(2),
+        ('POST', 'api/hackathons/matching/participants/'): Budget(5, data=lambda seed: {'hackathon_id': seed.joined.id}),
+    }
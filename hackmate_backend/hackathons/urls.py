@@ -8,6 +8,7 @@ urlpatterns = [
     path('<int:id>/', views.hackathon_detail_view, name='detail'),  # GET, PUT, PATCH, DELETE specific hackathon
     path('<int:id>/apply/', views.hackathon_apply_view, name='apply'),  # POST apply to hackathon
     path('<int:id>/applications/', views.hackathon_applications_view, name='hackathon_applications'),
+    path('<int:id>/participants/search/', views.hackathon_participant_search_view, name='participant_search'),
     path('applications/<int:application_id>/withdraw/', views.withdraw_application_view, name='withdraw_application'),  # NEW
     path('applications/<int:application_id>/', views.application_detail_view, name='application_detail'),
     path('applications/<int:application_id>/payment/', views.update_payment_view, name='update_payment'),
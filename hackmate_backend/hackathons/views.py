@@ -4,37 +4,22 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from .models import Hackathon, HackathonApplication
+from . import directory
 from .serializers import HackathonSerializer, HackathonCreateSerializer, HackathonApplicationCreateSerializer, HackathonApplicationSerializer, HackathonApplicationUpdateSerializer
 from django.utils import timezone
-from threading import Thread
-
-def update_hackathon_status(hackathon_id):
-    try:
-        # Use a new database connection for the thread to prevent issues
-        # with connection.cursor():
-        hackathon = Hackathon.objects.get(id=hackathon_id)
-        hackathon.update_status_based_on_dates()
-    except Exception as e:
-        # Log the exception for debugging
-        print(f"Error updating hackathon {hackathon_id}: {e}")
+from django.core.paginator import Paginator
+from django.db import transaction
+from notifications.outbox import notify
+from hackmate_backend.serializers import sparse_queryset
 
 @api_view(['GET', 'POST'])
 def hackathon_list_view(request):
     if request.method == 'GET':
-        hackathons = Hackathon.objects.filter(approval_status='approved')
-        
-        threads = []
-        for hackathon in hackathons:
-            # Create a new thread for each hackathon update
-            thread = Thread(target=update_hackathon_status, args=(hackathon.id,))
-            threads.append(thread)
-            thread.start() # Start the thread
-        
-        # Join all threads to ensure they complete before the response is sent
-        for thread in threads:
-            thread.join()
-        hackathons = Hackathon.objects.filter(approval_status='approved')
-        serializer = HackathonSerializer(hackathons, many=True)
+        # Bring statuses in line with the dates, a few UPDATEs however many hackathons there are
+        Hackathon.objects.filter(approval_status='approved').refresh_statuses()
+        hackathons = Hackathon.objects.filter(approval_status='approved').select_related('organizer')
+        hackathons = sparse_queryset(hackathons, HackathonSerializer, request)
+        serializer = HackathonSerializer(hackathons, many=True, context={'request': request})
         return Response({'success': True, 'hackathons': serializer.data})
 
     elif request.method == 'POST':
@@ -48,12 +33,12 @@ def hackathon_list_view(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 def hackathon_detail_view(request, id):
-    hackathon = get_object_or_404(Hackathon, id=id)
-
     if request.method == 'GET':
-        serializer = HackathonSerializer(hackathon)
+        hackathon = get_object_or_404(sparse_queryset(Hackathon.objects.all(), HackathonSerializer, request), id=id)
+        serializer = HackathonSerializer(hackathon, context={'request': request})
         return Response({'success': True, 'hackathon': serializer.data})
 
+    hackathon = get_object_or_404(Hackathon, id=id)
     if not request.user.is_authenticated or hackathon.organizer != request.user:
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -117,6 +102,24 @@ def application_detail_view(request, application_id):
     })
 
 # Update the apply view to check capacity constraints
+def notify_application(application):
+    """Queue the confirmation email for a new or paid application"""
+    hackathon = application.hackathon
+    if application.status == 'confirmed':
+        body = f"Your spot at {hackathon.title} is confirmed. See you there!"
+    elif application.status == 'team_pending':
+        body = f"Your application to {hackathon.title} was received. Join or form a team to complete it."
+    elif application.status == 'payment_pending':
+        body = f"Your application to {hackathon.title} was received. Complete the payment to confirm your spot."
+    else:
+        return
+    notify(
+        application.user, 'application_confirmed',
+        f"Your application to {hackathon.title}",
+        body,
+        hackathon_id=hackathon.id, application_id=application.id
+    )
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def hackathon_apply_view(request, id):
@@ -212,14 +215,16 @@ def hackathon_apply_view(request, id):
     # Create application
     serializer = HackathonApplicationCreateSerializer(data=data)
     if serializer.is_valid():
-        application = serializer.save(user=request.user)
-        
-        # If confirmed immediately, update participant count
-        if application.status == 'confirmed':
-            hackathon.confirmed_participants += 1
-            hackathon.save(update_fields=['confirmed_participants'])
-            application.confirmed_at = timezone.now()
-            application.save(update_fields=['confirmed_at'])
+        with transaction.atomic():
+            application = serializer.save(user=request.user)
+            
+            # If confirmed immediately, update participant count
+            if application.status == 'confirmed':
+                hackathon.confirmed_participants += 1
+                hackathon.save(update_fields=['confirmed_participants'])
+                application.confirmed_at = timezone.now()
+                application.save(update_fields=['confirmed_at'])
+            notify_application(application)
         
         return Response({
             'success': True, 
@@ -260,7 +265,9 @@ def update_payment_view(request, application_id):
     
     serializer = HackathonApplicationUpdateSerializer(application, data=data, partial=True)
     if serializer.is_valid():
-        updated_application = serializer.save()
+        with transaction.atomic():
+            updated_application = serializer.save()
+            notify_application(updated_application)
 
         user = User.objects.get(pk=request.user.id)
         print(f"User ID: {user.id}")
@@ -310,15 +317,17 @@ def update_payment_view(request, application_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_applications_view(request):
-    applications = HackathonApplication.objects.filter(user=request.user).select_related('hackathon')
-    serializer = HackathonApplicationSerializer(applications, many=True)
+    # Through the reverse manager so application.user is request.user, not a query per row
+    applications = request.user.hackathon_applications.select_related('hackathon')
+    applications = sparse_queryset(applications, HackathonApplicationSerializer, request)
+    serializer = HackathonApplicationSerializer(applications, many=True, context={'request': request})
     return Response({'success': True, 'applications': serializer.data})
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_organized_view(request):
-    hackathons = Hackathon.objects.filter(organizer=request.user)
-    serializer = HackathonSerializer(hackathons, many=True)
+    hackathons = sparse_queryset(Hackathon.objects.filter(organizer=request.user), HackathonSerializer, request)
+    serializer = HackathonSerializer(hackathons, many=True, context={'request': request})
     return Response({'success': True, 'hackathons': serializer.data})
 
 @api_view(['GET'])
@@ -361,6 +370,49 @@ def hackathon_applications_view(request, id):
         'applications': applications_data
     })
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def hackathon_participant_search_view(request, id):
+    """Search a hackathon's registered participants by skills, experience, location and availability"""
+    hackathon = get_object_or_404(Hackathon, id=id)
+
+    # Only the organizer and people registered for the hackathon can browse it
+    if hackathon.organizer != request.user and not HackathonApplication.objects.filter(
+        hackathon=hackathon, user=request.user, status__in=directory.REGISTERED_STATUSES
+    ).exists():
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    users = directory.search_participants(hackathon, request.query_params, exclude_user=request.user)
+
+    try:
+        page_size = min(max(int(request.query_params.get('page_size', 20)), 1), 50)
+    except ValueError:
+        page_size = 20
+    paginator = Paginator(users, page_size)
+    page = paginator.get_page(request.query_params.get('page', 1))
+
+    participants = [{
+        'id': user.id,
+        'name': user.name,
+        'location': user.location,
+        'experience_level': user.experience_level,
+        'skills': user.skills,
+        'availability_status': user.availability_status,
+        'github_url': user.github_url,
+        'average_rating': float(user.average_rating)
+    } for user in page]
+
+    data = {
+        'success': True,
+        'participants': participants,
+        'total_pages': paginator.num_pages,
+        'current_page': page.number,
+        'total_count': paginator.count
+    }
+    if request.query_params.get('facets') == 'true':
+        data['skill_facets'] = directory.skill_facets(users)
+    return Response(data)
+
 
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
@@ -374,6 +426,18 @@ from .models import HackathonApplication, Hackathon
 from users.models import User
 import json
 
+# Applications that count as taking part in a hackathon
+PARTICIPATING_STATUSES = ['confirmed', 'applied', 'team_pending']
+
+def serialize_user_hackathon(application):
+    return {
+        'id': application.hackathon.id,
+        'title': application.hackathon.title,
+        'start_date': application.hackathon.start_date,
+        'status': application.hackathon.status,
+        'total_participants': application.hackathon.confirmed_participants
+    }
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_hackathons(request):
@@ -384,18 +448,10 @@ def get_user_hackathons(request):
         # Get hackathons where user has applied and is confirmed
         applications = HackathonApplication.objects.filter(
             user=user,
-            status__in=['confirmed', 'applied', 'team_pending']
+            status__in=PARTICIPATING_STATUSES
         ).select_related('hackathon')
         
-        hackathons = []
-        for app in applications:
-            hackathons.append({
-                'id': app.hackathon.id,
-                'title': app.hackathon.title,
-                'start_date': app.hackathon.start_date,
-                'status': app.hackathon.status,
-                'total_participants': app.hackathon.confirmed_participants
-            })
+        hackathons = [serialize_user_hackathon(app) for app in applications]
         
         return Response({
             'success': True,
@@ -0,0 +1,85 @@
+"""
+orjson-backed drop-ins for DRF's JSONRenderer and JSONParser, selected with
+API_JSON_BACKEND in settings.
+
+Output is byte-for-byte what JSONRenderer produces: anything orjson does not
+encode natively (datetimes, Decimals, lazy strings, querysets...) goes
+through DRF's own JSONEncoder.default, so e.g. a raw aware datetime still
+comes out as '...Z'. Serializer fields have already formatted their values
+with REST_FRAMEWORK['DATETIME_FORMAT'] by the time data reaches a renderer.
+Payloads orjson can't handle the same way (integers past 64 bits,
+non-finite floats, floats orjson spells differently from repr(), indented
+output, invalid request bodies) fall back to the stdlib path.
+"""
+import io
+import math
+import re
+
+import orjson
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+# orjson reads integers past 64 bits as floats; bodies with digit runs this
+# long (even inside strings) take the stdlib path so they parse exactly
+_LONG_NUMBER = re.compile(rb'\d{19}')
+# orjson writes exponents without sign or padding (1e20, 1e-7 for repr's
+# 1e+20, 1e-07) and switches to them at other magnitudes (0.00001 for
+# 1e-05); any number token like that takes the stdlib path. A match inside
+# a string only costs a fallback.
+_FLOAT_SPELLING = re.compile(rb'(?:^|[\[:,])-?(?:\d+(?:\.\d+)?e|0\.0000)')
+
+
+def _has_non_finite(data):
+    """Whether a NaN or infinity is nested in data; orjson writes them as null"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if type(value) is float:
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class OrjsonRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _FLOAT_SPELLING.search(ret) or (b'null' in ret and _has_non_finite(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class OrjsonParser(JSONParser):
+    renderer_class = OrjsonRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        raw = stream.read()
+        if not _LONG_NUMBER.search(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass
+        # Let the stdlib parser accept the body or produce the usual ParseError
+        return super().parse(io.BytesIO(raw), media_type, parser_context)
@@ -0,0 +1,219 @@
+import logging
+import re
+import time
+import zlib
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+ENCODERS = {'gzip': _GzipEncoder}
+if brotli is not None:
+    ENCODERS['br'] = _BrotliEncoder
+
+_ACCEPT_ENCODING_ITEM = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*')
+
+
+def accepted_encodings(header):
+    """Codings from an Accept-Encoding header that the client hasn't refused with q=0"""
+    accepted = set()
+    for item in header.split(','):
+        match = _ACCEPT_ENCODING_ITEM.fullmatch(item)
+        if match and float(match.group(2) or 1) > 0:
+            accepted.add(match.group(1).lower())
+    return accepted
+
+
+def compress(encoding, content):
+    encoder = ENCODERS[encoding]()
+    return encoder.compress(content) + encoder.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client accepts
+    first in COMPRESSION_ENCODINGS. Only content types listed in
+    COMPRESSION_CONTENT_TYPES are touched, which keeps already-compressed
+    media (images, archives, video) out, and bodies shorter than
+    COMPRESSION_MIN_SIZE go out as they are. Streaming responses are
+    compressed chunk by chunk and flushed after each one, so a slow stream
+    still reaches the client as it is produced.
+
+    File downloads (Accept-Ranges or an attachment Content-Disposition) are
+    left alone so byte ranges keep referring to the stored file, and so are
+    the paths in COMPRESSION_EXCLUDE_PATHS, which return tokens: compressing
+    a secret next to request-controlled data leaks it through the response
+    size (BREACH).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.has_header('Content-Encoding') or response.status_code == 206:
+            return response
+        if response.has_header('Accept-Ranges') or response.get('Content-Disposition', '').startswith('attachment'):
+            return response
+        if request.path in settings.COMPRESSION_EXCLUDE_PATHS:
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES:
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding = next((e for e in settings.COMPRESSION_ENCODINGS if e in ENCODERS and e in accepted), None)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            encoder = ENCODERS[encoding]()
+            if response.is_async:
+                response.streaming_content = self._compress_async(response.streaming_content, encoder)
+            else:
+                response.streaming_content = self._compress_stream(response.streaming_content, encoder)
+            # The compressed length isn't known up front
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The bytes differ from the uncompressed entity, so a strong ETag no longer holds
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _compress_stream(chunks, encoder):
+        for chunk in chunks:
+            data = encoder.compress(chunk) + encoder.flush()
+            if data:
+                yield data
+        yield encoder.finish()
+
+    @staticmethod
+    async def _compress_async(chunks, encoder):
+        async for chunk in chunks:
+            data = encoder.compress(chunk) + encoder.flush()
+            if data:
+                yield data
+        yield encoder.finish()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() hook that records each statement, its parameters and duration"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, repr(params), time.perf_counter() - start))
+
+    @property
+    def duration(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def duplicates(self):
+        """Statements run more than once with the same parameters"""
+        counts = Counter((sql, params) for sql, params, _ in self.queries)
+        return sum(count - 1 for count in counts.values())
+
+    def repeated(self):
+        """(sql, times) for statements run more than once with any parameters, the N+1 shape"""
+        counts = Counter(sql for sql, _, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count > 1]
+
+
+class QueryCountMiddleware:
+    """
+    Development aid: log how many queries each request ran, how many were
+    exact duplicates and how long they spent in the database, and add a
+    Server-Timing header so the numbers show up in the browser's network
+    panel. Requests over QUERY_LOG_THRESHOLD queries, or with duplicates,
+    are logged as warnings with the most repeated statements. Enabled by
+    QUERY_LOG_ENABLED, or by DEBUG when that is None. Queries a streaming
+    response runs while it streams aren't counted.
+    """
+
+    def __init__(self, get_response):
+        enabled = settings.QUERY_LOG_ENABLED
+        if not (settings.DEBUG if enabled is None else enabled):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        count, duplicates = len(recorder.queries), recorder.duplicates()
+        milliseconds = recorder.duration * 1000
+        response.headers['Server-Timing'] = f'db;dur={milliseconds:.1f};desc="{count} queries"'
+
+        level = logging.WARNING if count > settings.QUERY_LOG_THRESHOLD or duplicates else logging.INFO
+        logger.log(
+            level, '%s %s %s: %d queries, %d duplicates, %.1f ms in the database',
+            request.method, request.path, response.status_code, count, duplicates, milliseconds
+        )
+        if level == logging.WARNING:
+            for sql, times in recorder.repeated()[:3]:
+                logger.warning('  %dx %s', times, sql[:300])
+        return response
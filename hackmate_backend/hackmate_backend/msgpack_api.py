@@ -0,0 +1,47 @@
+"""
+MessagePack renderer and parser, offered alongside JSON through normal
+content negotiation: clients opt in with `Accept: application/msgpack` and
+may send bodies as `Content-Type: application/msgpack`. JSON stays the
+default for everyone else.
+
+Values MessagePack has no type for (datetimes, Decimals, UUIDs...) are
+converted by DRF's JSONEncoder.default, so a decoded MessagePack response
+holds exactly what the JSON response for the same request would. The one
+exception is integers outside MessagePack's 64-bit range, which are sent
+as decimal strings.
+"""
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def _default(value):
+    # packb only hands ints here when they overflow 64 bits
+    if isinstance(value, int):
+        return str(value)
+    return JSONEncoder().default(value)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True, datetime=False)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
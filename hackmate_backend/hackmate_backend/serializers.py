@@ -0,0 +1,145 @@
+"""
+Sparse fieldsets for read responses.
+
+A serializer using DynamicFieldsMixin renders only what the client asks for
+with `?fields=a,b` and `?expand=c` on a GET, when it is the top-level
+serializer of a response and has the request in its context (or gets
+`fields=`/`expand=` directly). It is meant for read serializers; responses
+to writes always come back whole. Fields listed in Meta.expandable_fields embed related objects;
+once a client uses either parameter those are left out unless named in
+`expand` or `fields`. Without either parameter the output is unchanged.
+
+sparse_queryset() then narrows the queryset behind such a response to the
+columns and joins the selected fields need.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_names(value):
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requested_fields = parse_names(fields) if isinstance(fields, str) else fields
+        self._requested_expand = parse_names(expand) if isinstance(expand, str) else expand
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def selected_field_names(self):
+        """
+        Names of the fields to render, or None for all of them. Worked out
+        once: with many=True the same child serializer renders every row.
+        """
+        if not hasattr(self, '_selected_field_names'):
+            self._selected_field_names = self._select_field_names()
+        return self._selected_field_names
+
+    def _select_field_names(self):
+        fields, expand = self._requested_fields, self._requested_expand
+        request = self.context.get('request')
+        if fields is None and expand is None and request is not None and request.method in SAFE_METHODS and self._is_root():
+            fields = parse_names(request.query_params.get('fields'))
+            expand = parse_names(request.query_params.get('expand'))
+        if fields is None and expand is None:
+            return None
+
+        expandable = set(getattr(self.Meta, 'expandable_fields', ()))
+        names = set(self.fields)
+        selected = names - expandable if fields is None else names & fields
+        return selected | (names & expandable & (expand or set()))
+
+    @property
+    def _readable_fields(self):
+        # Only output is narrowed; validation still sees every writable field
+        selected = self.selected_field_names()
+        for field in super()._readable_fields:
+            if selected is None or field.field_name in selected:
+                yield field
+
+
+def _columns(serializer, names, prefix=''):
+    """
+    (columns, joins, complete) for rendering `names` of a ModelSerializer:
+    the ORM paths to load, the forward relations to select_related, and
+    whether every field could be traced to columns. Computed fields name
+    their columns in Meta.sparse_columns.
+    """
+    model = serializer.Meta.model
+    sparse_columns = getattr(serializer.Meta, 'sparse_columns', {})
+    columns, joins, complete = set(), set(), True
+
+    for name in names:
+        field = serializer.fields[name]
+        if name in sparse_columns:
+            paths = sparse_columns[name]
+        elif field.source == '*':
+            complete = False
+            continue
+        else:
+            paths = [field.source.replace('.', '__')]
+
+        for path in paths:
+            head = path.split('__')[0]
+            try:
+                model_field = model._meta.get_field(head)
+            except FieldDoesNotExist:
+                complete = False
+                continue
+            if model_field.many_to_many or model_field.one_to_many:
+                continue  # loaded by its own query, no column here
+            if model_field.is_relation and '__' in path:
+                joins.add(prefix + path.rsplit('__', 1)[0])
+            if model_field.is_relation and isinstance(field, serializers.ModelSerializer) and path == head:
+                joins.add(prefix + head)
+                nested_columns, nested_joins, nested_complete = _columns(field, list(field.fields), f'{prefix}{head}__')
+                columns |= nested_columns
+                joins |= nested_joins
+                complete = complete and nested_complete
+            columns.add(prefix + path)
+    return columns, joins, complete
+
+
+def sparse_queryset(queryset, serializer_class, request):
+    """
+    Narrow `queryset` to what serializer_class will render for this request:
+    only the needed columns, and only the joins for related objects that
+    were asked for. Prefetches stay when a selected field names them in
+    Meta.sparse_prefetches (by lookup or to_attr). Returns it untouched when
+    no sparse fieldset was asked for.
+    """
+    serializer = serializer_class(context={'request': request})
+    selected = serializer.selected_field_names()
+    if selected is None:
+        return queryset
+
+    columns, joins, complete = _columns(serializer, selected)
+    sparse_prefetches = getattr(serializer.Meta, 'sparse_prefetches', {})
+    wanted = {lookup for name in selected for lookup in sparse_prefetches.get(name, ())}
+    prefetches = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, 'prefetch_to', lookup) in wanted
+    ]
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if complete:
+        # A queryset from a related manager (user.hackathon_applications)
+        # reads its foreign key to attach the known instance; keep it loaded
+        columns.update(field.name for field in queryset._known_related_objects)
+        # With select_related, a related model's columns must be listed too
+        # or it is loaded whole; nested serializers list theirs above
+        queryset = queryset.only(*columns)
+    return queryset
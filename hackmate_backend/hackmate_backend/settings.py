@@ -16,9 +16,19 @@ ALLOWED_HOSTS = ['*']
 # Media files configuration
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
-FILE_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
+# Uploads above this are streamed to a temp file instead of held in worker memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
 
+# Team chat attachments
+TEAM_UPLOAD_MAX_SIZE = 52428800  # 50MB
+TEAM_UPLOAD_CHUNK_SIZE = 5242880  # 5MB per resumable upload chunk
+# Hand attachment downloads off to the web server: None, 'nginx' (X-Accel-Redirect) or 'xsendfile'
+TEAM_FILES_SENDFILE = os.getenv('TEAM_FILES_SENDFILE') or None
+TEAM_FILES_SENDFILE_PREFIX = os.getenv('TEAM_FILES_SENDFILE_PREFIX', '/protected-media/')
+# Image thumbnails are rendered on a background thread pool; set False to render inline
+TEAM_PREVIEWS_ASYNC = True
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React default port
@@ -56,6 +66,11 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'INFO',
         },
+        'hackmate_backend': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -63,18 +78,53 @@ LOGGING = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(seconds=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', 3600))),  # 1 hour
     'REFRESH_TOKEN_LIFETIME': timedelta(seconds=int(os.getenv('JWT_REFRESH_TOKEN_LIFETIME', 604800))),  # 7 days
-    'ROTATE_REFRESH_TOKENS': True
+    'ROTATE_REFRESH_TOKENS': True,
+    # Tokens carry the user's token_version and role (see users/tokens.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.VersionedTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.VersionedTokenRefreshSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'users.serializers.CachedTokenVerifySerializer',
+}
+
+# How long an authenticated user is served from the cache before being reloaded
+JWT_USER_CACHE_SECONDS = int(os.getenv('JWT_USER_CACHE_SECONDS', 60))
+# How long a refresh token's "not blacklisted" lookup is cached; blacklisted tokens are cached until they expire
+TOKEN_REVOCATION_CACHE_SECONDS = int(os.getenv('TOKEN_REVOCATION_CACHE_SECONDS', 300))
+
+# JSON encoding for the API: 'orjson' (hackmate_backend/fastjson.py) or 'stdlib' (DRF's own)
+API_JSON_BACKEND = os.getenv('API_JSON_BACKEND', 'orjson')
+API_JSON_CLASSES = {
+    'orjson': ('hackmate_backend.fastjson.OrjsonRenderer', 'hackmate_backend.fastjson.OrjsonParser'),
+    'stdlib': ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser'),
 }
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        API_JSON_CLASSES[API_JSON_BACKEND][0],
+        # Only chosen when a client sends Accept: application/msgpack
+        'hackmate_backend.msgpack_api.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        API_JSON_CLASSES[API_JSON_BACKEND][1],
+        'hackmate_backend.msgpack_api.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DATETIME_FORMAT': '%Y-%m-%dT%H:%M:%S',
+    # Cache-backed limits on the password-hashing endpoints (see users/throttles.py);
+    # the login rates count failed attempts only
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('LOGIN_IP_RATE', '30/min'),
+        'login_email': os.getenv('LOGIN_EMAIL_RATE', '10/min'),
+        'signup_ip': os.getenv('SIGNUP_IP_RATE', '10/hour'),
+    },
 }
 
 # Custom User Model
@@ -82,6 +132,7 @@ AUTH_USER_MODEL = 'users.User'
 
 # Application definition
 INSTALLED_APPS = [
+    'daphne',  # ASGI runserver so WebSockets work in development
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -92,14 +143,21 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
+    'channels',
     'users',
     'hackathons',
-    'teams'
+    'teams',
+    'notifications',
+    'dashboard'
 ]
 
 MIDDLEWARE = [
+    # Outermost, so it sees every query the request runs (see QUERY_LOG_* below)
+    'hackmate_backend.middleware.QueryCountMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Before anything else that reads or rewrites the response body
+    'hackmate_backend.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -108,6 +166,29 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Response compression (see hackmate_backend/middleware.py)
+# Preferred order; 'br' is only used when the optional `brotli` package is installed
+COMPRESSION_ENCODINGS = ['br', 'gzip']
+# Bodies smaller than this gain little and cost a round of CPU, so they go out as-is
+COMPRESSION_MIN_SIZE = 1024
+# Compressible types only; images, archives and video are already compressed
+COMPRESSION_CONTENT_TYPES = [
+    'application/json', 'application/msgpack', 'application/javascript',
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'image/svg+xml',
+]
+# Endpoints whose responses carry tokens are never compressed, so their size
+# can't be used to recover a token byte by byte (BREACH)
+COMPRESSION_EXCLUDE_PATHS = [
+    '/api/auth/signup/', '/api/auth/login/', '/api/auth/token/',
+    '/api/auth/token/refresh/', '/api/auth/change-password/',
+]
+
+# Per-request query logging (see hackmate_backend/middleware.py); development only
+# 'True'/'False' to force it; unset follows DEBUG, so it stays off under the test runner
+QUERY_LOG_ENABLED = os.getenv('QUERY_LOG_ENABLED') == 'True' if os.getenv('QUERY_LOG_ENABLED') else None
+# Requests running more queries than this are logged as warnings
+QUERY_LOG_THRESHOLD = int(os.getenv('QUERY_LOG_THRESHOLD', 20))
+
 ROOT_URLCONF = 'hackmate_backend.urls'
 
 TEMPLATES = [
@@ -127,6 +208,56 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'hackmate_backend.wsgi.application'
+ASGI_APPLICATION = 'hackmate_backend.asgi.application'
+
+# Channel layers (team chat push)
+# Defaults to the in-process layer, which is fine for a single dev server and tests.
+# In production point CHANNEL_LAYER_BACKEND at a shared layer, e.g.
+# CHANNEL_LAYER_BACKEND=channels_redis.core.RedisChannelLayer CHANNEL_LAYER_HOSTS=redis://localhost:6379/0
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': os.getenv('CHANNEL_LAYER_BACKEND', 'channels.layers.InMemoryChannelLayer'),
+    }
+}
+if os.getenv('CHANNEL_LAYER_HOSTS'):
+    CHANNEL_LAYERS['default']['CONFIG'] = {
+        'hosts': os.getenv('CHANNEL_LAYER_HOSTS').split(','),
+    }
+
+# Skill / tech stack / theme autocomplete (see users/autocomplete.py)
+# Suggestions kept per prefix, and how often each process rebuilds its index from the database
+AUTOCOMPLETE_TOP_K = 10
+AUTOCOMPLETE_REBUILD_SECONDS = 600
+
+# Email availability check (see users/emails.py)
+# Each process keeps a Bloom filter of registered emails, rebuilt this often so deletions drop out
+EMAIL_FILTER_REBUILD_SECONDS = 3600
+EMAIL_FILTER_ERROR_RATE = 0.01
+# Repeat checks of the same address from one client are answered from the cache for this long
+EMAIL_CHECK_DEBOUNCE_SECONDS = 5
+
+# Public profile cards (see users/profiles.py): cache lifetime and the most ids one batch request may ask for
+PROFILE_CACHE_SECONDS = 300
+PROFILE_BATCH_LIMIT = 100
+
+# Email
+# Console backend in development; set EMAIL_BACKEND (plus the usual EMAIL_HOST etc.) for real delivery
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'HackMate <no-reply@hackmate.local>')
+
+# Notification outbox (see notifications/outbox.py)
+# Notifications wait this long before delivery so bursts for one user go out as one digest email
+NOTIFICATION_DIGEST_SECONDS = 60
+# Failed sends are retried with exponential backoff, then marked failed
+NOTIFICATION_MAX_ATTEMPTS = 5
+# How long a worker owns the notifications it picked up while it sends them;
+# after that another run may pick them up again
+NOTIFICATION_CLAIM_SECONDS = 300
 
 # Database
 DATABASES = {
@@ -136,6 +267,38 @@ DATABASES = {
     }
 }
 
+# Cache - per-process memory by default; point CACHE_BACKEND/CACHE_LOCATION at a
+# shared cache (e.g. django.core.cache.backends.redis.RedisCache) when running
+# more than one worker so invalidations reach every process
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Password hashing profile:
+#   'default' - Django's PBKDF2 (1,000,000 iterations)
+#   'pbkdf2'  - PBKDF2 with PASSWORD_PBKDF2_ITERATIONS, cheaper per login when tuned down
+#   'argon2'  - Argon2id, requires `pip install argon2-cffi`
+# Older hashes keep working and are rewritten with the active profile on the user's next login,
+# except that 'pbkdf2' never lowers the iteration count of an existing pbkdf2_sha256 hash
+PASSWORD_HASHER_PROFILE = os.getenv('PASSWORD_HASHER_PROFILE', 'default')
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 600000))
+PASSWORD_HASHER_PROFILES = {
+    'default': ['django.contrib.auth.hashers.PBKDF2PasswordHasher'],
+    'pbkdf2': ['users.hashers.TunedPBKDF2PasswordHasher'],
+    'argon2': ['django.contrib.auth.hashers.Argon2PasswordHasher', 'users.hashers.TunedPBKDF2PasswordHasher'],
+}
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE] + [
+    hasher for hasher in [
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ] if hasher not in PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,208 @@
+"""
+Shared test fixtures: a seeded world of users, hackathons and teams, and a
+mixin that holds every API endpoint of an app to a query budget, so an N+1
+regression fails the suite instead of going unnoticed.
+"""
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hackathons.models import Hackathon, HackathonApplication
+from teams.discovery import index_team_skills
+from teams.models import Team, TeamInvitation, TeamMembership, TeamMessage, TeamUpload
+from users.models import User
+from users.skills import index_user_skills
+from users.tokens import VersionedRefreshToken
+
+
+def api_routes(patterns=None, prefix=''):
+    """Every URL route under /api/, as Django path templates"""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from api_routes(pattern.url_patterns, route)
+        elif route.startswith('api/'):
+            yield route
+
+
+class SeedData:
+    """
+    `user` organizes `hackathon`, has applied to `joined` and leads `team`
+    there. Every list they see holds about `scale` rows, so a view that
+    queries once per row blows through its budget.
+    """
+
+    def __init__(self, scale=5):
+        now = timezone.now()
+        self.user = self.make_user('ada', role='organizer', skills=['Python', 'React'])
+        self.organizer = self.make_user('org', role='organizer')
+        self.members = [self.make_user(f'member{i}', skills=['Python', 'Go']) for i in range(scale + 3)]
+        self.outsider = self.make_user('outsider')
+
+        def hackathon(title, organizer, **fields):
+            return Hackathon.objects.create(
+                title=title, organizer=organizer, max_participants=100, approval_status='approved',
+                status='registration_open', tech_stack=['Python'], categories=['AI/ML'],
+                start_date=now + timedelta(days=10), end_date=now + timedelta(days=12),
+                registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=5),
+                **fields
+            )
+
+        self.hackathon = hackathon('Hosted', self.user)
+        self.joined = hackathon('Joined', self.organizer)
+        self.open_hackathon = hackathon('Open', self.organizer)
+        self.paid = hackathon('Paid', self.organizer, is_free=False, registration_fee=Decimal('9.50'))
+        for i in range(scale):
+            hackathon(f'Listed {i}', self.organizer)
+
+        self.application = HackathonApplication.objects.create(
+            user=self.user, hackathon=self.joined, status='team_pending', skills_bringing=['Python']
+        )
+        self.paid_application = HackathonApplication.objects.create(
+            user=self.user, hackathon=self.paid, status='payment_pending', payment_status='pending'
+        )
+        for member in self.members:
+            HackathonApplication.objects.create(user=member, hackathon=self.hackathon, status='team_pending')
+            HackathonApplication.objects.create(user=member, hackathon=self.joined, status='team_pending')
+
+        # The user's own team: three active members, one join request waiting
+        self.team = self.make_team('Alpha', self.user, self.members[:2])
+        self.requester = self.members[2]
+        TeamMembership.objects.create(team=self.team, user=self.requester, invited_by=self.requester, status='pending')
+        self.messages = [
+            TeamMessage.objects.create(team=self.team, sender=sender, content=f'message {i}')
+            for i, sender in enumerate([self.user, *self.members[:2]] * scale)
+        ]
+        self.upload = TeamUpload.objects.create(team=self.team, uploader=self.user, file_name='notes.txt', total_size=4)
+
+        # Other teams the user can browse, ask to join and be invited to
+        self.other_teams = [
+            self.make_team(f'Team {i}', self.members[3 + i], [self.members[(4 + i) % len(self.members)]])
+            for i in range(scale)
+        ]
+        TeamMembership.objects.create(team=self.other_teams[0], user=self.user, invited_by=self.user, status='pending')
+        expires_at = now + timedelta(days=7)
+        self.invitation = TeamInvitation.objects.create(
+            team=self.other_teams[1], inviter=self.other_teams[1].team_leader, invitee=self.user, expires_at=expires_at
+        )
+        TeamInvitation.objects.create(team=self.team, inviter=self.user, invitee=self.members[5], expires_at=expires_at)
+        self.invitation_request = TeamInvitation.objects.create(
+            team=self.team, inviter=self.members[0], invitee=self.outsider, status='leader_pending', expires_at=expires_at
+        )
+
+    @staticmethod
+    def make_user(username, **fields):
+        fields.setdefault('name', username.title())
+        user = User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='pass12345', **fields
+        )
+        index_user_skills(user)
+        return user
+
+    def make_team(self, name, leader, members):
+        team = Team.objects.create(
+            name=name, hackathon=self.joined, team_leader=leader, max_members=10,
+            required_skills=['Python'], description=f'{name} builds things'
+        )
+        index_team_skills(team)
+        TeamMembership.objects.create(team=team, user=leader, role='leader', status='active', joined_at=timezone.now())
+        for member in members:
+            TeamMembership.objects.create(team=team, user=member, status='active', joined_at=timezone.now())
+        return team
+
+    def url_values(self):
+        """Default values for the path parameters in api_routes()"""
+        return {
+            'id': self.hackathon.id, 'application_id': self.application.id,
+            'pk': self.team.id, 'member_id': self.requester.id, 'user_id': self.members[0].id,
+            'team_id': self.team.id, 'message_id': self.messages[0].id, 'upload_id': self.upload.id,
+        }
+
+
+class Budget:
+    """
+    The most queries one request may run. `status` pins the code path being
+    measured; `url` overrides path parameters with SeedData attribute paths
+    (e.g. {'pk': 'invitation.id'}) and `user` names who sends the request.
+    `data` may be a callable taking the SeedData.
+    """
+
+    def __init__(self, queries, status=200, data=None, url=None, user='user', content_type=None, headers=None):
+        self.queries = queries
+        self.status = status
+        self.data = data
+        self.url = url or {}
+        self.user = user
+        self.content_type = content_type
+        self.headers = headers or {}
+
+
+class QueryBudgetMixin:
+    """
+    Mix into a TestCase with `prefix` (e.g. 'api/teams/') and `budgets`, a
+    {(method, route): Budget} map that must cover every route under prefix.
+    Requests authenticate with a real JWT and start with an empty cache, so
+    the counts include the auth lookup and are the cold-cache worst case.
+    Each request is rolled back, so writes don't affect the next one.
+    """
+    prefix = None
+    budgets = {}
+    scale = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = SeedData(cls.scale)
+
+    def resolve(self, path):
+        value = self.seed
+        for name in path.split('.'):
+            value = value[int(name)] if name.isdigit() else getattr(value, name)
+        return value
+
+    def url_for(self, route, budget):
+        values = self.seed.url_values()
+        values.update({name: self.resolve(path) for name, path in budget.url.items()})
+        return '/' + re.sub(r'<(?:\w+:)?(\w+)>', lambda match: str(values[match.group(1)]), route)
+
+    def run_request(self, method, route, budget):
+        """(response, captured queries) for one request, rolled back afterwards"""
+        client = APIClient()
+        token = VersionedRefreshToken.for_user(self.resolve(budget.user)).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}', **budget.headers)
+        url = self.url_for(route, budget)
+        data = budget.data(self.seed) if callable(budget.data) else budget.data
+
+        cache.clear()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                if method == 'GET':
+                    response = client.get(url, data)
+                elif budget.content_type:
+                    response = client.generic(method, url, data, content_type=budget.content_type)
+                else:
+                    response = getattr(client, method.lower())(url, data, format='json')
+            transaction.set_rollback(True)
+        return response, queries
+
+    def test_every_route_has_a_budget(self):
+        routes = {route for route in api_routes() if route.startswith(self.prefix)}
+        self.assertTrue(routes)
+        self.assertEqual(routes - {route for _, route in self.budgets}, set())
+
+    def test_queries_within_budget(self):
+        for (method, route), budget in self.budgets.items():
+            with self.subTest(method=method, route=route):
+                response, queries = self.run_request(method, route, budget)
+                self.assertEqual(response.status_code, budget.status, getattr(response, 'data', None))
+                sql = '\n'.join(query['sql'] for query in queries.captured_queries)
+                self.assertLessEqual(
+                    len(queries), budget.queries,
+                    f'{method} {route} ran {len(queries)} queries, budget {budget.queries}:\n{sql}'
+                )
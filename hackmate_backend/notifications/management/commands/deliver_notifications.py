@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Deliver due notifications from the outbox, one digest email per recipient.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Maximum number of due notifications to pick up per batch; all due notifications of their recipients go out with them (default: 100)'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running, polling the outbox every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=10,
+            help='Seconds to sleep between polls when --loop is set (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Delivered {sent} notifications, {failed} failed'
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        """Deliver batches until nothing due is left"""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_pending(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if not sent and not failed:
+                return total_sent, total_failed
@@ -0,0 +1,54 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class Notification(models.Model):
+    """
+    Transactional outbox row. It is written in the same transaction as the
+    state change it describes, and delivered later in batches by the
+    deliver_notifications worker, so request paths never wait on SMTP.
+    """
+    KIND_CHOICES = [
+        ('team_invitation', 'Team Invitation'),
+        ('invitation_request', 'Invitation Request'),
+        ('invitation_accepted', 'Invitation Accepted'),
+        ('invitation_declined', 'Invitation Declined'),
+        ('join_request', 'Join Request'),
+        ('join_approved', 'Join Request Approved'),
+        ('join_declined', 'Join Request Declined'),
+        ('application_confirmed', 'Application Confirmed'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    payload = models.JSONField(default=dict, blank=True)
+
+    # Delivery state
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['recipient', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.recipient} ({self.status})"
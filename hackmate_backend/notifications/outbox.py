@@ -0,0 +1,115 @@
+import logging
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+def notify(recipient, kind, subject, body, **payload):
+    """
+    Queue a notification in the outbox. Call this inside the same
+    transaction.atomic() block as the state change so both commit or
+    neither does. Delivery is delayed by NOTIFICATION_DIGEST_SECONDS so
+    bursts for one user can go out as a single digest.
+    """
+    return Notification.objects.create(
+        recipient=recipient,
+        kind=kind,
+        subject=subject,
+        body=body,
+        payload=payload,
+        next_attempt_at=timezone.now() + timedelta(seconds=settings.NOTIFICATION_DIGEST_SECONDS)
+    )
+
+
+def _build_email(recipient, notifications):
+    if len(notifications) == 1:
+        subject = notifications[0].subject
+        body = notifications[0].body
+    else:
+        subject = f"You have {len(notifications)} new HackMate notifications"
+        body = "\n\n".join(f"- {n.subject}\n  {n.body}" for n in notifications)
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient.email])
+
+
+def _claim_batch(batch_size):
+    """
+    Claim the next due notifications, grouped by recipient. Claimed rows get
+    their next_attempt_at pushed out by NOTIFICATION_CLAIM_SECONDS, so the
+    row locks only last as long as this transaction and other workers skip
+    them while they are being sent. If the worker dies mid-send they become
+    due again once the claim runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = Notification.objects.select_for_update(skip_locked=True).filter(
+            status='pending', next_attempt_at__lte=now
+        ).order_by('next_attempt_at').values_list('recipient_id', flat=True)[:batch_size]
+
+        # Pull every due notification for those recipients, not just the
+        # ones that hit the limit, so each user gets one digest per run
+        batch = list(
+            Notification.objects.select_for_update(skip_locked=True).filter(
+                status='pending', next_attempt_at__lte=now, recipient_id__in=set(due)
+            ).select_related('recipient').order_by('recipient_id', 'created_at')
+        )
+        Notification.objects.filter(id__in=[n.id for n in batch]).update(
+            next_attempt_at=now + timedelta(seconds=settings.NOTIFICATION_CLAIM_SECONDS)
+        )
+    return batch
+
+
+def deliver_pending(batch_size=100):
+    """
+    Deliver one batch of due notifications over a single mail connection,
+    coalescing each recipient's notifications into one email. Sending
+    happens after the claim has committed, so a slow mail server never
+    holds database locks. Failed sends are retried with exponential backoff
+    up to NOTIFICATION_MAX_ATTEMPTS. Returns (sent, failed) counts of
+    notifications.
+    """
+    sent = failed = 0
+
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    try:
+        for _, group in groupby(batch, key=lambda n: n.recipient_id):
+            notifications = list(group)
+            recipient = notifications[0].recipient
+            ids = [n.id for n in notifications]
+
+            try:
+                connection.send_messages([_build_email(recipient, notifications)])
+            except Exception as e:
+                logger.warning("Notification delivery to %s failed: %s", recipient.email, e)
+                _record_failure(notifications, str(e), timezone.now())
+                failed += len(ids)
+            else:
+                Notification.objects.filter(id__in=ids).update(status='sent', sent_at=timezone.now())
+                sent += len(ids)
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def _record_failure(notifications, error, now):
+    for notification in notifications:
+        notification.attempts += 1
+        notification.last_error = error
+        if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+            notification.status = 'failed'
+        else:
+            notification.next_attempt_at = now + timedelta(minutes=2 ** notification.attempts)
+    Notification.objects.bulk_update(notifications, ['attempts', 'last_error', 'status', 'next_attempt_at'])
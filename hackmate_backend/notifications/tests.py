@@ -0,0 +1,68 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from users.models import User
+from .models import Notification
+from .outbox import _claim_batch, deliver_pending, notify
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', NOTIFICATION_MAX_ATTEMPTS=2)
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+
+    def make_due(self):
+        Notification.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_notifications_wait_for_digest_window(self):
+        notify(self.user, 'join_request', 'Subject', 'Body')
+        self.assertEqual(deliver_pending(), (0, 0))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_burst_is_delivered_as_one_digest(self):
+        notify(self.user, 'join_request', 'First', 'Body one')
+        notify(self.user, 'team_invitation', 'Second', 'Body two')
+        self.make_due()
+
+        self.assertEqual(deliver_pending(), (2, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('2 new', mail.outbox[0].subject)
+        self.assertEqual(Notification.objects.filter(status='sent').count(), 2)
+
+    def test_failed_send_backs_off_then_gives_up(self):
+        notify(self.user, 'join_request', 'Subject', 'Body')
+        self.make_due()
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            self.assertEqual(deliver_pending(), (0, 1))
+            notification = Notification.objects.get()
+            self.assertEqual((notification.status, notification.attempts), ('pending', 1))
+            self.assertGreater(notification.next_attempt_at, timezone.now())
+
+            self.make_due()
+            deliver_pending()
+        self.assertEqual(Notification.objects.get().status, 'failed')
+
+    def test_recipient_digest_only_includes_due_notifications(self):
+        notify(self.user, 'join_request', 'Due', 'Body')
+        self.make_due()
+        notify(self.user, 'team_invitation', 'Still waiting', 'Body')
+
+        self.assertEqual(deliver_pending(), (1, 0))
+        self.assertEqual(mail.outbox[0].subject, 'Due')
+        self.assertEqual(Notification.objects.get(status='pending').subject, 'Still waiting')
+
+    def test_claimed_notifications_are_skipped_by_other_runs(self):
+        notify(self.user, 'join_request', 'Subject', 'Body')
+        self.make_due()
+
+        self.assertEqual(len(_claim_batch(100)), 1)
+        self.assertEqual(deliver_pending(), (0, 0))
+
+        # Once the claim runs out another run picks it up again
+        self.make_due()
+        self.assertEqual(deliver_pending(), (1, 0))
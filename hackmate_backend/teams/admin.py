@@ -1,8 +1,9 @@
 from django.contrib import admin
-from .models import Team, TeamInvitation, TeamMembership, TeamMessage
+from .models import Team, TeamInvitation, TeamMembership, TeamMessage, TeamFileBlob
 # Register your models here.
 
 admin.site.register(Team)
 admin.site.register(TeamInvitation)
 admin.site.register(TeamMembership)
-admin.site.register(TeamMessage)
\ No newline at end of file
+admin.site.register(TeamMessage)
+admin.site.register(TeamFileBlob)
\ No newline at end of file
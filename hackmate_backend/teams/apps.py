@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class TeamsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'teams'
+
+    def ready(self):
+        # Members are removed, leave, or go with a deleted team through
+        # several views and the admin, so the chat sockets follow the model
+        from . import consumers
+        TeamMembership = self.get_model('TeamMembership')
+        post_save.connect(consumers.membership_changed, sender=TeamMembership, dispatch_uid='teams.consumers.membership_saved')
+        post_delete.connect(consumers.membership_changed, sender=TeamMembership, dispatch_uid='teams.consumers.membership_deleted')
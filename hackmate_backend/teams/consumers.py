@@ -0,0 +1,104 @@
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_save
+from rest_framework.renderers import JSONRenderer
+from .models import TeamMembership
+
+
+def team_chat_group(team_id):
+    return f'team_chat_{team_id}'
+
+
+def team_member_group(team_id, user_id):
+    """One member's sockets on a team's chat, so they can be closed on removal"""
+    return f'team_chat_{team_id}_user_{user_id}'
+
+
+def broadcast_team_event(team_id, event_type, message):
+    """
+    Push a chat event to everyone connected to the team's channel.
+    The payload is rendered to JSON once here instead of once per subscriber,
+    and only sent after the surrounding transaction commits.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    payload = JSONRenderer().render({'type': event_type, 'message': message}).decode()
+
+    def send():
+        async_to_sync(channel_layer.group_send)(
+            team_chat_group(team_id),
+            {'type': 'chat.event', 'payload': payload}
+        )
+
+    transaction.on_commit(send)
+
+
+def membership_changed(sender, instance, **kwargs):
+    """
+    Close the sockets of a member who is no longer active (removed, left,
+    or the membership or team deleted). Membership is only checked when a
+    socket connects, so without this they would keep receiving the chat.
+    """
+    if kwargs.get('signal') is post_save and instance.status == 'active':
+        return
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    group = team_member_group(instance.team_id, instance.user_id)
+
+    def send():
+        async_to_sync(channel_layer.group_send)(group, {'type': 'chat.revoke'})
+
+    transaction.on_commit(send)
+
+
+class TeamChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Live feed of a team's chat. Messages are still sent through the REST API;
+    this socket only pushes message.created / message.updated / message.deleted
+    events to active members so clients don't have to poll team_messages.
+    A member who stops being active is disconnected with code 4403.
+    """
+
+    async def connect(self):
+        self.team_id = str(self.scope['url_route']['kwargs']['team_id'])
+        self.group_name = self.member_group_name = None
+        user = self.scope.get('user')
+
+        if not user or not user.is_authenticated or not await self.is_active_member(user):
+            await self.close(code=4403)
+            return
+
+        self.group_name = team_chat_group(self.team_id)
+        self.member_group_name = team_member_group(self.team_id, user.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.channel_layer.group_add(self.member_group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            await self.channel_layer.group_discard(self.member_group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Keep-alive only; everything else goes through the REST endpoints
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def chat_event(self, event):
+        await self.send(text_data=event['payload'])
+
+    async def chat_revoke(self, event):
+        await self.close(code=4403)
+
+    @database_sync_to_async
+    def is_active_member(self, user):
+        return TeamMembership.objects.filter(
+            team_id=self.team_id, user=user, status='active'
+        ).exists()
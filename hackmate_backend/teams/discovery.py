@@ -0,0 +1,93 @@
+from django.db.models import Count, Exists, F, Func, IntegerField, OuterRef, Q, Subquery
+
+from users.models import UserSkill
+from users import autocomplete
+from users.skills import resolve_skills
+from .models import Team, TeamMembership, TeamSkill
+
+
+def index_team_skills(team):
+    """Replace the team's rows in the skill index with its current needs"""
+    wanted = {
+        skill.id: skill.name
+        for skill in resolve_skills(list(team.required_skills or []) + list(team.looking_for_roles or []))
+    }
+    TeamSkill.objects.filter(team=team).exclude(skill_id__in=wanted).delete()
+    existing = set(TeamSkill.objects.filter(team=team).values_list('skill_id', flat=True))
+    added = wanted.keys() - existing
+    TeamSkill.objects.bulk_create([
+        TeamSkill(hackathon_id=team.hackathon_id, team=team, skill_id=skill_id)
+        for skill_id in added
+    ])
+    autocomplete.record('skill', [wanted[skill_id] for skill_id in added])
+
+
+def _active_member_count():
+    return Subquery(
+        TeamMembership.objects.filter(team_id=OuterRef('team_id'), status='active')
+        .order_by().annotate(n=Func(F('pk'), function='COUNT')).values('n'),
+        output_field=IntegerField()
+    )
+
+
+def rank_teams(hackathon_id, ids, user=None, limit=20):
+    """
+    Open teams in a hackathon with free spots, ranked by how many of the
+    skill `ids` they are looking for. Returns [(team_id, score)] best first.
+    The match runs entirely on the (hackathon, skill, team) index; only teams
+    sharing at least one skill are ever touched.
+    """
+    if not ids:
+        return []
+
+    matches = TeamSkill.objects.filter(
+        hackathon_id=hackathon_id,
+        skill_id__in=ids,
+        team__status='looking',
+        team__max_members__gt=_active_member_count()
+    )
+    if user is not None:
+        matches = matches.exclude(Exists(
+            TeamMembership.objects.filter(team_id=OuterRef('team_id'), user=user, status__in=['active', 'pending'])
+        ))
+
+    ranked = matches.values('team_id').annotate(score=Count('pk')).order_by('-score', 'team_id')[:limit]
+    return [(row['team_id'], row['score']) for row in ranked]
+
+
+def discover_teams(user, hackathon_id, limit=20):
+    """
+    Teams that need this user, as (team, score, matched_skill_names) tuples.
+    The user's indexed profile skills are combined with the skills and roles
+    from their application to the hackathon, if they have one.
+    """
+    ids = set(UserSkill.objects.filter(user=user, kind='skill').values_list('skill_id', flat=True))
+    application = user.hackathon_applications.filter(hackathon_id=hackathon_id).values(
+        'skill_ids', 'preferred_roles'
+    ).first()
+    if application:
+        ids.update(application['skill_ids'])
+        ids.update(skill.id for skill in resolve_skills(application['preferred_roles'], create=False))
+
+    ranked = rank_teams(hackathon_id, ids, user=user, limit=limit)
+    if not ranked:
+        return []
+
+    team_ids = [team_id for team_id, _ in ranked]
+    teams = Team.objects.select_related('hackathon', 'team_leader').annotate(
+        member_count=Count('teammembership', filter=Q(teammembership__status='active'))
+    ).in_bulk(team_ids)
+
+    matched = {}
+    for team_id, name in TeamSkill.objects.filter(team_id__in=team_ids, skill_id__in=ids).values_list(
+        'team_id', 'skill__name'
+    ):
+        matched.setdefault(team_id, []).append(name)
+
+    results = []
+    for team_id, score in ranked:
+        team = teams.get(team_id)
+        if team is None:
+            continue
+        results.append((team, score, sorted(matched.get(team_id, []))))
+    return results
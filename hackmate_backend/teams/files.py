@@ -0,0 +1,201 @@
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+# Upload helpers
+def upload_part_path(upload):
+    """Where the in-progress bytes of a TeamUpload live on disk"""
+    return os.path.join(settings.MEDIA_ROOT, 'team_uploads', f'{upload.id}.part')
+
+
+def parse_content_range(header):
+    """Parse 'bytes start-end/total' into a tuple, or None if malformed"""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end, total = (int(value) for value in match.groups())
+    if end < start:
+        return None
+    return start, end, total
+
+
+def write_chunk(upload, stream, start, length):
+    """
+    Copy `length` bytes from the request stream into the upload's part file
+    at `start`, a block at a time. Returns the number of bytes written.
+    Writing at an explicit offset makes retried chunks idempotent.
+    """
+    path = upload_part_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    written = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as part:
+        part.seek(start)
+        while written < length:
+            block = stream.read(min(STREAM_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            part.write(block)
+            written += len(block)
+    return written
+
+
+class PartFile(File):
+    """
+    A finished part file. Exposing temporary_file_path() lets
+    FileSystemStorage move it into place instead of copying it.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def open_completed_upload(upload):
+    """Wrap a finished part file so it can be saved into a FileField"""
+    return PartFile(open(upload_part_path(upload), 'rb'), name=upload.file_name)
+
+
+def discard_upload(upload):
+    try:
+        os.remove(upload_part_path(upload))
+    except FileNotFoundError:
+        pass
+
+
+# Content-addressed storage
+def hash_file(file_obj):
+    """sha256 of a file, read a block at a time so it never sits in memory"""
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for block in iter(lambda: file_obj.read(STREAM_BLOCK_SIZE), b''):
+        digest.update(block)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def blob_path(sha256):
+    return f'team_files/blobs/{sha256[:2]}/{sha256}'
+
+
+def store_blob(file_obj, size):
+    """
+    Store an attachment by content hash and return its TeamFileBlob.
+    If the same bytes were uploaded before, nothing is written: the existing
+    blob is reused and just marked as referenced again.
+    """
+    from .models import TeamFileBlob
+
+    sha256 = hash_file(file_obj)
+    now = timezone.now()
+
+    if TeamFileBlob.objects.filter(pk=sha256).update(last_referenced_at=now):
+        return TeamFileBlob.objects.get(pk=sha256)
+
+    name = blob_path(sha256)
+    if not default_storage.exists(name):
+        name = default_storage.save(name, file_obj)
+
+    blob, _ = TeamFileBlob.objects.get_or_create(
+        sha256=sha256,
+        defaults={'file': name, 'size': size, 'last_referenced_at': now}
+    )
+    return blob
+
+
+# Download helpers
+def parse_range(header, size):
+    """
+    Parse a single 'bytes=a-b' Range header against a file of `size` bytes.
+    Returns (start, end) inclusive, None if there is no usable Range header,
+    or False if the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def iter_file_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = fh.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def attachment_response(request, name, download_name):
+    """
+    Serve a stored file (by storage name). When TEAM_FILES_SENDFILE is configured the
+    web server does the actual transfer (and handles Range itself);
+    otherwise the file is streamed from disk with single-range support.
+    """
+    content_type = mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+    disposition = 'attachment; filename="{}"'.format(download_name.replace('"', ''))
+
+    backend = getattr(settings, 'TEAM_FILES_SENDFILE', None)
+    if backend == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.TEAM_FILES_SENDFILE_PREFIX + name
+        response['Content-Disposition'] = disposition
+        return response
+    if backend == 'xsendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = default_storage.path(name)
+        response['Content-Disposition'] = disposition
+        return response
+
+    path = default_storage.path(name)
+    size = os.path.getsize(path)
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_file_range(path, start, end - start + 1),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = disposition
+    return response
@@ -0,0 +1,190 @@
+import base64
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db.models import CharField, F, Func, IntegerField, Q, Subquery, Value
+from django.db.models.functions import Cast
+from django.utils.dateparse import parse_datetime
+
+from .models import TeamInvitation, TeamMembership
+
+# Feed item kinds, in the order used to break ties between equal timestamps
+JOIN_REQUEST = 'join_request'
+INVITATION_RECEIVED = 'invitation_received'
+INVITATION_SENT = 'invitation_request_sent'
+
+
+def join_requests_for(user):
+    """Join requests the user sent themselves (all statuses)"""
+    return TeamMembership.objects.filter(user=user, invited_by=user)
+
+
+def invitations_received_for(user):
+    return TeamInvitation.objects.unexpired().filter(invitee=user)
+
+
+def invitations_sent_for(user):
+    return TeamInvitation.objects.unexpired().filter(inviter=user)
+
+
+def encode_cursor(item):
+    raw = json.dumps({'at': item['at'].isoformat(), 'kind': item['kind'], 'id': item['item_id']})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns (at, kind, item_id); raises ValueError if the cursor is malformed"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        at = parse_datetime(data['at'])
+        kind, item_id = str(data['kind']), str(data['id'])
+    except (KeyError, TypeError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if at is None:
+        raise ValueError('Invalid cursor')
+    return at, kind, item_id
+
+
+def _feed_part(queryset, kind, time_field, cursor):
+    part = queryset.order_by().annotate(
+        kind=Value(kind, output_field=CharField()),
+        item_id=Cast('id', output_field=CharField()),
+        at=F(time_field)
+    )
+
+    if cursor:
+        # Keyset pagination over (at, kind, item_id) descending. `kind` is a
+        # constant within each part, so the tie-break folds into a simple
+        # filter that can use the per-user indexes.
+        at, cursor_kind, cursor_id = cursor
+        if kind < cursor_kind:
+            part = part.filter(**{f'{time_field}__lte': at})
+        elif kind == cursor_kind:
+            part = part.filter(Q(**{f'{time_field}__lt': at}) | Q(**{time_field: at, 'item_id__lt': cursor_id}))
+        else:
+            part = part.filter(**{f'{time_field}__lt': at})
+
+    return part.values('kind', 'item_id', 'at')
+
+
+def inbox_page(user, cursor=None, limit=20):
+    """
+    One page of the user's time-ordered inbox: join requests, invitations
+    received and invitation requests sent, merged with a single UNION ALL.
+    Returns (rows, next_cursor) where each row is {'kind', 'item_id', 'at'}.
+    """
+    feed = _feed_part(join_requests_for(user), JOIN_REQUEST, 'invited_at', cursor).union(
+        _feed_part(invitations_received_for(user), INVITATION_RECEIVED, 'created_at', cursor),
+        _feed_part(invitations_sent_for(user), INVITATION_SENT, 'created_at', cursor),
+        all=True
+    ).order_by('-at', '-kind', '-item_id')
+
+    rows = list(feed[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def _count(queryset):
+    return Subquery(
+        queryset.order_by().annotate(n=Func(F('pk'), function='COUNT')).values('n'),
+        output_field=IntegerField()
+    )
+
+
+def inbox_counts(user):
+    """Per-category totals for the inbox, computed in a single query"""
+    return get_user_model().objects.filter(pk=user.pk).values(
+        join_requests=_count(join_requests_for(user)),
+        invitations_received=_count(invitations_received_for(user)),
+        invitation_requests_sent=_count(invitations_sent_for(user)),
+    ).get()
+
+
+def load_inbox_items(rows):
+    """Fetch the objects behind a page of feed rows (at most two queries)"""
+    membership_ids = [int(row['item_id']) for row in rows if row['kind'] == JOIN_REQUEST]
+    invitation_ids = [uuid.UUID(row['item_id']) for row in rows if row['kind'] != JOIN_REQUEST]
+
+    memberships = TeamMembership.objects.select_related('team__hackathon').in_bulk(membership_ids) if membership_ids else {}
+    invitations = TeamInvitation.objects.select_related(
+        'team__hackathon', 'inviter', 'invitee'
+    ).in_bulk(invitation_ids) if invitation_ids else {}
+
+    items = []
+    for row in rows:
+        if row['kind'] == JOIN_REQUEST:
+            obj = memberships.get(int(row['item_id']))
+        else:
+            obj = invitations.get(uuid.UUID(row['item_id']))
+        if obj is not None:
+            items.append((row['kind'], obj))
+    return items
+
+
+# Serialization shared by the inbox feed and get_all_user_requests
+def serialize_join_request(membership):
+    return {
+        'id': membership.id,
+        'team': {
+            'id': membership.team.id,
+            'name': membership.team.name,
+            'hackathon_title': membership.team.hackathon.title
+        },
+        'status': membership.status,
+        'role': membership.role,
+        'skills_contribution': membership.skills_contribution,
+        'preferred_role_in_project': membership.preferred_role_in_project,
+        'invitation_message': membership.invitation_message,
+        'created_at': membership.invited_at,
+        'joined_at': membership.joined_at,
+        'left_at': membership.left_at
+    }
+
+
+def serialize_invitation_received(invitation):
+    return {
+        'id': invitation.id,
+        'team': {
+            'id': invitation.team.id,
+            'name': invitation.team.name,
+            'hackathon_title': invitation.team.hackathon.title
+        },
+        'inviter': invitation.inviter.name,
+        'message': invitation.message,
+        'status': invitation.status,
+        'created_at': invitation.created_at,
+        'responded_at': invitation.responded_at,
+        'expires_at': invitation.expires_at
+    }
+
+
+def serialize_invitation_sent(invitation):
+    return {
+        'id': invitation.id,
+        'team': {
+            'id': invitation.team.id,
+            'name': invitation.team.name,
+            'hackathon_title': invitation.team.hackathon.title
+        },
+        'invitee': invitation.invitee.name,
+        'invitee_email': invitation.invitee.email,
+        'message': invitation.message,
+        'status': invitation.status,
+        'created_at': invitation.created_at,
+        'responded_at': invitation.responded_at,
+        'expires_at': invitation.expires_at
+    }
+
+
+SERIALIZERS = {
+    JOIN_REQUEST: serialize_join_request,
+    INVITATION_RECEIVED: serialize_invitation_received,
+    INVITATION_SENT: serialize_invitation_sent,
+}
+
+
+def serialize_inbox_item(kind, obj):
+    data = SERIALIZERS[kind](obj)
+    data['type'] = kind
+    return data
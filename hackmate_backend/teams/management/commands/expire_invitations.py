@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from teams.models import TeamInvitation
+
+
+class Command(BaseCommand):
+    help = 'Mark pending and leader_pending team invitations past their expires_at as expired.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Invitations to update per statement (default: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report how many invitations would expire without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        due = TeamInvitation.objects.past_expiry(now)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f'[dry run] {due.count()} invitations would be marked expired'
+            ))
+            return
+
+        # Each batch is picked off the (status, expires_at) index and updated
+        # by primary key, so no single statement holds locks for long
+        total = 0
+        while True:
+            ids = list(due.order_by('expires_at').values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += TeamInvitation.objects.filter(
+                pk__in=ids, status__in=TeamInvitation.OPEN_STATUSES
+            ).update(status='expired')
+
+        self.stdout.write(self.style.SUCCESS(f'Marked {total} invitations as expired'))
@@ -0,0 +1,96 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from teams.files import discard_upload
+from teams.models import TeamFileBlob, TeamMessage, TeamUpload
+
+
+class Command(BaseCommand):
+    help = (
+        'Garbage-collect team chat files: blobs no message references anymore, '
+        'abandoned resumable uploads and stray files under team_files/.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age-hours', type=int, default=24,
+            help='Only collect things untouched for at least this long (default: 24)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would be removed without deleting anything'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['min_age_hours'])
+        dry_run = options['dry_run']
+
+        blobs = self.collect_blobs(cutoff, dry_run)
+        uploads = self.collect_uploads(cutoff, dry_run)
+        strays = self.collect_stray_files(cutoff, dry_run)
+
+        prefix = '[dry run] ' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}Removed {blobs} unreferenced blobs, {uploads} abandoned uploads '
+            f'and {strays} stray files'
+        ))
+
+    def collect_blobs(self, cutoff, dry_run):
+        # last_referenced_at is bumped on every reuse, so a blob that was just
+        # deduplicated against can't be collected before its message is saved
+        unreferenced = TeamFileBlob.objects.filter(
+            messages__isnull=True,
+            last_referenced_at__lt=cutoff
+        )
+        count = 0
+        for blob in unreferenced.iterator():
+            count += 1
+            if not dry_run:
+                blob.file.delete(save=False)
+                blob.delete()
+        return count
+
+    def collect_uploads(self, cutoff, dry_run):
+        stale = TeamUpload.objects.filter(updated_at__lt=cutoff)
+        count = 0
+        for upload in stale.iterator():
+            count += 1
+            if not dry_run:
+                discard_upload(upload)
+                upload.delete()
+        return count
+
+    def collect_stray_files(self, cutoff, dry_run):
+        """Files on disk that no blob, message, preview or live upload points at"""
+        referenced = set(TeamFileBlob.objects.values_list('file', flat=True))
+        referenced.update(
+            TeamMessage.objects.exclude(file_attachment='')
+            .exclude(file_attachment__isnull=True)
+            .values_list('file_attachment', flat=True)
+        )
+        for previews in TeamMessage.objects.filter(preview_status='ready').values_list('previews', flat=True):
+            referenced.update(size['path'] for size in previews.get('sizes', {}).values())
+        referenced.update(
+            f'team_uploads/{upload_id}.part'
+            for upload_id in TeamUpload.objects.values_list('id', flat=True)
+        )
+
+        cutoff_ts = cutoff.timestamp()
+        count = 0
+        for top in ('team_files', 'team_uploads'):
+            root = os.path.join(settings.MEDIA_ROOT, top)
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    name = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+                    if name in referenced or os.path.getmtime(path) >= cutoff_ts:
+                        continue
+                    count += 1
+                    if not dry_run:
+                        default_storage.delete(name)
+        return count
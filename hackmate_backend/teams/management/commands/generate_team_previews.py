@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from teams.models import TeamMessage
+from teams.previews import generate_previews
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnails for image messages that are still missing them (backfill / retry)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Also retry messages whose previews failed before'
+        )
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+        # Images uploaded before previews existed are still 'none'
+        messages = TeamMessage.objects.filter(message_type='image').exclude(
+            file_attachment=''
+        ).exclude(file_attachment__isnull=True).filter(
+            preview_status__in=statuses + ['none']
+        ).values_list('id', flat=True)
+
+        count = 0
+        for message_id in messages.iterator():
+            generate_previews(message_id)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {count} image messages'))
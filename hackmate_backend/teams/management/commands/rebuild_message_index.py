@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from teams.search import FTS_TABLE, fts_available
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the team chat full-text index from TeamMessage. '
+        'Run this after a VACUUM, which can renumber the rowids the index is keyed on.'
+    )
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write('Full-text index is only used with SQLite; nothing to do')
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+        self.stdout.write(self.style.SUCCESS('Team chat search index rebuilt'))
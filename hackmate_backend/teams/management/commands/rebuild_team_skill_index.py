@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from teams.discovery import index_team_skills
+from teams.models import Team
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the skill -> team index used by team discovery. Only needed '
+        'if teams were edited outside the API (e.g. in the admin or a shell).'
+    )
+
+    def handle(self, *args, **options):
+        count = 0
+        for team in Team.objects.only('id', 'hackathon_id', 'required_skills', 'looking_for_roles').iterator():
+            index_team_skills(team)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed skills for {count} teams'))
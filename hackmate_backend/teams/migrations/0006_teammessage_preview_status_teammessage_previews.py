@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0005_teamfileblob_teammessage_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammessage',
+            name='preview_status',
+            field=models.CharField(choices=[('none', 'No Preview'), ('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='none', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='teammessage',
+            name='previews',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
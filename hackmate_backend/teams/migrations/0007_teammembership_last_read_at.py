@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0006_teammessage_preview_status_teammessage_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammembership',
+            name='last_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# SQLite FTS5 index over TeamMessage.content, kept in sync by triggers.
+# It is an external-content table keyed on the message table's rowid, so
+# message text is not stored twice. Other database backends skip this and
+# teams.search falls back to a plain LIKE query.
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE teams_teammessage_fts USING fts5(
+        content,
+        team_id UNINDEXED,
+        content='teams_teammessage',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER teams_teammessage_fts_ai AFTER INSERT ON teams_teammessage BEGIN
+        INSERT INTO teams_teammessage_fts(rowid, content, team_id)
+        VALUES (new.rowid, new.content, new.team_id);
+    END
+    """,
+    """
+    CREATE TRIGGER teams_teammessage_fts_ad AFTER DELETE ON teams_teammessage BEGIN
+        INSERT INTO teams_teammessage_fts(teams_teammessage_fts, rowid, content, team_id)
+        VALUES ('delete', old.rowid, old.content, old.team_id);
+    END
+    """,
+    """
+    CREATE TRIGGER teams_teammessage_fts_au AFTER UPDATE OF content, team_id ON teams_teammessage BEGIN
+        INSERT INTO teams_teammessage_fts(teams_teammessage_fts, rowid, content, team_id)
+        VALUES ('delete', old.rowid, old.content, old.team_id);
+        INSERT INTO teams_teammessage_fts(rowid, content, team_id)
+        VALUES (new.rowid, new.content, new.team_id);
+    END
+    """,
+    # Index messages that already exist
+    "INSERT INTO teams_teammessage_fts(teams_teammessage_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS teams_teammessage_fts_au",
+    "DROP TRIGGER IF EXISTS teams_teammessage_fts_ad",
+    "DROP TRIGGER IF EXISTS teams_teammessage_fts_ai",
+    "DROP TABLE IF EXISTS teams_teammessage_fts",
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0007_teammembership_last_read_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0008_teammessage_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teaminvitation',
+            index=models.Index(fields=['invitee', '-created_at'], name='teams_teami_invitee_9e746e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teaminvitation',
+            index=models.Index(fields=['inviter', '-created_at'], name='teams_teami_inviter_455a23_idx'),
+        ),
+    ]
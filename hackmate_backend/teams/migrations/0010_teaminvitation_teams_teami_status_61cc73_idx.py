@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0009_teaminvitation_teams_teami_invitee_9e746e_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teaminvitation',
+            index=models.Index(fields=['status', 'expires_at'], name='teams_teami_status_61cc73_idx'),
+        ),
+    ]
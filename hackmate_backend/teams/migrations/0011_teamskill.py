@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def skill_terms(*lists):
+    # Frozen copy of teams.discovery.skill_terms as of this migration
+    return {
+        ' '.join(str(value).split()).lower()[:100]
+        for values in lists for value in values or []
+        if str(value).strip()
+    }
+
+
+def build_skill_index(apps, schema_editor):
+    Team = apps.get_model('teams', 'Team')
+    TeamSkill = apps.get_model('teams', 'TeamSkill')
+    rows = []
+    for team in Team.objects.only('id', 'hackathon_id', 'required_skills', 'looking_for_roles').iterator():
+        rows.extend(
+            TeamSkill(hackathon_id=team.hackathon_id, team_id=team.id, term=term)
+            for term in skill_terms(team.required_skills, team.looking_for_roles)
+        )
+    TeamSkill.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0005_alter_hackathon_description'),
+        ('teams', '0010_teaminvitation_teams_teami_status_61cc73_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('hackathon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='hackathons.hackathon')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hackathon', 'term', 'team'], name='teams_teams_hackath_ff9c6b_idx')],
+                'unique_together': {('team', 'term')},
+            },
+        ),
+        # Reversing the CreateModel drops the index rows with the table
+        migrations.RunPython(build_skill_index, migrations.RunPython.noop),
+    ]
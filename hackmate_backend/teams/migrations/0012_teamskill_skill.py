@@ -0,0 +1,91 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from users.taxonomy import Resolver, normalize
+
+
+def clear_skill_index(apps, schema_editor):
+    # TeamSkill is derived data; it is rebuilt against the taxonomy below
+    apps.get_model('teams', 'TeamSkill').objects.all().delete()
+
+
+def rebuild_term_index(apps, schema_editor):
+    # Reverse of clear_skill_index: the 0011 index of normalized terms
+    Team = apps.get_model('teams', 'Team')
+    TeamSkill = apps.get_model('teams', 'TeamSkill')
+    rows = []
+    for team in Team.objects.only('id', 'hackathon_id', 'required_skills', 'looking_for_roles').iterator():
+        terms = {
+            normalize(value) for values in (team.required_skills, team.looking_for_roles)
+            for value in values or [] if str(value).strip()
+        }
+        rows.extend(TeamSkill(hackathon_id=team.hackathon_id, team_id=team.id, term=term) for term in terms)
+    TeamSkill.objects.bulk_create(rows, batch_size=1000)
+
+
+def backfill_teams(apps, schema_editor):
+    Team = apps.get_model('teams', 'Team')
+    TeamSkill = apps.get_model('teams', 'TeamSkill')
+    resolver = Resolver(apps)
+
+    rows = []
+    for team in Team.objects.only('id', 'hackathon_id', 'required_skills', 'looking_for_roles').iterator():
+        skill_ids = resolver.ids(team.required_skills)
+        role_ids = resolver.ids(team.looking_for_roles)
+        Team.objects.filter(pk=team.pk).update(
+            required_skills=resolver.names_for(skill_ids),
+            looking_for_roles=resolver.names_for(role_ids)
+        )
+        rows.extend(
+            TeamSkill(hackathon_id=team.hackathon_id, team_id=team.id, skill_id=skill_id)
+            for skill_id in set(skill_ids) | set(role_ids)
+        )
+    TeamSkill.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0011_teamskill'),
+        ('users', '0008_skill_skillalias_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_skill_index, rebuild_term_index),
+        migrations.RemoveIndex(
+            model_name='teamskill',
+            name='teams_teams_hackath_ff9c6b_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='teamskill',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='teamskill',
+            name='term',
+        ),
+        migrations.AddField(
+            model_name='teamskill',
+            name='skill',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.skill'),
+        ),
+        # Going back, the skill-based rows are dropped so the term column can
+        # return; the skill lists keep their canonical spellings, since the
+        # original ones aren't stored anywhere
+        migrations.RunPython(backfill_teams, clear_skill_index),
+        migrations.AlterField(
+            model_name='teamskill',
+            name='skill',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.skill'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='teamskill',
+            unique_together={('team', 'skill')},
+        ),
+        migrations.AddIndex(
+            model_name='teamskill',
+            index=models.Index(fields=['hackathon', 'skill', 'team'], name='teams_teams_hackath_9f07ce_idx'),
+        ),
+    ]
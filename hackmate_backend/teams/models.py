@@ -1,10 +1,24 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 import uuid
 
 User = get_user_model()
 
+class TeamQuerySet(models.QuerySet):
+    def with_active_members(self):
+        """
+        Prefetch each team's active memberships and their users into
+        team.active_memberships, which the member count and the serializers
+        use instead of querying per team.
+        """
+        return self.prefetch_related(models.Prefetch(
+            'teammembership_set',
+            queryset=TeamMembership.objects.filter(status='active').select_related('user'),
+            to_attr='active_memberships'
+        ))
+
 class Team(models.Model):
     STATUS_CHOICES = [
         ('looking', 'Looking for Members'),
@@ -60,6 +74,8 @@ class Team(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TeamQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
@@ -74,6 +90,8 @@ class Team(models.Model):
     
     @property
     def current_member_count(self):
+        if hasattr(self, 'active_memberships'):
+            return len(self.active_memberships)
         return self.teammembership_set.filter(status='active').count()
     
     @property
@@ -95,6 +113,27 @@ class Team(models.Model):
         self.save(update_fields=['status'])
 
 
+class TeamSkill(models.Model):
+    """
+    Inverted index from canonical skill to team, partitioned by hackathon.
+    One row per distinct skill in a team's required_skills and
+    looking_for_roles; rebuilt by teams.discovery.index_team_skills whenever
+    those change. Team discovery ranks teams by how many rows match.
+    """
+    hackathon = models.ForeignKey('hackathons.Hackathon', on_delete=models.CASCADE, related_name='+')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='skill_index')
+    skill = models.ForeignKey('users.Skill', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ['team', 'skill']
+        indexes = [
+            models.Index(fields=['hackathon', 'skill', 'team']),
+        ]
+
+    def __str__(self):
+        return f"{self.skill_id} -> {self.team_id}"
+
+
 class TeamMembership(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -124,6 +163,9 @@ class TeamMembership(models.Model):
     invited_at = models.DateTimeField(auto_now_add=True)
     joined_at = models.DateTimeField(null=True, blank=True)
     left_at = models.DateTimeField(null=True, blank=True)
+
+    # Chat read cursor: messages created after this are unread for this member
+    last_read_at = models.DateTimeField(null=True, blank=True)
     
     # Invitation details - this creates the second FK to User that caused the issue
     invited_by = models.ForeignKey(
@@ -147,6 +189,27 @@ class TeamMembership(models.Model):
         return f"{self.user.name} in {self.team.name} ({self.status})"
 
 
+class TeamInvitationQuerySet(models.QuerySet):
+    def past_expiry(self, now=None):
+        """Open invitations whose expires_at has passed but that aren't marked expired yet"""
+        return self.filter(
+            status__in=TeamInvitation.OPEN_STATUSES,
+            expires_at__lte=now or timezone.now()
+        )
+
+    def unexpired(self):
+        """
+        Everything except expired invitations, whether or not the
+        expire_invitations sweep has marked them yet. The predicate is on
+        (status, expires_at), so it is evaluated by the database alongside
+        the invitee/inviter/team filters rather than row by row in Python.
+        """
+        return self.exclude(status='expired').exclude(
+            status__in=TeamInvitation.OPEN_STATUSES,
+            expires_at__lte=timezone.now()
+        )
+
+
 class TeamInvitation(models.Model):
     STATUS_CHOICES = [
         ('leader_pending', 'Waiting for Leader Approval'),
@@ -156,6 +219,8 @@ class TeamInvitation(models.Model):
         ('rejected', 'Rejected by Leader'),
         ('expired', 'Expired'),
     ]
+    # Statuses still waiting on someone; these are the ones that can expire
+    OPEN_STATUSES = ('leader_pending', 'pending')
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='invitations')
@@ -172,10 +237,39 @@ class TeamInvitation(models.Model):
     class Meta:
         unique_together = ['team', 'invitee']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['invitee', '-created_at']),
+            models.Index(fields=['inviter', '-created_at']),
+            # Used by the expire_invitations sweeper and the unexpired() filter
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    objects = TeamInvitationQuerySet.as_manager()
     
     def __str__(self):
         return f"Invitation to {self.invitee.name} for {self.team.name}"
 
+    @property
+    def is_expired(self):
+        return self.status in self.OPEN_STATUSES and self.expires_at <= timezone.now()
+
+
+class TeamFileBlob(models.Model):
+    """
+    Content-addressed storage for chat attachments. Identical files uploaded
+    any number of times share one blob on disk; messages reference it and
+    the gc_team_files command removes blobs nothing points at anymore.
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to='team_files/blobs/')
+    size = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_referenced_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes)"
+
 
 class TeamMessage(models.Model):
     MESSAGE_TYPES = [
@@ -184,6 +278,13 @@ class TeamMessage(models.Model):
         ('image', 'Image'),
         ('system', 'System'),
     ]
+
+    PREVIEW_STATUS_CHOICES = [
+        ('none', 'No Preview'),
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='messages')
@@ -194,9 +295,20 @@ class TeamMessage(models.Model):
     
     # File attachment (optional)
     file_attachment = models.FileField(upload_to='team_files/', blank=True, null=True)
+    blob = models.ForeignKey(
+        TeamFileBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='messages'
+    )
     file_name = models.CharField(max_length=255, blank=True)
     file_size = models.PositiveIntegerField(default=0)
     
+    # Image previews, filled in in the background by teams.previews
+    preview_status = models.CharField(max_length=10, choices=PREVIEW_STATUS_CHOICES, default='none')
+    previews = models.JSONField(default=dict, blank=True)
+
     # Message metadata
     is_edited = models.BooleanField(default=False)
     edited_at = models.DateTimeField(null=True, blank=True)
@@ -216,3 +328,35 @@ class TeamMessage(models.Model):
     
     def __str__(self):
         return f"Message by {self.sender.name} in {self.team.name}"
+
+
+class TeamUpload(models.Model):
+    """
+    A resumable chat attachment upload. Chunks are appended straight to a
+    .part file on disk, so large files never sit in worker memory; once all
+    bytes have arrived the upload is turned into a TeamMessage.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='uploads')
+    uploader = models.ForeignKey(User, on_delete=models.CASCADE, related_name='team_uploads')
+
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.PositiveIntegerField()
+    received_bytes = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['uploader', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.file_name} ({self.received_bytes}/{self.total_size})"
+
+    @property
+    def is_complete(self):
+        return self.received_bytes >= self.total_size
@@ -0,0 +1,116 @@
+import base64
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import TeamMessage
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels for each stored thumbnail
+PREVIEW_SIZES = {
+    'small': 160,
+    'medium': 480,
+}
+PLACEHOLDER_SIZE = 16
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='team-previews')
+
+
+def schedule_previews(message_id):
+    """Generate previews for an image message once the current transaction commits"""
+    if getattr(settings, 'TEAM_PREVIEWS_ASYNC', True):
+        transaction.on_commit(lambda: _executor.submit(_generate_in_worker, message_id))
+    else:
+        transaction.on_commit(lambda: generate_previews(message_id))
+
+
+def _generate_in_worker(message_id):
+    close_old_connections()
+    try:
+        generate_previews(message_id)
+    except Exception:
+        logger.exception("Preview generation crashed for message %s", message_id)
+    finally:
+        close_old_connections()
+
+
+def preview_path(key, size_name):
+    return f'team_files/previews/{key[:2]}/{key}_{size_name}.jpg'
+
+
+def _encode_jpeg(image, quality):
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def render_previews(source, key):
+    """
+    Build the thumbnails for an open image file. Files are named after `key`
+    (the blob hash when there is one), so duplicate images share previews.
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+
+    previews = {
+        'width': image.width,
+        'height': image.height,
+        'sizes': {},
+    }
+
+    for size_name, edge in PREVIEW_SIZES.items():
+        thumb = image.copy()
+        thumb.thumbnail((edge, edge), Image.LANCZOS)
+        path = preview_path(key, size_name)
+        if not default_storage.exists(path):
+            path = default_storage.save(path, ContentFile(_encode_jpeg(thumb, 80)))
+        previews['sizes'][size_name] = {
+            'path': path,
+            'width': thumb.width,
+            'height': thumb.height,
+        }
+
+    # Tiny blurred JPEG inlined as a data URI so clients can paint something instantly
+    placeholder = image.copy()
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    previews['placeholder'] = 'data:image/jpeg;base64,' + base64.b64encode(
+        _encode_jpeg(placeholder, 30)
+    ).decode()
+
+    return previews
+
+
+def generate_previews(message_id):
+    """Render and record previews for one message, then push the update to the chat"""
+    from .consumers import broadcast_team_event
+    from .serializers import TeamMessageSerializer
+
+    try:
+        message = TeamMessage.objects.select_related('sender', 'blob').get(pk=message_id)
+    except TeamMessage.DoesNotExist:
+        return
+
+    if not message.file_attachment:
+        TeamMessage.objects.filter(pk=message.pk).update(preview_status='none')
+        return
+
+    key = message.blob_id or str(message.id)
+    try:
+        with message.file_attachment.open('rb') as source:
+            previews = render_previews(source, key)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning("Could not generate previews for message %s: %s", message.id, e)
+        TeamMessage.objects.filter(pk=message.pk).update(preview_status='failed')
+        return
+
+    TeamMessage.objects.filter(pk=message.pk).update(previews=previews, preview_status='ready')
+    message.previews = previews
+    message.preview_status = 'ready'
+    broadcast_team_event(message.team_id, 'message.updated', TeamMessageSerializer(message).data)
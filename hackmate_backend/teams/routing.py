@@ -0,0 +1,6 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/teams/<uuid:team_id>/chat/', consumers.TeamChatConsumer.as_asgi()),
+]
@@ -0,0 +1,82 @@
+import re
+import uuid
+
+from django.db import connection
+from django.utils.html import escape
+
+from .models import TeamMessage
+
+FTS_TABLE = 'teams_teammessage_fts'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Private-use characters mark hits inside snippets; they are swapped for
+# <mark> tags only after the message text has been HTML-escaped
+HIT_START = '\ue000'
+HIT_END = '\ue001'
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 query: every word must match, and the
+    last one is treated as a prefix so results update while typing.
+    Returns None if there is nothing searchable.
+    """
+    tokens = TOKEN_RE.findall(text or '')
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def render_snippet(snippet):
+    return escape(snippet).replace(HIT_START, '<mark>').replace(HIT_END, '</mark>')
+
+
+def search_team_messages(team_id, text, offset=0, limit=20):
+    """
+    Ranked search within one team's chat. Returns (hits, has_more) where each
+    hit is (message, snippet_html) in best-match-first order.
+    """
+    match_query = build_match_query(text)
+    if not match_query:
+        return [], False
+
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT m.id, snippet({FTS_TABLE}, 0, %s, %s, '…', 16)
+                FROM {FTS_TABLE} f
+                JOIN teams_teammessage m ON m.rowid = f.rowid
+                WHERE {FTS_TABLE} MATCH %s AND f.team_id = %s
+                ORDER BY f.rank
+                LIMIT %s OFFSET %s
+                """,
+                [HIT_START, HIT_END, match_query, team_id.hex, limit + 1, offset]
+            )
+            rows = cursor.fetchall()
+    else:
+        # No FTS index on this backend: newest matching messages first
+        rows = [
+            (message_id, content)
+            for message_id, content in TeamMessage.objects.filter(
+                team_id=team_id, content__icontains=text.strip()
+            ).order_by('-created_at').values_list('id', 'content')[offset:offset + limit + 1]
+        ]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    rows = [(uuid.UUID(str(message_id)), snippet) for message_id, snippet in rows]
+    messages = TeamMessage.objects.select_related('sender').in_bulk([message_id for message_id, _ in rows])
+    hits = [
+        (messages[message_id], render_snippet(snippet))
+        for message_id, snippet in rows
+        if message_id in messages
+    ]
+    return hits, has_more
@@ -1,18 +1,30 @@
 from datetime import timedelta
 from rest_framework import serializers
+from hackmate_backend.serializers import DynamicFieldsMixin
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
 from .models import Team, TeamMembership, TeamMessage, TeamInvitation
+from .discovery import index_team_skills
+from users.skills import canonical_names
+from .files import store_blob
 from hackathons.models import HackathonApplication
 
 User = get_user_model()
 
-class UserBasicSerializer(serializers.ModelSerializer):
+def active_memberships_of(team):
+    """Active memberships with users, from Team.objects.with_active_members() when it was used"""
+    if hasattr(team, 'active_memberships'):
+        return team.active_memberships
+    return team.teammembership_set.filter(status='active').select_related('user')
+
+class UserBasicSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'name', 'email', 'experience_level', 'skills', 'github_url', 'average_rating']
 
-class TeamMembershipSerializer(serializers.ModelSerializer):
+class TeamMembershipSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserBasicSerializer(read_only=True)
 
     class Meta:
@@ -21,9 +33,10 @@ class TeamMembershipSerializer(serializers.ModelSerializer):
             'id', 'user', 'role', 'status', 'skills_contribution',
             'preferred_role_in_project', 'invitation_message', 'invited_at', 'joined_at'
         ]
+        expandable_fields = ['user']
 
 # ADD THIS - TeamListSerializer for listing teams (simplified version)
-class TeamListSerializer(serializers.ModelSerializer):
+class TeamListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     team_leader = UserBasicSerializer(read_only=True)
     # current_member_count = serializers.ReadOnlyField()
     spots_available = serializers.ReadOnlyField()
@@ -39,10 +52,18 @@ class TeamListSerializer(serializers.ModelSerializer):
             'status', 'required_skills', 'looking_for_roles',
             'project_name', 'allow_remote', 'created_at', 'members'
         ]
+        expandable_fields = ['team_leader', 'members']
+        # Columns behind the computed fields, for sparse_queryset()
+        sparse_columns = {'members': [], 'current_member_count': [], 'spots_available': ['max_members']}
+        # Fields read from Team.objects.with_active_members()
+        sparse_prefetches = {
+            'members': ['active_memberships'], 'current_member_count': ['active_memberships'],
+            'spots_available': ['active_memberships']
+        }
 
     def get_members(self, obj):
         """Return only active members"""
-        active_memberships = obj.teammembership_set.filter(status='active').select_related('user')
+        active_memberships = active_memberships_of(obj)
         return [
             {
                 'id': membership.user.id,
@@ -54,7 +75,7 @@ class TeamListSerializer(serializers.ModelSerializer):
         ]
 
 # Detailed team serializer (for individual team views)
-class TeamDetailSerializer(serializers.ModelSerializer):
+class TeamDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     team_leader = UserBasicSerializer(read_only=True)
     # members = TeamMembershipSerializer(source='teammembership_set', many=True, read_only=True)
     # current_member_count = serializers.ReadOnlyField()
@@ -74,10 +95,19 @@ class TeamDetailSerializer(serializers.ModelSerializer):
             'project_name', 'project_idea', 'github_repo', 'demo_url',
             'allow_remote', 'created_at', 'updated_at'
         ]
+        expandable_fields = ['team_leader', 'members']
+        sparse_columns = {
+            'members': [], 'current_member_count': [],
+            'spots_available': ['max_members'], 'is_full': ['max_members']
+        }
+        sparse_prefetches = {
+            'members': ['active_memberships'], 'current_member_count': ['active_memberships'],
+            'spots_available': ['active_memberships'], 'is_full': ['active_memberships']
+        }
 
     def get_members(self, obj):
         """Return detailed info for active members only"""
-        active_memberships = obj.teammembership_set.filter(status='active').select_related('user')
+        active_memberships = active_memberships_of(obj)
         return [
             {
                 'id': membership.user.id,
@@ -125,6 +155,12 @@ class TeamCreateSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def validate_required_skills(self, value):
+        return canonical_names(value)
+
+    def validate_looking_for_roles(self, value):
+        return canonical_names(value)
+
     def create(self, validated_data):
         user = self.context['request'].user
         team = Team.objects.create(team_leader=user, **validated_data)
@@ -137,10 +173,17 @@ class TeamCreateSerializer(serializers.ModelSerializer):
             status='active',
             joined_at=timezone.now()
         )
+        index_team_skills(team)
 
         return team
 
-class TeamInvitationSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        team = super().update(instance, validated_data)
+        if 'required_skills' in validated_data or 'looking_for_roles' in validated_data:
+            index_team_skills(team)
+        return team
+
+class TeamInvitationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     inviter = UserBasicSerializer(read_only=True)
     invitee = UserBasicSerializer(read_only=True)
     team_name = serializers.CharField(source='team.name', read_only=True)
@@ -153,6 +196,7 @@ class TeamInvitationSerializer(serializers.ModelSerializer):
             'inviter', 'invitee', 'message', 'status',
             'created_at', 'responded_at', 'expires_at'
         ]
+        expandable_fields = ['inviter', 'invitee']
 
 class TeamInvitationCreateSerializer(serializers.ModelSerializer):
     invitee_email = serializers.EmailField(write_only=True)
@@ -202,20 +246,83 @@ class TeamInvitationCreateSerializer(serializers.ModelSerializer):
 
         return invitation
 
-class TeamMessageSerializer(serializers.ModelSerializer):
+class TeamMessageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     sender = UserBasicSerializer(read_only=True)
     sender_name = serializers.CharField(source='sender.name', read_only=True)
+    file_attachment = serializers.FileField(write_only=True, required=False)
+    attachment_url = serializers.SerializerMethodField()
+    previews = serializers.SerializerMethodField()
 
     class Meta:
         model = TeamMessage
         fields = [
             'id', 'team', 'sender', 'sender_name', 'content',
-            'message_type', 'is_edited', 'edited_at', 'created_at'
+            'message_type', 'file_attachment', 'file_name', 'file_size', 'attachment_url',
+            'preview_status', 'previews', 'is_edited', 'edited_at', 'created_at'
+        ]
+        read_only_fields = [
+            'sender', 'team', 'file_name', 'file_size', 'preview_status',
+            'is_edited', 'edited_at'
         ]
-        read_only_fields = ['sender', 'team', 'is_edited', 'edited_at']
+        extra_kwargs = {'content': {'required': False}}
+        expandable_fields = ['sender']
+        sparse_columns = {
+            'attachment_url': ['file_attachment', 'team'],
+            'previews': ['preview_status', 'previews', 'file_attachment', 'team']
+        }
+
+    def get_attachment_url(self, obj):
+        if not obj.file_attachment:
+            return None
+        return reverse('team-message-attachment', kwargs={'team_id': obj.team_id, 'message_id': obj.id})
+
+    def get_previews(self, obj):
+        """Thumbnail URLs and dimensions plus an inline placeholder, once generated"""
+        if obj.preview_status != 'ready' or not obj.previews:
+            return None
+        attachment_url = self.get_attachment_url(obj)
+        return {
+            'width': obj.previews.get('width'),
+            'height': obj.previews.get('height'),
+            'placeholder': obj.previews.get('placeholder'),
+            'sizes': {
+                name: {
+                    'url': f'{attachment_url}?size={name}',
+                    'width': preview['width'],
+                    'height': preview['height']
+                }
+                for name, preview in obj.previews.get('sizes', {}).items()
+            }
+        }
+
+    def validate_file_attachment(self, value):
+        if value.size > settings.TEAM_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError("File is too large.")
+        return value
+
+    def validate(self, attrs):
+        attachment = attrs.get('file_attachment')
+        if not self.partial and not attrs.get('content'):
+            if not attachment:
+                raise serializers.ValidationError("Message content is required.")
+            attrs['content'] = attachment.name
+        return attrs
 
     def create(self, validated_data):
         team = self.context.get('team')
         validated_data['team'] = team
         validated_data['sender'] = self.context['request'].user
+
+        attachment = validated_data.pop('file_attachment', None)
+        if attachment:
+            blob = store_blob(attachment, attachment.size)
+            validated_data['blob'] = blob
+            validated_data['file_attachment'] = blob.file.name
+            validated_data['file_name'] = attachment.name
+            validated_data['file_size'] = attachment.size
+            if validated_data.get('message_type', 'text') == 'text':
+                is_image = (getattr(attachment, 'content_type', '') or '').startswith('image/')
+                validated_data['message_type'] = 'image' if is_image else 'file'
+            if validated_data['message_type'] == 'image':
+                validated_data['preview_status'] = 'pending'
         return super().create(validated_data)
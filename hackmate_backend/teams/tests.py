@@ -1,3 +1,859 @@
-from django.test import TestCase
+import base64
+import json
+import os
+import re
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import msgpack
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hackathons.models import Hackathon, HackathonApplication
+from hackmate_backend.msgpack_api import MessagePackRenderer
+from hackmate_backend.serializers import parse_names
+from hackmate_backend.testing import Budget, QueryBudgetMixin, SeedData, api_routes
+from users.models import User
+from .discovery import index_team_skills
+from .files import parse_range, store_blob, write_chunk
+from .search import build_match_query
+from .models import Team, TeamFileBlob, TeamInvitation, TeamMembership, TeamMessage, TeamUpload
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+class TeamFixtureMixin:
+    """
+    `leader` organizes `hackathon`, an upcoming one, and leads `team` there.
+    Test classes call create_team_fixture() (or create_hackathon() when they
+    build their own teams) from setUp and add their own rows on top; the
+    *_fields attributes adjust the shared ones.
+    """
+    leader_fields = {}
+    hackathon_fields = {}
+    team_fields = {}
+
+    make_user = staticmethod(SeedData.make_user)
+
+    def create_hackathon(self):
+        now = timezone.now()
+        self.leader = self.make_user('leader', **self.leader_fields)
+        self.hackathon = Hackathon.objects.create(
+            title='Test Hack', organizer=self.leader, max_participants=50,
+            start_date=now + timedelta(days=10), end_date=now + timedelta(days=12),
+            registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=5),
+            **self.hackathon_fields
+        )
+
+    def create_team_fixture(self):
+        self.create_hackathon()
+        self.team = Team.objects.create(name='Alpha', hackathon=self.hackathon, team_leader=self.leader, **self.team_fields)
+        TeamMembership.objects.create(
+            team=self.team, user=self.leader, role='leader', status='active', joined_at=timezone.now()
+        )
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class TeamChatSocketTests(TeamFixtureMixin, TransactionTestCase):
+    def setUp(self):
+        self.create_team_fixture()
+        self.outsider = self.make_user('outsider')
+
+    def communicator_for(self, user):
+        from hackmate_backend.asgi import application
+        token = AccessToken.for_user(user)
+        return WebsocketCommunicator(application, f'/ws/teams/{self.team.id}/chat/?token={token}')
+
+    async def test_member_receives_new_messages(self):
+        communicator = self.communicator_for(self.leader)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        client = APIClient()
+        client.force_authenticate(self.leader)
+        response = await sync_to_async(client.post)(
+            f'/api/teams/{self.team.id}/messages/', {'content': 'hello'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        event = await communicator.receive_json_from()
+        self.assertEqual(event['type'], 'message.created')
+        self.assertEqual(event['message']['content'], 'hello')
+        await communicator.disconnect()
+
+    async def test_member_who_leaves_is_disconnected(self):
+        member = await sync_to_async(self.make_user)('member')
+        await sync_to_async(TeamMembership.objects.create)(
+            team=self.team, user=member, status='active', joined_at=timezone.now()
+        )
+        communicator = self.communicator_for(member)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        client = APIClient()
+        client.force_authenticate(member)
+        response = await sync_to_async(client.post)(f'/api/teams/{self.team.id}/leave/')
+        self.assertEqual(response.status_code, 200)
+
+        closed = await communicator.receive_output()
+        self.assertEqual(closed, {'type': 'websocket.close', 'code': 4403})
+
+    async def test_non_member_is_rejected(self):
+        communicator = self.communicator_for(self.outsider)
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+    async def test_missing_token_is_rejected(self):
+        from hackmate_backend.asgi import application
+        communicator = WebsocketCommunicator(application, f'/ws/teams/{self.team.id}/chat/')
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+
+class InvitationExpiryTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_team_fixture()
+        self.invitee = self.make_user('invitee')
+        self.invitation = TeamInvitation.objects.create(
+            team=self.team, inviter=self.leader, invitee=self.invitee,
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.invitee)
+
+    def test_expired_invitations_are_hidden_before_the_sweep(self):
+        response = self.client.get('/api/teams/team-invitations/')
+        self.assertEqual(response.data['invitations'], [])
+
+    def test_sweeper_marks_expired(self):
+        call_command('expire_invitations', batch_size=1, stdout=StringIO())
+        self.invitation.refresh_from_db()
+        self.assertEqual(self.invitation.status, 'expired')
+
+    def test_swept_invitations_stay_hidden(self):
+        call_command('expire_invitations', batch_size=1, stdout=StringIO())
+        response = self.client.get('/api/teams/team-invitations/')
+        self.assertEqual(response.data['invitations'], [])
+        self.assertFalse(TeamInvitation.objects.unexpired().exists())
+
+    def test_cannot_accept_expired_invitation(self):
+        response = self.client.post(f'/api/teams/team-invitations/{self.invitation.id}/accept/')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TeamMembership.objects.filter(user=self.invitee).exists())
+
+
+class InviteToTeamTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_team_fixture()
+        self.client = APIClient()
+        self.client.force_authenticate(self.leader)
+
+    def test_unknown_invitee_is_reported_by_what_was_sent(self):
+        response = self.client.post(f'/api/teams/{self.team.id}/invite/', {'invitee_id': 999}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['message'], 'User not found')
+
+        response = self.client.post(f'/api/teams/{self.team.id}/invite/', {'invitee_email': 'nobody@example.com'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['message'], 'User with this email does not exist')
+
+        response = self.client.post(f'/api/teams/{self.team.id}/invite/', {}, format='json')
+        self.assertEqual(response.data['message'], 'Invitee email or id is required')
+
+
+class UnreadCountTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_team_fixture()
+        self.member = self.make_user('member')
+        self.membership = TeamMembership.objects.create(team=self.team, user=self.member, status='active')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.member)}')
+
+    def post(self, sender, content, minutes_ago):
+        message = TeamMessage.objects.create(team=self.team, sender=sender, content=content)
+        TeamMessage.objects.filter(pk=message.pk).update(created_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return message
+
+    def unread(self):
+        return self.client.get('/api/teams/unread/').data['total_unread']
+
+    def mark_read(self, message=None):
+        data = {'message_id': str(message.id)} if message else {}
+        return self.client.post(f'/api/teams/{self.team.id}/messages/read/', data, format='json')
+
+    def test_own_messages_are_never_unread(self):
+        self.post(self.leader, 'hello', 3)
+        self.post(self.member, 'hi back', 2)
+        self.assertEqual(self.unread(), 1)
+
+    def test_read_cursor_only_moves_forward(self):
+        first = self.post(self.leader, 'one', 3)
+        second = self.post(self.leader, 'two', 2)
+        self.post(self.leader, 'three', 1)
+
+        self.mark_read(second)
+        self.assertEqual(self.unread(), 1)
+        self.assertEqual(self.mark_read(first).status_code, 200)
+        self.assertEqual(self.unread(), 1)
+
+        self.mark_read()
+        self.assertEqual(self.unread(), 0)
+
+    def test_unread_counts_from_joining_until_first_read(self):
+        self.post(self.leader, 'before you joined', 10)
+        self.post(self.leader, 'welcome', 1)
+
+        # No read cursor and no join time: every message counts
+        self.assertEqual(self.unread(), 2)
+
+        TeamMembership.objects.filter(pk=self.membership.pk).update(joined_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self.unread(), 1)
+
+
+class MessageSearchTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_team_fixture()
+        self.client = APIClient()
+        self.client.force_authenticate(self.leader)
+
+    def say(self, content):
+        return TeamMessage.objects.create(team=self.team, sender=self.leader, content=content)
+
+    def search(self, q, **params):
+        return self.client.get(f'/api/teams/{self.team.id}/messages/search/', {'q': q, **params})
+
+    def test_match_query_quotes_every_word(self):
+        self.assertEqual(build_match_query('deploy OR "api'), '"deploy" "OR" "api"*')
+        self.assertEqual(build_match_query('NEAR(a b) -x'), '"NEAR" "a" "b" "x"*')
+        self.assertIsNone(build_match_query('"* ()'))
+
+    def test_best_matches_come_first(self):
+        self.say('Lunch at noon')
+        once = self.say('We should deploy the new landing page after the demo is recorded')
+        often = self.say('deploy deploy deploy')
+
+        response = self.search('deploy')
+
+        self.assertEqual([hit['id'] for hit in response.data['results']], [str(often.id), str(once.id)])
+
+    def test_snippets_mark_hits_and_escape_content(self):
+        self.say('<b>Deploy</b> tonight')
+
+        [hit] = self.search('deplo').data['results']
+
+        self.assertIn('<mark>Deploy</mark>', hit['snippet'])
+        self.assertIn('&lt;b&gt;', hit['snippet'])
+        self.assertNotIn('<b>', hit['snippet'])
+
+    def test_operators_in_the_query_are_searched_as_words(self):
+        self.say('ship it OR ELSE')
+        self.assertEqual(len(self.search('OR ELSE').data['results']), 1)
+        self.assertEqual(self.search('"unbalanced').status_code, 200)
+
+    def test_cursor_pages_through_every_hit_once(self):
+        for i in range(5):
+            self.say(f'standup notes {i}')
+
+        seen, cursor = [], None
+        while True:
+            page = self.search('standup', limit=2, **({'cursor': cursor} if cursor else {})).data
+            seen.extend(hit['id'] for hit in page['results'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+        self.assertEqual(self.search('standup', cursor='not base64!').status_code, 400)
+
+    def test_like_fallback_without_fts(self):
+        older = self.say('Retro notes')
+        newer = self.say('More retro items')
+
+        with mock.patch('teams.search.fts_available', return_value=False):
+            response = self.search('retro')
+
+        self.assertEqual([hit['id'] for hit in response.data['results']], [str(newer.id), str(older.id)])
+        self.assertEqual(response.data['results'][0]['snippet'], 'More retro items')
+
+
+class InboxTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.create_hackathon()
+        self.user = self.make_user('ada')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Several items share a timestamp so paging has to break ties
+        self.tied_at = now - timedelta(hours=1)
+        self.expected = []
+
+        for i, at in enumerate([self.tied_at, self.tied_at, now - timedelta(hours=3)]):
+            team = Team.objects.create(name=f'Join {i}', hackathon=self.hackathon, team_leader=self.leader)
+            request = TeamMembership.objects.create(team=team, user=self.user, invited_by=self.user, status='pending')
+            TeamMembership.objects.filter(pk=request.pk).update(invited_at=at)
+            self.expected.append((at, 'join_request', str(request.id)))
+
+        for i, at in enumerate([self.tied_at, now - timedelta(hours=2), self.tied_at]):
+            team = Team.objects.create(name=f'Invite {i}', hackathon=self.hackathon, team_leader=self.leader)
+            received = self.invitation(team, self.leader, self.user, at)
+            self.expected.append((at, 'invitation_received', str(received.id)))
+            sent = self.invitation(team, self.user, self.leader, at, status='leader_pending')
+            self.expected.append((at, 'invitation_request_sent', str(sent.id)))
+
+        # Ordered like the feed: newest first, then kind, then id, all descending
+        self.expected.sort(key=lambda item: (item[0], item[1], item[2]), reverse=True)
+
+    def invitation(self, team, inviter, invitee, at, status='pending'):
+        invitation = TeamInvitation.objects.create(
+            team=team, inviter=inviter, invitee=invitee, status=status,
+            expires_at=timezone.now() + timedelta(days=7)
+        )
+        TeamInvitation.objects.filter(pk=invitation.pk).update(created_at=at)
+        return invitation
+
+    def read_feed(self, limit):
+        items, cursor, pages = [], None, 0
+        while True:
+            params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+            page = self.client.get('/api/teams/inbox/', params).data
+            items.extend((item['type'], str(item['id'])) for item in page['items'])
+            pages += 1
+            cursor = page['next_cursor']
+            if not cursor:
+                return items, pages
+
+    def test_pages_merge_the_three_parts_in_order(self):
+        expected = [(kind, item_id) for _, kind, item_id in self.expected]
+        for limit in [1, 2, 4, 100]:
+            with self.subTest(limit=limit):
+                items, pages = self.read_feed(limit)
+                self.assertEqual(items, expected)
+                self.assertEqual(pages, -(-len(expected) // limit))
+
+    def test_counts_cover_every_part(self):
+        TeamInvitation.objects.filter(invitee=self.user).update(status='expired')
+
+        counts = self.client.get('/api/teams/inbox/').data['counts']
+
+        self.assertEqual(counts, {'join_requests': 3, 'invitations_received': 0, 'invitation_requests_sent': 3})
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ['garbage', 'e30=', base64.urlsafe_b64encode(b'{"at": "soon", "kind": "x", "id": 1}').decode()]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/teams/inbox/', {'cursor': cursor}).status_code, 400)
+
+
+class TeamDiscoveryTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_hackathon()
+        self.user = self.make_user('dev', skills=['ReactJS', 'Python', 'Machine  Learning'])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_team(self, name, skills, max_members=4, members=1):
+        leader = User.objects.create_user(username=name, email=f'{name}@example.com', password='pass12345', name=name)
+        team = Team.objects.create(name=name, hackathon=self.hackathon, team_leader=leader,
+                                   max_members=max_members, required_skills=skills)
+        index_team_skills(team)
+        for i in range(members):
+            member = leader if i == 0 else User.objects.create_user(
+                username=f'{name}{i}', email=f'{name}{i}@example.com', password='pass12345', name=f'{name}{i}'
+            )
+            TeamMembership.objects.create(team=team, user=member, status='active')
+        return team
+
+    def test_teams_ranked_by_skill_overlap(self):
+        best = self.make_team('best', ['react', 'Python', 'ML'])
+        good = self.make_team('good', ['Python', 'Go'])
+        self.make_team('none', ['Rust'])
+        self.make_team('full', ['React', 'Python'], max_members=2, members=2)
+
+        response = self.client.get('/api/teams/discover/', {'hackathon': self.hackathon.id})
+
+        self.assertEqual([team['id'] for team in response.data['teams']], [best.id, good.id])
+        self.assertEqual(response.data['teams'][0]['match_score'], 3)
+        self.assertEqual(response.data['teams'][1]['matched_skills'], ['Python'])
+
+    def test_hackathon_is_required(self):
+        response = self.client.get('/api/teams/discover/')
+        self.assertEqual(response.status_code, 400)
+
+
+class TeamAttachmentTests(TeamFixtureMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Uploaded bytes land on disk and aren't rolled back with the database
+        media = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media.cleanup)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media.name))
+        super().setUpClass()
+
+    def setUp(self):
+        self.create_team_fixture()
+        self.outsider = self.make_user('outsider')
+        self.client = APIClient()
+        self.client.force_authenticate(self.leader)
+        self.content = b'0123456789'
+
+    def start_upload(self, content_type='text/plain', file_name='notes.txt'):
+        response = self.client.post(
+            f'/api/teams/{self.team.id}/uploads/',
+            {'file_name': file_name, 'file_size': len(self.content), 'content_type': content_type},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data['upload']['id']
+
+    def put_chunk(self, upload_id, body, start, end):
+        return self.client.generic(
+            'PUT', f'/api/teams/{self.team.id}/uploads/{upload_id}/', body,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}'
+        )
+
+    def complete(self, upload_id):
+        return self.client.post(f'/api/teams/{self.team.id}/uploads/{upload_id}/complete/', format='json')
+
+    def upload_message(self, **upload):
+        upload_id = self.start_upload(**upload)
+        self.assertEqual(self.put_chunk(upload_id, self.content, 0, len(self.content) - 1).status_code, 200)
+        # Runs preview generation, which is scheduled on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.complete(upload_id)
+        self.assertEqual(response.status_code, 201)
+        return response.data['message']['id']
+
+    @staticmethod
+    def png(width, height):
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), (200, 40, 40)).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def download(self, message_id, params=None, **headers):
+        return self.client.get(f'/api/teams/{self.team.id}/messages/{message_id}/attachment/', params, **headers)
+
+    def test_chunk_at_wrong_offset_is_rejected(self):
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content[:4], 0, 3)
+
+        response = self.put_chunk(upload_id, self.content[6:], 6, 9)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 4)
+
+    def test_partial_chunk_does_not_advance_offset(self):
+        upload_id = self.start_upload()
+
+        response = self.put_chunk(upload_id, self.content[:2], 0, 3)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['offset'], 0)
+        self.assertEqual(TeamUpload.objects.get(pk=upload_id).received_bytes, 0)
+
+    def test_complete_requires_every_byte(self):
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content[:4], 0, 3)
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['offset'], 4)
+        self.assertFalse(TeamMessage.objects.exists())
+
+    def test_completed_upload_becomes_a_message(self):
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content[:4], 0, 3)
+        self.put_chunk(upload_id, self.content[4:], 4, 9)
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['message']['message_type'], 'file')
+        self.assertFalse(TeamUpload.objects.filter(pk=upload_id).exists())
+        self.assertEqual(b''.join(self.download(response.data['message']['id']).streaming_content), self.content)
+
+    def test_range_request_returns_partial_content(self):
+        message_id = self.upload_message()
+
+        response = self.download(message_id, HTTP_RANGE='bytes=2-5')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response['Content-Length'], '4')
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+
+        response = self.download(message_id, HTTP_RANGE='bytes=-3')
+        self.assertEqual(response['Content-Range'], 'bytes 7-9/10')
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+
+    def test_unsatisfiable_range(self):
+        message_id = self.upload_message()
+
+        response = self.download(message_id, HTTP_RANGE='bytes=10-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+        # An empty file has no byte a range could name, suffix ranges included
+        for header in ['bytes=-5', 'bytes=0-', 'bytes=0-0']:
+            self.assertIs(parse_range(header, 0), False)
+
+    @override_settings(TEAM_PREVIEWS_ASYNC=False)
+    def test_image_uploads_get_previews(self):
+        self.content = self.png(1000, 500)
+
+        message = TeamMessage.objects.get(pk=self.upload_message(content_type='image/png', file_name='photo.png'))
+
+        self.assertEqual(message.preview_status, 'ready')
+        self.assertEqual((message.previews['width'], message.previews['height']), (1000, 500))
+        sizes = {name: (size['width'], size['height']) for name, size in message.previews['sizes'].items()}
+        self.assertEqual(sizes, {'small': (160, 80), 'medium': (480, 240)})
+        self.assertTrue(message.previews['placeholder'].startswith('data:image/jpeg;base64,'))
+
+        response = self.download(message.id, {'size': 'small'})
+        self.assertEqual(response.status_code, 200)
+        with Image.open(BytesIO(b''.join(response.streaming_content))) as preview:
+            self.assertEqual((preview.format, preview.size), ('JPEG', (160, 80)))
+
+        listed = self.client.get(f'/api/teams/{self.team.id}/messages/')
+        self.assertIn(f'{message.id}/attachment/?size=medium', listed.content.decode())
+
+    @override_settings(TEAM_PREVIEWS_ASYNC=False)
+    def test_files_get_no_previews(self):
+        message_id = self.upload_message()
+
+        self.assertEqual(TeamMessage.objects.get(pk=message_id).preview_status, 'none')
+        response = self.download(message_id, {'size': 'small'})
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(TEAM_PREVIEWS_ASYNC=False)
+    def test_unreadable_images_are_marked_failed(self):
+        self.content = b'not really a png'
+
+        message_id = self.upload_message(content_type='image/png', file_name='broken.png')
+
+        self.assertEqual(TeamMessage.objects.get(pk=message_id).preview_status, 'failed')
+        response = self.download(message_id, {'size': 'small'})
+        self.assertEqual(response.status_code, 404)
+        # The original is still served
+        self.assertEqual(b''.join(self.download(message_id).streaming_content), self.content)
+
+    def test_non_member_cannot_download(self):
+        message_id = self.upload_message()
+        self.client.force_authenticate(self.outsider)
+
+        self.assertEqual(self.download(message_id).status_code, 403)
+        # Same answer whether or not the message exists
+        self.assertEqual(self.download(uuid.uuid4()).status_code, 403)
+
+
+class TeamFileStorageTests(TeamFixtureMixin, TestCase):
+    def setUp(self):
+        # A fresh directory per test, so one test's files can't look stray to the next
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.media_root = media.name
+
+        self.create_team_fixture()
+        self.long_ago = timezone.now() - timedelta(days=3)
+
+    def message_for(self, blob):
+        return TeamMessage.objects.create(
+            team=self.team, sender=self.leader, content='file', message_type='file',
+            blob=blob, file_attachment=blob.file.name, file_name='notes.txt', file_size=blob.size
+        )
+
+    def media_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(dirpath, name), self.media_root)
+            for dirpath, _, names in os.walk(self.media_root) for name in names
+        )
+
+    def make_stray(self, name):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(b'left behind')
+        os.utime(path, (self.long_ago.timestamp(), self.long_ago.timestamp()))
+        return name
+
+    def gc(self, *args):
+        out = StringIO()
+        call_command('gc_team_files', *args, stdout=out)
+        return out.getvalue()
+
+    def test_identical_content_is_stored_once(self):
+        first = store_blob(ContentFile(b'same bytes'), 10)
+        TeamFileBlob.objects.filter(pk=first.pk).update(last_referenced_at=self.long_ago)
+
+        second = store_blob(ContentFile(b'same bytes'), 10)
+
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(self.media_files(), [first.file.name])
+        self.assertGreater(second.last_referenced_at, self.long_ago)
+
+    def test_gc_removes_unreferenced_blobs_stale_uploads_and_strays(self):
+        kept = store_blob(ContentFile(b'still used'), 10)
+        self.message_for(kept)
+        orphan = store_blob(ContentFile(b'no longer used'), 14)
+        self.message_for(orphan).delete()
+        TeamFileBlob.objects.update(last_referenced_at=self.long_ago)
+
+        stale = TeamUpload.objects.create(team=self.team, uploader=self.leader, file_name='big.zip', total_size=8)
+        write_chunk(stale, BytesIO(b'half'), 0, 4)
+        TeamUpload.objects.filter(pk=stale.pk).update(updated_at=self.long_ago)
+        self.make_stray('team_files/old-avatar.png')
+
+        output = self.gc()
+
+        self.assertIn('Removed 1 unreferenced blobs, 1 abandoned uploads and 1 stray files', output)
+        self.assertEqual(list(TeamFileBlob.objects.values_list('pk', flat=True)), [kept.pk])
+        self.assertFalse(TeamUpload.objects.exists())
+        self.assertEqual(self.media_files(), [kept.file.name])
+
+    def test_recent_files_are_kept(self):
+        orphan = store_blob(ContentFile(b'just deduplicated'), 17)
+        TeamUpload.objects.create(team=self.team, uploader=self.leader, file_name='big.zip', total_size=8)
+
+        self.assertIn('Removed 0 unreferenced blobs, 0 abandoned uploads and 0 stray files', self.gc())
+        self.assertTrue(TeamFileBlob.objects.filter(pk=orphan.pk).exists())
+
+    def test_dry_run_leaves_disk_and_database_alone(self):
+        orphan = store_blob(ContentFile(b'no longer used'), 14)
+        TeamFileBlob.objects.update(last_referenced_at=self.long_ago)
+        stray = self.make_stray('team_uploads/gone.part')
+        before = self.media_files()
+
+        output = self.gc('--dry-run')
+
+        self.assertIn('[dry run] Removed 1 unreferenced blobs, 0 abandoned uploads and 1 stray files', output)
+        self.assertEqual(self.media_files(), before)
+        self.assertIn(stray, before)
+        self.assertTrue(TeamFileBlob.objects.filter(pk=orphan.pk).exists())
+
+
+class SparseFieldsetTests(TeamFixtureMixin, TestCase):
+    team_fields = {'description': 'x' * 500, 'max_members': 2}
+
+    def setUp(self):
+        self.create_team_fixture()
+        self.client = APIClient()
+        self.client.force_authenticate(self.leader)
+
+    def team_query(self, queries):
+        return next(query['sql'] for query in queries if query['sql'].startswith('SELECT "teams_team"."id"'))
+
+    def test_fields_trim_response_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/teams/', {'fields': 'id,name,hackathon_title'})
+
+        self.assertEqual(response.data['teams'], [{'id': str(self.team.id), 'name': 'Alpha', 'hackathon_title': 'Test Hack'}])
+        sql = self.team_query(queries)
+        self.assertNotIn('"teams_team"."description"', sql)
+        self.assertNotIn('"hackathons_hackathon"."description"', sql)
+        self.assertNotIn('users_user', sql)
+        # No membership prefetch or per-team member queries for fields nobody asked for
+        self.assertFalse(any('teams_teammembership' in query['sql'] for query in queries))
+
+    def test_expand_adds_related_objects(self):
+        response = self.client.get('/api/teams/', {'expand': 'team_leader'})
+        team = response.data['teams'][0]
+        self.assertEqual(team['team_leader']['name'], 'Leader')
+        self.assertNotIn('members', team)
+        self.assertIn('description', team)
+
+        response = self.client.get(f'/api/teams/{self.team.id}/', {'fields': 'id,is_full', 'expand': 'members'})
+        self.assertEqual(set(response.data['team']), {'id', 'is_full', 'members'})
+        self.assertEqual(response.data['team']['members'][0]['name'], 'Leader')
+
+    def test_member_fields_keep_the_membership_prefetch(self):
+        for i in range(3):
+            team = Team.objects.create(name=f'Team {i}', hackathon=self.hackathon, team_leader=self.leader)
+            TeamMembership.objects.create(team=team, user=self.leader, role='leader', status='active')
+
+        # Page count, teams, and one prefetch of every team's members
+        for params in [{}, {'fields': 'name,members'}, {'fields': 'name,current_member_count,spots_available'},
+                       {'expand': 'members'}]:
+            with self.subTest(params=params), self.assertNumQueries(3):
+                response = self.client.get('/api/teams/', params)
+            self.assertEqual(len(response.data['teams']), 4)
+        with self.assertNumQueries(2):
+            self.client.get('/api/teams/', {'fields': 'id,name'})
+
+        for params in [{'fields': 'id,is_full'}, {'expand': 'members'}, {'fields': 'id,members'}]:
+            with self.subTest(params=params), self.assertNumQueries(2):
+                response = self.client.get(f'/api/teams/{self.team.id}/', params)
+            self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/teams/{self.team.id}/', {'fields': 'id,name'})
+
+    def test_selection_is_worked_out_once_per_list(self):
+        for i in range(3):
+            Team.objects.create(name=f'Team {i}', hackathon=self.hackathon, team_leader=self.leader)
+
+        with mock.patch('hackmate_backend.serializers.parse_names', wraps=parse_names) as parse:
+            response = self.client.get('/api/teams/', {'fields': 'id,name'})
+
+        self.assertEqual(len(response.data['teams']), 4)
+        # fields and expand, once for sparse_queryset and once for the list
+        self.assertEqual(parse.call_count, 4)
+
+    def test_writes_return_whole_objects(self):
+        response = self.client.post(
+            f'/api/teams/{self.team.id}/messages/?fields=id', {'content': 'Standup at 10'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('content', response.data['message'])
+
+    def test_full_response_without_parameters(self):
+        response = self.client.get(f'/api/teams/{self.team.id}/')
+        self.assertIn('team_leader', response.data['team'])
+        self.assertIn('members', response.data['team'])
+        self.assertEqual(response.data['team']['description'], 'x' * 500)
+
+
+class MessagePackNegotiationTests(TeamFixtureMixin, TestCase):
+    leader_fields = {'skills': ['Python']}
+    hackathon_fields = {'registration_fee': Decimal('9.50'), 'approval_status': 'approved'}
+    team_fields = {'required_skills': ['React']}
+
+    def setUp(self):
+        cache.clear()
+        self.create_team_fixture()
+        self.member = self.make_user('member', name='Zoë')
+        self.application = HackathonApplication.objects.create(user=self.leader, hackathon=self.hackathon, status='team_pending')
+        HackathonApplication.objects.create(user=self.member, hackathon=self.hackathon, status='team_pending')
+        self.message = TeamMessage.objects.create(team=self.team, sender=self.leader, content='hello   world')
+        self.invitation = TeamInvitation.objects.create(
+            team=self.team, inviter=self.leader, invitee=self.member, expires_at=timezone.now() + timedelta(days=7)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.leader)
+
+    def url_for(self, route):
+        values = {
+            'id': self.hackathon.id, 'application_id': self.application.id,
+            'pk': self.invitation.id if 'invitation' in route else self.team.id,
+            'team_id': self.team.id, 'message_id': self.message.id, 'upload_id': self.message.id,
+            'member_id': self.member.id, 'user_id': self.member.id,
+        }
+        return '/' + re.sub(r'<(?:\w+:)?(\w+)>', lambda match: str(values[match.group(1)]), route)
+
+    def fetch(self, url, **headers):
+        # Roll back each request so counters like total_views don't differ between formats
+        with transaction.atomic():
+            response = self.client.get(url, **headers)
+            transaction.set_rollback(True)
+        return response
+
+    def test_every_endpoint_returns_the_same_data_in_both_formats(self):
+        routes = list(api_routes())
+        self.assertGreater(len(routes), 40)
+        for route in routes:
+            url = self.url_for(route)
+            with self.subTest(url=url):
+                as_json = self.fetch(url)
+                as_msgpack = self.fetch(url, HTTP_ACCEPT='application/msgpack')
+                self.assertEqual(as_json.status_code, as_msgpack.status_code)
+                if not hasattr(as_json, 'accepted_renderer'):
+                    continue  # a file download, not a DRF response
+                if as_json.status_code == 304 or not as_json.content:
+                    continue
+                self.assertEqual(as_json['Content-Type'], 'application/json')
+                self.assertEqual(as_msgpack['Content-Type'], 'application/msgpack')
+                self.assertEqual(msgpack.unpackb(as_msgpack.content), json.loads(as_json.content))
+
+    def test_msgpack_request_bodies_are_parsed(self):
+        response = self.client.post(
+            f'/api/teams/{self.team.id}/messages/', msgpack.packb({'content': 'packed ✓'}),
+            content_type='application/msgpack', HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(msgpack.unpackb(response.content)['message']['content'], 'packed ✓')
+
+        response = self.client.post(
+            f'/api/teams/{self.team.id}/messages/', b'\xc1', content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_integers_past_64_bits_are_sent_as_strings(self):
+        data = {'big': 2 ** 64, 'negative': -2 ** 63 - 1, 'max': 2 ** 64 - 1, 'id': self.team.id}
+        unpacked = msgpack.unpackb(MessagePackRenderer().render(data))
+        self.assertEqual(unpacked, {
+            'big': str(2 ** 64), 'negative': str(-2 ** 63 - 1), 'max': 2 ** 64 - 1, 'id': str(self.team.id)
+        })
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], TEAM_PREVIEWS_ASYNC=False)
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    prefix = 'api/teams/'
+    budgets = {
+        ('GET', 'api/teams/'): Budget(4),
+        ('POST', 'api/teams/'): Budget(
+            19, 201, data=lambda seed: {'name': 'Beta', 'hackathon': seed.joined.id, 'max_members': 4}
+        ),
+        ('GET', 'api/teams/<uuid:pk>/'): Budget(3),
+        ('PUT', 'api/teams/<uuid:pk>/'): Budget(4, data={'description': 'Still building'}),
+        # Memberships are loaded so their members' chat sockets can be closed
+        ('DELETE', 'api/teams/<uuid:pk>/'): Budget(12, 204),
+        ('GET', 'api/teams/my/'): Budget(3),
+        ('GET', 'api/teams/available-hackathons/'): Budget(2),
+        ('GET', 'api/teams/discover/'): Budget(6, data=lambda seed: {'hackathon': seed.joined.id}),
+        ('POST', 'api/teams/<uuid:pk>/join/'): Budget(10, url={'pk': 'other_teams.2.id'}, data={'message': 'Hi'}),
+        ('POST', 'api/teams/<uuid:pk>/leave/'): Budget(7, user='members.0'),
+        ('POST', 'api/teams/<uuid:pk>/members/<int:member_id>/'): Budget(16, data={'action': 'approve'}),
+        ('POST', 'api/teams/<uuid:pk>/invite/'): Budget(8, 201, data=lambda seed: {'invitee_id': seed.members[6].id}),
+        ('GET', 'api/teams/team-invitations/'): Budget(3),
+        ('POST', 'api/teams/team-invitations/'): Budget(
+            11, 201, data=lambda seed: {'team': str(seed.team.id), 'invitee_email': seed.members[7].email}
+        ),
+        ('POST', 'api/teams/team-invitations/<uuid:pk>/accept/'): Budget(13, url={'pk': 'invitation.id'}),
+        ('POST', 'api/teams/team-invitations/<uuid:pk>/decline/'): Budget(8, url={'pk': 'invitation.id'}),
+        ('POST', 'api/teams/invitation-requests/<uuid:pk>/approve/'): Budget(
+            11, url={'pk': 'invitation_request.id'}, data={'action': 'approve'}
+        ),
+        ('GET', 'api/teams/<uuid:pk>/pending-requests/'): Budget(4),
+        ('GET', 'api/teams/<uuid:pk>/invitation-requests/'): Budget(8),
+        ('GET', 'api/teams/<uuid:pk>/all-requests/'): Budget(5),
+        ('GET', 'api/teams/my-requests/'): Budget(3),
+        ('GET', 'api/teams/all-requests/'): Budget(4),
+        ('GET', 'api/teams/inbox/'): Budget(5),
+        ('GET', 'api/teams/unread/'): Budget(1),
+        ('GET', 'api/teams/<uuid:team_id>/messages/'): Budget(5),
+        ('POST', 'api/teams/<uuid:team_id>/messages/'): Budget(4, 201, data={'content': 'Standup at 10'}),
+        ('POST', 'api/teams/<uuid:team_id>/messages/read/'): Budget(3),
+        ('GET', 'api/teams/<uuid:team_id>/messages/search/'): Budget(4, data={'q': 'message'}),
+        ('PUT', 'api/teams/<uuid:team_id>/messages/<uuid:message_id>/'): Budget(6, data={'content': 'edited'}),
+        ('DELETE', 'api/teams/<uuid:team_id>/messages/<uuid:message_id>/'): Budget(7, 204),
+        ('GET', 'api/teams/<uuid:team_id>/messages/<uuid:message_id>/attachment/'): Budget(3, 404),
+        ('POST', 'api/teams/<uuid:team_id>/uploads/'): Budget(3, 201, data={'file_name': 'plan.txt', 'file_size': 4}),
+        ('GET', 'api/teams/<uuid:team_id>/uploads/<uuid:upload_id>/'): Budget(2),
+        ('PUT', 'api/teams/<uuid:team_id>/uploads/<uuid:upload_id>/'): Budget(
+            4, data=b'plan', content_type='application/octet-stream', headers={'HTTP_CONTENT_RANGE': 'bytes 0-3/4'}
+        ),
+        ('DELETE', 'api/teams/<uuid:team_id>/uploads/<uuid:upload_id>/'): Budget(3, 204),
+        ('POST', 'api/teams/<uuid:team_id>/uploads/<uuid:upload_id>/complete/'): Budget(3, 400),
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        # Upload chunks land on disk and aren't rolled back with the database
+        media = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media.cleanup)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media.name))
+        super().setUpClass()
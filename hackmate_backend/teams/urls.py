@@ -7,6 +7,7 @@ urlpatterns = [
     path('<uuid:pk>/', views.team_detail, name='team-detail'),
     path('my/', views.my_teams, name='my-teams'),
     path('available-hackathons/', views.available_hackathons, name='available-hackathons'),
+    path('discover/', views.discover_teams, name='discover-teams'),
 
     path('<uuid:pk>/join/', views.join_team_request, name='join-team'),
     path('<uuid:pk>/leave/', views.leave_team, name='leave-team'),
@@ -25,9 +26,19 @@ urlpatterns = [
     path('<uuid:pk>/all-requests/', views.get_all_team_requests, name='get-all-team-requests'), 
     path('my-requests/', views.get_my_requests, name='my-team-requests'),
     path('all-requests/', views.get_all_user_requests, name='get-all-user-requests'),
+    path('inbox/', views.user_inbox, name='user-inbox'),
     
     # Message URLs
+    path('unread/', views.unread_counts, name='unread-counts'),
     path('<uuid:team_id>/messages/', views.team_messages, name='team-messages'),
+    path('<uuid:team_id>/messages/read/', views.mark_messages_read, name='mark-messages-read'),
+    path('<uuid:team_id>/messages/search/', views.search_team_messages, name='search-team-messages'),
     path('<uuid:team_id>/messages/<uuid:message_id>/', views.team_message_detail, name='team-message-detail'),
+    path('<uuid:team_id>/messages/<uuid:message_id>/attachment/', views.team_message_attachment, name='team-message-attachment'),
+
+    # Resumable attachment uploads
+    path('<uuid:team_id>/uploads/', views.team_uploads, name='team-uploads'),
+    path('<uuid:team_id>/uploads/<uuid:upload_id>/', views.team_upload_detail, name='team-upload-detail'),
+    path('<uuid:team_id>/uploads/<uuid:upload_id>/complete/', views.complete_team_upload, name='complete-team-upload'),
 
 ]
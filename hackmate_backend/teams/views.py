@@ -1,20 +1,38 @@
+import base64
+import binascii
 from datetime import timedelta
-from rest_framework.decorators import api_view, permission_classes 
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
+from django.db.models.functions import Coalesce
 from django.core.paginator import Paginator
-from .models import Team, TeamMembership, TeamInvitation, TeamMessage
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from .models import Team, TeamMembership, TeamInvitation, TeamMessage, TeamUpload
 from .serializers import (
     TeamListSerializer, TeamDetailSerializer, TeamCreateSerializer,
     TeamInvitationSerializer, TeamInvitationCreateSerializer,
     TeamMessageSerializer
 )
+from .consumers import broadcast_team_event
+from .files import (
+    attachment_response, discard_upload, open_completed_upload,
+    parse_content_range, store_blob, write_chunk
+)
+from .previews import schedule_previews
+from . import search as message_search
+from . import discovery
+from . import inbox
 from hackathons.models import HackathonApplication
+from notifications.outbox import notify
+from users.authentication import ClaimsJWTAuthentication
 from users.models import User
+from hackmate_backend.serializers import sparse_queryset
 
 # Team Views
 @api_view(['GET', 'POST'])
@@ -25,7 +43,7 @@ def team_list_create(request):
     POST: Create a new team
     """
     if request.method == 'GET':
-        teams = Team.objects.select_related('hackathon', 'team_leader').prefetch_related('teammembership_set__user')
+        teams = Team.objects.select_related('hackathon', 'team_leader').with_active_members()
         
         # Optional filtering
         hackathon_id = request.query_params.get('hackathon')
@@ -35,13 +53,15 @@ def team_list_create(request):
         status_filter = request.query_params.get('status')
         if status_filter:
             teams = teams.filter(status=status_filter)
+
+        teams = sparse_queryset(teams, TeamListSerializer, request)
         
         # Pagination
         page = request.query_params.get('page', 1)
         paginator = Paginator(teams, 20)
         teams_page = paginator.get_page(page)
         
-        serializer = TeamListSerializer(teams_page, many=True)
+        serializer = TeamListSerializer(teams_page, many=True, context={'request': request})
         return Response({
             'success': True,
             'teams': serializer.data,
@@ -104,8 +124,11 @@ def team_detail(request, pk):
     PUT: Update team (only leader)
     DELETE: Delete team (only leader)
     """
+    teams = Team.objects.select_related('hackathon', 'team_leader').with_active_members()
+    if request.method == 'GET':
+        teams = sparse_queryset(teams, TeamDetailSerializer, request)
     try:
-        team = Team.objects.select_related('hackathon', 'team_leader').prefetch_related('teammembership_set__user').get(pk=pk)
+        team = teams.get(pk=pk)
     except Team.DoesNotExist:
         return Response({
             'success': False,
@@ -113,7 +136,7 @@ def team_detail(request, pk):
         }, status=status.HTTP_404_NOT_FOUND)
     
     if request.method == 'GET':
-        serializer = TeamDetailSerializer(team)
+        serializer = TeamDetailSerializer(team, context={'request': request})
         return Response({
             'success': True,
             'team': serializer.data
@@ -163,16 +186,29 @@ def my_teams(request):
     user = request.user
     teams = Team.objects.filter(
         Q(team_leader=user) | Q(teammembership__user=user, teammembership__status='active')
-    ).select_related('hackathon', 'team_leader').prefetch_related('teammembership_set__user').distinct()
+    ).select_related('hackathon', 'team_leader').with_active_members().distinct()
+    teams = sparse_queryset(teams, TeamListSerializer, request)
     # for team in teams:
         # print(team.members)
-    serializer = TeamListSerializer(teams, many=True)
+    serializer = TeamListSerializer(teams, many=True, context={'request': request})
     # print(serializer.data)
     return Response({
         'success': True,
         'teams': serializer.data
     })
 
+# Applications in these statuses let the user create a team
+TEAM_ELIGIBLE_STATUSES = ['applied', 'confirmed', 'payment_pending']
+
+def serialize_available_hackathon(application):
+    return {
+        'id': application.hackathon.id,
+        'title': application.hackathon.title,
+        'start_date': application.hackathon.start_date,
+        'end_date': application.hackathon.end_date,
+        'status': application.hackathon.status
+    }
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def available_hackathons(request):
@@ -180,24 +216,59 @@ def available_hackathons(request):
     user = request.user
     applications = HackathonApplication.objects.filter(
         user=user,
-        status__in=['applied', 'confirmed', 'payment_pending']
+        status__in=TEAM_ELIGIBLE_STATUSES
     ).select_related('hackathon')
     
-    hackathons = []
-    for app in applications:
-        hackathons.append({
-            'id': app.hackathon.id,
-            'title': app.hackathon.title,
-            'start_date': app.hackathon.start_date,
-            'end_date': app.hackathon.end_date,
-            'status': app.hackathon.status
-        })
+    hackathons = [serialize_available_hackathon(app) for app in applications]
     
     return Response({
         'success': True,
         'hackathons': hackathons
     })
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def discover_teams(request):
+    """Open teams in a hackathon ranked by how well they match the user's skills"""
+    hackathon_id = request.query_params.get('hackathon')
+    if not hackathon_id or not hackathon_id.isdigit():
+        return Response({
+            'success': False,
+            'message': 'A hackathon id is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+    except ValueError:
+        limit = 20
+
+    results = []
+    for team, score, matched in discovery.discover_teams(request.user, int(hackathon_id), limit):
+        results.append({
+            'id': team.id,
+            'name': team.name,
+            'description': team.description,
+            'hackathon': team.hackathon_id,
+            'hackathon_title': team.hackathon.title,
+            'team_leader': {
+                'id': team.team_leader.id,
+                'name': team.team_leader.name
+            },
+            'max_members': team.max_members,
+            'current_member_count': team.member_count,
+            'spots_available': max(0, team.max_members - team.member_count),
+            'required_skills': team.required_skills,
+            'looking_for_roles': team.looking_for_roles,
+            'allow_remote': team.allow_remote,
+            'match_score': score,
+            'matched_skills': matched
+        })
+
+    return Response({
+        'success': True,
+        'teams': results
+    })
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def join_team_request(request, pk):
@@ -234,15 +305,22 @@ def join_team_request(request, pk):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     # Create membership request
-    TeamMembership.objects.create(
-        team=team,
-        user=user,
-        status='pending',
-        invited_by=user,  # Self-request
-        skills_contribution=request.data.get('skills', []),
-        preferred_role_in_project=request.data.get('role', ''),
-        invitation_message=request.data.get('message', '')
-    )
+    with transaction.atomic():
+        TeamMembership.objects.create(
+            team=team,
+            user=user,
+            status='pending',
+            invited_by=user,  # Self-request
+            skills_contribution=request.data.get('skills', []),
+            preferred_role_in_project=request.data.get('role', ''),
+            invitation_message=request.data.get('message', '')
+        )
+        notify(
+            team.team_leader, 'join_request',
+            f"{user.name} wants to join {team.name}",
+            f"{user.name} ({user.email}) has requested to join your team {team.name}.",
+            team_id=str(team.id), user_id=user.id
+        )
     
     return Response({
         'success': True,
@@ -326,9 +404,16 @@ def manage_team_member(request, pk, member_id):
                 'message': 'Team is already full'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        membership.status = 'active'
-        membership.joined_at = timezone.now()
-        membership.save()
+        with transaction.atomic():
+            membership.status = 'active'
+            membership.joined_at = timezone.now()
+            membership.save()
+            notify(
+                membership.user, 'join_approved',
+                f"You're in! Welcome to {team.name}",
+                f"Your request to join {team.name} for {team.hackathon.title} was approved.",
+                team_id=str(team.id)
+            )
         
         # Update team status
         team.update_status()
@@ -360,8 +445,15 @@ def manage_team_member(request, pk, member_id):
         })
     
     elif action == 'reject':
-        membership.status = 'declined'
-        membership.save()
+        with transaction.atomic():
+            membership.status = 'declined'
+            membership.save()
+            notify(
+                membership.user, 'join_declined',
+                f"Update on your request to join {team.name}",
+                f"Your request to join {team.name} was not accepted this time.",
+                team_id=str(team.id)
+            )
         
         return Response({
             'success': True,
@@ -374,6 +466,23 @@ def manage_team_member(request, pk, member_id):
             'message': 'Invalid action. Use "approve" or "reject"'
         }, status=status.HTTP_400_BAD_REQUEST)
 
+def _expired_invitation_response(invitation):
+    """Mark an invitation the sweeper hasn't reached yet as expired"""
+    TeamInvitation.objects.filter(pk=invitation.pk).update(status='expired')
+    return Response({
+        'success': False,
+        'message': 'This invitation has expired'
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+def _notify_invitee(invitation):
+    notify(
+        invitation.invitee, 'team_invitation',
+        f"You've been invited to join {invitation.team.name}",
+        f"{invitation.inviter.name} invited you to join {invitation.team.name} "
+        f"for {invitation.team.hackathon.title}.",
+        team_id=str(invitation.team_id), invitation_id=str(invitation.id)
+    )
+
 # Team Invitation Views
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -387,7 +496,7 @@ def team_invitations(request):
     if request.method == 'GET':
         invitation_type = request.query_params.get('type', 'received')  # 'sent', 'received', or 'all'
         
-        queryset = TeamInvitation.objects.select_related('team', 'inviter', 'invitee')
+        queryset = TeamInvitation.objects.unexpired().select_related('team', 'inviter', 'invitee')
         
         if invitation_type == 'sent':
             queryset = queryset.filter(inviter=user)
@@ -405,7 +514,9 @@ def team_invitations(request):
     elif request.method == 'POST':
         serializer = TeamInvitationCreateSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            invitation = serializer.save()
+            with transaction.atomic():
+                invitation = serializer.save()
+                _notify_invitee(invitation)
             response_serializer = TeamInvitationSerializer(invitation)
             return Response({
                 'success': True,
@@ -430,6 +541,9 @@ def accept_invitation(request, pk):
             'message': 'Invitation not found'
         }, status=status.HTTP_404_NOT_FOUND)
     
+    if invitation.is_expired:
+        return _expired_invitation_response(invitation)
+    
     # Check if team is still not full
     if invitation.team.is_full:
         invitation.status = 'expired'
@@ -439,19 +553,26 @@ def accept_invitation(request, pk):
             'message': 'Team is now full'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Create team membership
-    TeamMembership.objects.create(
-        team=invitation.team,
-        user=request.user,
-        status='active',
-        joined_at=timezone.now(),
-        invited_by=invitation.inviter
-    )
-    
-    # Update invitation status
-    invitation.status = 'accepted'
-    invitation.responded_at = timezone.now()
-    invitation.save()
+    with transaction.atomic():
+        # Create team membership
+        TeamMembership.objects.create(
+            team=invitation.team,
+            user=request.user,
+            status='active',
+            joined_at=timezone.now(),
+            invited_by=invitation.inviter
+        )
+        
+        # Update invitation status
+        invitation.status = 'accepted'
+        invitation.responded_at = timezone.now()
+        invitation.save()
+        notify(
+            invitation.inviter, 'invitation_accepted',
+            f"{request.user.name} joined {invitation.team.name}",
+            f"{request.user.name} accepted your invitation to join {invitation.team.name}.",
+            team_id=str(invitation.team_id), invitation_id=str(invitation.id)
+        )
     
     # Update team status
     invitation.team.update_status()
@@ -473,9 +594,19 @@ def decline_invitation(request, pk):
             'message': 'Invitation not found'
         }, status=status.HTTP_404_NOT_FOUND)
     
-    invitation.status = 'declined'
-    invitation.responded_at = timezone.now()
-    invitation.save()
+    if invitation.is_expired:
+        return _expired_invitation_response(invitation)
+    
+    with transaction.atomic():
+        invitation.status = 'declined'
+        invitation.responded_at = timezone.now()
+        invitation.save()
+        notify(
+            invitation.inviter, 'invitation_declined',
+            f"{request.user.name} declined your invitation",
+            f"{request.user.name} declined your invitation to join {invitation.team.name}.",
+            team_id=str(invitation.team_id), invitation_id=str(invitation.id)
+        )
     
     return Response({
         'success': True,
@@ -525,7 +656,10 @@ def team_messages(request, team_id):
         serializer = TeamMessageSerializer(data=request.data, context={'request': request, 'team': team})
         if serializer.is_valid():
             message = serializer.save(team=team)
+            if message.preview_status == 'pending':
+                schedule_previews(message.id)
             response_serializer = TeamMessageSerializer(message)
+            broadcast_team_event(team.id, 'message.created', response_serializer.data)
             return Response({
                 'success': True,
                 'message': response_serializer.data
@@ -571,6 +705,7 @@ def team_message_detail(request, team_id, message_id):
         if serializer.is_valid():
             message = serializer.save(is_edited=True, edited_at=timezone.now())
             response_serializer = TeamMessageSerializer(message)
+            broadcast_team_event(team.id, 'message.updated', response_serializer.data)
             return Response({
                 'success': True,
                 'message': response_serializer.data
@@ -589,12 +724,360 @@ def team_message_detail(request, team_id, message_id):
                 'message': 'You can only delete your own messages or team leader can delete any message'
             }, status=status.HTTP_403_FORBIDDEN)
         
+        message_id = message.id
         message.delete()
+        broadcast_team_event(team.id, 'message.deleted', {'id': message_id})
         return Response({
             'success': True,
             'message': 'Message deleted successfully'
         }, status=status.HTTP_204_NO_CONTENT)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_team_messages(request, team_id):
+    """
+    Full-text search in a team's chat: ranked hits with highlighted snippets.
+
+    Query parameters: q (required), limit (1-50, default 20) and cursor, the
+    next_cursor of the previous page. The cursor is an opaque encoding of an
+    offset into the ranked results, not a position in the chat: ranking is
+    relative to the whole team's messages, so if messages are posted or
+    deleted between pages a hit may repeat or be skipped. Clients that need
+    an exact listing should page through the message list instead.
+    """
+    if not TeamMembership.objects.filter(team_id=team_id, user=request.user, status='active').exists():
+        return Response({
+            'success': False,
+            'message': 'You are not a member of this team'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({
+            'success': False,
+            'message': 'Search query (q) is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Relevance ranks shift as the team's chat changes, so there is no stable
+    # key to page on; the cursor is a base64-encoded offset (see above)
+    try:
+        cursor = request.query_params.get('cursor')
+        offset = int(base64.urlsafe_b64decode(cursor.encode()).decode()) if cursor else 0
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return Response({
+            'success': False,
+            'message': 'Invalid cursor or limit'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    hits, has_more = message_search.search_team_messages(team_id, query, offset=max(offset, 0), limit=limit)
+
+    results = []
+    for message, snippet in hits:
+        data = TeamMessageSerializer(message).data
+        data['snippet'] = snippet
+        results.append(data)
+
+    next_cursor = None
+    if has_more:
+        next_cursor = base64.urlsafe_b64encode(str(offset + limit).encode()).decode()
+
+    return Response({
+        'success': True,
+        'results': results,
+        'next_cursor': next_cursor
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_messages_read(request, team_id):
+    """Move the user's read cursor up to a message (or to now if none is given)"""
+    try:
+        membership = TeamMembership.objects.get(team_id=team_id, user=request.user, status='active')
+    except TeamMembership.DoesNotExist:
+        return Response({
+            'success': False,
+            'message': 'You are not a member of this team'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    message_id = request.data.get('message_id')
+    if message_id:
+        try:
+            read_at = TeamMessage.objects.values_list('created_at', flat=True).get(pk=message_id, team_id=team_id)
+        except (TeamMessage.DoesNotExist, ValueError, ValidationError):
+            return Response({
+                'success': False,
+                'message': 'Message not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+    else:
+        read_at = timezone.now()
+
+    # The cursor only ever moves forward
+    TeamMembership.objects.filter(pk=membership.pk).filter(
+        Q(last_read_at__isnull=True) | Q(last_read_at__lt=read_at)
+    ).update(last_read_at=read_at)
+
+    return Response({
+        'success': True,
+        'message': 'Messages marked as read'
+    })
+
+@api_view(['GET'])
+@authentication_classes([ClaimsJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def unread_counts(request):
+    """
+    Unread message counts for all of the user's teams, in one query. Other
+    members' messages after the read cursor count; a member who has never
+    marked anything read counts from when they joined.
+    """
+    # Polled often, so authenticated from the token claims alone
+    read_cursor = Coalesce('last_read_at', 'joined_at')
+    memberships = TeamMembership.objects.filter(
+        user_id=request.user.id, status='active'
+    ).values('team_id').annotate(
+        unread_count=Count(
+            'team__messages',
+            filter=(
+                ~Q(team__messages__sender_id=request.user.id) &
+                (Q(last_read_at__isnull=True, joined_at__isnull=True) | Q(team__messages__created_at__gt=read_cursor))
+            )
+        )
+    )
+
+    unread = [
+        {'team_id': row['team_id'], 'unread_count': row['unread_count']}
+        for row in memberships
+    ]
+    return Response({
+        'success': True,
+        'unread': unread,
+        'total_unread': sum(row['unread_count'] for row in unread)
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def team_message_attachment(request, team_id, message_id):
+    """Download a message attachment or one of its previews (team members only, supports Range requests)"""
+    # Checked first so outsiders can't probe which message ids exist
+    if not TeamMembership.objects.filter(team_id=team_id, user=request.user, status='active').exists():
+        return Response({
+            'success': False,
+            'message': 'You are not a member of this team'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        message = TeamMessage.objects.get(pk=message_id, team_id=team_id)
+    except TeamMessage.DoesNotExist:
+        return Response({
+            'success': False,
+            'message': 'Message not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if not message.file_attachment:
+        return Response({
+            'success': False,
+            'message': 'This message has no attachment'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    # ?size=small|medium serves a generated thumbnail instead of the original
+    size = request.query_params.get('size')
+    if size:
+        preview = message.previews.get('sizes', {}).get(size) if message.preview_status == 'ready' else None
+        if not preview:
+            return Response({
+                'success': False,
+                'message': 'Preview not available'
+            }, status=status.HTTP_404_NOT_FOUND)
+        return attachment_response(request, preview['path'], f'{size}_{message.file_name or "preview"}.jpg')
+
+    return attachment_response(request, message.file_attachment.name, message.file_name or message.file_attachment.name)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def team_uploads(request, team_id):
+    """Start a resumable attachment upload"""
+    if not TeamMembership.objects.filter(team_id=team_id, user=request.user, status='active').exists():
+        return Response({
+            'success': False,
+            'message': 'You are not a member of this team'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    file_name = (request.data.get('file_name') or '').strip()
+    try:
+        file_size = int(request.data.get('file_size'))
+    except (TypeError, ValueError):
+        file_size = 0
+
+    if not file_name or file_size <= 0:
+        return Response({
+            'success': False,
+            'message': 'file_name and file_size are required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if file_size > settings.TEAM_UPLOAD_MAX_SIZE:
+        return Response({
+            'success': False,
+            'message': 'File is too large'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    upload = TeamUpload.objects.create(
+        team_id=team_id,
+        uploader=request.user,
+        file_name=file_name[:255],
+        content_type=(request.data.get('content_type') or '')[:100],
+        total_size=file_size
+    )
+
+    return Response({
+        'success': True,
+        'upload': {
+            'id': upload.id,
+            'offset': 0,
+            'total_size': upload.total_size,
+            'chunk_size': settings.TEAM_UPLOAD_CHUNK_SIZE
+        }
+    }, status=status.HTTP_201_CREATED)
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def team_upload_detail(request, team_id, upload_id):
+    """
+    GET: Current offset, so an interrupted upload can resume
+    PUT: Append a chunk (raw body, Content-Range: bytes start-end/total)
+    DELETE: Abort the upload
+    """
+    try:
+        upload = TeamUpload.objects.get(pk=upload_id, team_id=team_id, uploader=request.user)
+    except TeamUpload.DoesNotExist:
+        return Response({
+            'success': False,
+            'message': 'Upload not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        return Response({
+            'success': True,
+            'upload': {
+                'id': upload.id,
+                'offset': upload.received_bytes,
+                'total_size': upload.total_size,
+                'chunk_size': settings.TEAM_UPLOAD_CHUNK_SIZE
+            }
+        })
+
+    elif request.method == 'PUT':
+        content_range = parse_content_range(request.META.get('HTTP_CONTENT_RANGE'))
+        if not content_range or content_range[2] != upload.total_size or content_range[1] >= upload.total_size:
+            return Response({
+                'success': False,
+                'message': 'A valid Content-Range header is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        start, end, _ = content_range
+        length = end - start + 1
+        if length > settings.TEAM_UPLOAD_CHUNK_SIZE:
+            return Response({
+                'success': False,
+                'message': 'Chunk is too large'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Chunks must arrive in order; tell the client where to resume from
+        if start != upload.received_bytes:
+            return Response({
+                'success': False,
+                'message': 'Unexpected chunk offset',
+                'offset': upload.received_bytes
+            }, status=status.HTTP_409_CONFLICT)
+
+        written = write_chunk(upload, request.stream, start, length)
+        if written != length:
+            return Response({
+                'success': False,
+                'message': 'Incomplete chunk',
+                'offset': upload.received_bytes
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only advance if nobody else did in the meantime
+        TeamUpload.objects.filter(pk=upload.pk, received_bytes=start).update(
+            received_bytes=end + 1, updated_at=timezone.now()
+        )
+        upload.refresh_from_db(fields=['received_bytes'])
+
+        return Response({
+            'success': True,
+            'upload': {
+                'id': upload.id,
+                'offset': upload.received_bytes,
+                'total_size': upload.total_size,
+                'complete': upload.is_complete
+            }
+        })
+
+    elif request.method == 'DELETE':
+        discard_upload(upload)
+        upload.delete()
+        return Response({
+            'success': True,
+            'message': 'Upload cancelled'
+        }, status=status.HTTP_204_NO_CONTENT)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def complete_team_upload(request, team_id, upload_id):
+    """Turn a fully received upload into a chat message"""
+    try:
+        upload = TeamUpload.objects.select_related('team').get(pk=upload_id, team_id=team_id, uploader=request.user)
+    except TeamUpload.DoesNotExist:
+        return Response({
+            'success': False,
+            'message': 'Upload not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if not TeamMembership.objects.filter(team_id=team_id, user=request.user, status='active').exists():
+        return Response({
+            'success': False,
+            'message': 'You are not a member of this team'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    if not upload.is_complete:
+        return Response({
+            'success': False,
+            'message': 'Upload is not complete',
+            'offset': upload.received_bytes
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Identical content already stored is reused without writing anything new
+    part_file = open_completed_upload(upload)
+    try:
+        blob = store_blob(part_file, upload.total_size)
+    finally:
+        part_file.close()
+    discard_upload(upload)
+
+    is_image = upload.content_type.startswith('image/')
+    message = TeamMessage.objects.create(
+        team=upload.team,
+        sender=request.user,
+        content=request.data.get('content') or upload.file_name,
+        message_type='image' if is_image else 'file',
+        blob=blob,
+        file_attachment=blob.file.name,
+        file_name=upload.file_name,
+        file_size=upload.total_size,
+        preview_status='pending' if is_image else 'none'
+    )
+    upload.delete()
+    if is_image:
+        schedule_previews(message.id)
+
+    response_serializer = TeamMessageSerializer(message)
+    broadcast_team_event(team_id, 'message.created', response_serializer.data)
+    return Response({
+        'success': True,
+        'message': response_serializer.data
+    }, status=status.HTTP_201_CREATED)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def invite_to_team(request, pk):
@@ -693,7 +1176,7 @@ def get_invitation_requests(request, pk):
         }, status=status.HTTP_403_FORBIDDEN)
 
     # ✅ Get ALL invitation requests for this team (all statuses)
-    invitation_requests = TeamInvitation.objects.filter(
+    invitation_requests = TeamInvitation.objects.unexpired().filter(
         team=team
     ).select_related('inviter', 'invitee').order_by('-created_at')
 
@@ -842,106 +1325,52 @@ def get_pending_requests(request, pk):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_all_user_requests(request):
-    """Get ALL user's requests and invitations with complete history"""
+    """Get ALL user's requests and invitations with complete history, grouped by category"""
     user = request.user
-    print(f"DEBUG: Getting requests for user {user.id} ({user.email})")
-    
-    # ✅ Get ALL join requests sent by user (all statuses)
-    join_requests = TeamMembership.objects.filter(
-        user=user,
-        invited_by=user  # Self-requested
-    ).select_related('team__hackathon').order_by('-invited_at')
-    print(f"DEBUG: Found {join_requests.count()} join requests")
-    
-    # ✅ Get ALL invitations received by user (all statuses)
-    invitations_received = TeamInvitation.objects.filter(
-        invitee=user
-    ).select_related('team__hackathon', 'inviter').order_by('-created_at')
-    print(f"DEBUG: Found {invitations_received.count()} invitations received")
-    
-    # ✅ Get ALL invitation requests sent by user (all statuses)
-    invitation_requests_sent = TeamInvitation.objects.filter(
-        inviter=user
-    ).select_related('team__hackathon', 'invitee').order_by('-created_at')
-    print(f"DEBUG: Found {invitation_requests_sent.count()} invitation requests sent")
-
-    # Also check for ANY team memberships for this user
-    all_memberships = TeamMembership.objects.filter(user=user)
-    print(f"DEBUG: User has {all_memberships.count()} total memberships")
-    for membership in all_memberships:
-        print(f"  - Team: {membership.team.name}, Status: {membership.status}, Invited by: {membership.invited_by}")
-
-    # Check for ANY team invitations involving this user
-    all_invitations = TeamInvitation.objects.filter(Q(invitee=user) | Q(inviter=user))
-    print(f"DEBUG: User has {all_invitations.count()} total invitations")
-    for invitation in all_invitations:
-        print(f"  - Team: {invitation.team.name}, Status: {invitation.status}, Inviter: {invitation.inviter}, Invitee: {invitation.invitee}")
+
+    join_requests = inbox.join_requests_for(user).select_related('team__hackathon').order_by('-invited_at')
+    invitations_received = inbox.invitations_received_for(user).select_related(
+        'team__hackathon', 'inviter'
+    ).order_by('-created_at')
+    invitation_requests_sent = inbox.invitations_sent_for(user).select_related(
+        'team__hackathon', 'invitee'
+    ).order_by('-created_at')
 
     data = {
-        'join_requests': [],
-        'invitations_received': [],
-        'invitation_requests_sent': []
+        'join_requests': [inbox.serialize_join_request(m) for m in join_requests],
+        'invitations_received': [inbox.serialize_invitation_received(i) for i in invitations_received],
+        'invitation_requests_sent': [inbox.serialize_invitation_sent(i) for i in invitation_requests_sent]
     }
 
-    # Serialize ALL join requests with complete data
-    for request in join_requests:
-        data['join_requests'].append({
-            'id': request.id,
-            'team': {
-                'id': request.team.id,
-                'name': request.team.name,
-                'hackathon_title': request.team.hackathon.title
-            },
-            'status': request.status,
-            'role': request.role,
-            'skills_contribution': request.skills_contribution,
-            'preferred_role_in_project': request.preferred_role_in_project,
-            'invitation_message': request.invitation_message,
-            'created_at': request.invited_at,
-            'joined_at': request.joined_at,
-            'left_at': request.left_at
-        })
-
-    # Serialize ALL invitations received with complete data
-    for invitation in invitations_received:
-        data['invitations_received'].append({
-            'id': invitation.id,
-            'team': {
-                'id': invitation.team.id,
-                'name': invitation.team.name,
-                'hackathon_title': invitation.team.hackathon.title
-            },
-            'inviter': invitation.inviter.name,
-            'message': invitation.message,
-            'status': invitation.status,
-            'created_at': invitation.created_at,
-            'responded_at': invitation.responded_at,
-            'expires_at': invitation.expires_at
-        })
+    return Response({
+        'success': True,
+        'data': data
+    })
 
-    # Serialize ALL invitation requests sent with complete data
-    for request in invitation_requests_sent:
-        data['invitation_requests_sent'].append({
-            'id': request.id,
-            'team': {
-                'id': request.team.id,
-                'name': request.team.name,
-                'hackathon_title': request.team.hackathon.title
-            },
-            'invitee': request.invitee.name,
-            'invitee_email': request.invitee.email,
-            'message': request.message,
-            'status': request.status,
-            'created_at': request.created_at,
-            'responded_at': request.responded_at,
-            'expires_at': request.expires_at
-        })
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_inbox(request):
+    """
+    Time-ordered feed of the user's join requests, invitations received and
+    invitation requests sent, cursor-paginated, with per-category counts
+    """
+    try:
+        cursor = inbox.decode_cursor(request.query_params['cursor']) if request.query_params.get('cursor') else None
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        return Response({
+            'success': False,
+            'message': 'Invalid cursor or limit'
+        }, status=status.HTTP_400_BAD_REQUEST)
 
-    print(f"DEBUG: Final data counts - join_requests: {len(data['join_requests'])}, invitations_received: {len(data['invitations_received'])}, invitation_requests_sent: {len(data['invitation_requests_sent'])}")
+    rows, next_cursor = inbox.inbox_page(request.user, cursor=cursor, limit=limit)
+    items = [inbox.serialize_inbox_item(kind, obj) for kind, obj in inbox.load_inbox_items(rows)]
 
     return Response({
         'success': True,
-        'data': data
+        'items': items,
+        'counts': inbox.inbox_counts(request.user),
+        'next_cursor': next_cursor
     })
 
 
@@ -971,7 +1400,7 @@ def get_all_team_requests(request, pk):
     ).select_related('user').order_by('-invited_at')
 
     # Get ALL invitation requests for this team
-    invitation_requests = TeamInvitation.objects.filter(
+    invitation_requests = TeamInvitation.objects.unexpired().filter(
         team=team
     ).select_related('inviter', 'invitee').order_by('-created_at')
 
@@ -1072,21 +1501,25 @@ def invite_to_team(request, pk):
         }, status=status.HTTP_404_NOT_FOUND)
 
     invitee_email = request.data.get('invitee_email')
+    invitee_id = request.data.get('invitee_id')  # From the participant directory search
     message = request.data.get('message', '')
 
-    if not invitee_email:
+    if not invitee_email and not invitee_id:
         return Response({
             'success': False,
-            'message': 'Invitee email is required'
+            'message': 'Invitee email or id is required'
         }, status=status.HTTP_400_BAD_REQUEST)
 
     # Get invitee user
     try:
-        invitee = get_user_model().objects.get(email=invitee_email)
-    except get_user_model().DoesNotExist:
+        if invitee_id:
+            invitee = get_user_model().objects.get(pk=invitee_id)
+        else:
+            invitee = get_user_model().objects.get(email=invitee_email)
+    except (get_user_model().DoesNotExist, ValueError, TypeError):
         return Response({
             'success': False,
-            'message': 'User with this email does not exist'
+            'message': 'User not found' if invitee_id else 'User with this email does not exist'
         }, status=status.HTTP_404_NOT_FOUND)
 
     # Check if user is already a member
@@ -1108,14 +1541,23 @@ def invite_to_team(request, pk):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     # Create invitation with leader_pending status
-    invitation = TeamInvitation.objects.create(
-        team=team,
-        inviter=request.user,
-        invitee=invitee,
-        message=message,
-        status='leader_pending',  # Requires leader approval first
-        expires_at=timezone.now() + timedelta(days=7)
-    )
+    with transaction.atomic():
+        invitation = TeamInvitation.objects.create(
+            team=team,
+            inviter=request.user,
+            invitee=invitee,
+            message=message,
+            status='leader_pending',  # Requires leader approval first
+            expires_at=timezone.now() + timedelta(days=7)
+        )
+        if team.team_leader_id != request.user.id:
+            notify(
+                team.team_leader, 'invitation_request',
+                f"{request.user.name} wants to invite {invitee.name} to {team.name}",
+                f"{request.user.name} suggested inviting {invitee.name} ({invitee.email}) "
+                f"to {team.name}. Review the request to send it.",
+                team_id=str(team.id), invitation_id=str(invitation.id)
+            )
 
     return Response({
         'success': True,
@@ -1143,9 +1585,14 @@ def approve_invitation_request(request, pk):
 
     action = request.data.get('action')  # 'approve' or 'reject'
 
+    if invitation.is_expired:
+        return _expired_invitation_response(invitation)
+
     if action == 'approve':
-        invitation.status = 'pending'  # Now sends to invitee
-        invitation.save()
+        with transaction.atomic():
+            invitation.status = 'pending'  # Now sends to invitee
+            invitation.save()
+            _notify_invitee(invitation)
         return Response({
             'success': True,
             'message': 'Invitation approved and sent to user'
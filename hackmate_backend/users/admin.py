@@ -3,7 +3,7 @@ from django.contrib import admin
 # from django.utils.html import format_html
 # from django.utils.safestring import mark_safe
 # import json
-from .models import User
+from .models import Skill, SkillAlias, User
 
 # @admin.register(User)
 # class CustomUserAdmin(UserAdmin):
@@ -212,4 +212,16 @@ from .models import User
 # admin.site.site_title = "HackMate Admin Portal"
 # admin.site.index_title = "Welcome to HackMate Administration"
 
-admin.site.register(User)
\ No newline at end of file
+admin.site.register(User)
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'created_at']
+    search_fields = ['name', 'aliases__alias']
+    inlines = [SkillAliasInline]
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Accounts are also created, changed and deleted outside the API
+        # (admin, createsuperuser), so the email filter, the cached JWT user
+        # and the public profile cache follow the model directly
+        from . import authentication, emails, profiles
+        User = self.get_model('User')
+        post_save.connect(emails.user_saved, sender=User, dispatch_uid='users.emails.saved')
+        post_delete.connect(emails.user_deleted, sender=User, dispatch_uid='users.emails.deleted')
+        post_save.connect(profiles.user_changed, sender=User, dispatch_uid='users.profiles.saved')
+        post_delete.connect(profiles.user_changed, sender=User, dispatch_uid='users.profiles.deleted')
+        post_save.connect(authentication.user_changed, sender=User, dispatch_uid='users.authentication.saved')
+        post_delete.connect(authentication.user_changed, sender=User, dispatch_uid='users.authentication.deleted')
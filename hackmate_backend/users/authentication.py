@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+
+def user_cache_key(user_id, version):
+    return f'jwt-user:{user_id}:{version}'
+
+
+def revoked_version_key(user_id):
+    return f'jwt-revoked:{user_id}'
+
+
+def forget_user(user):
+    """Drop the cached copy of a user so the next request reloads it"""
+    cache.delete(user_cache_key(user.pk, user.token_version))
+
+
+def user_changed(sender, instance, **kwargs):
+    # Deactivation, stat counters and admin edits all go through save() or
+    # delete(); the key is built now because delete() clears the pk
+    key = user_cache_key(instance.pk, instance.token_version)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _cached_fields(user):
+    # The password hash never goes into the cache; it is loaded on demand
+    return {
+        field.attname: getattr(user, field.attname)
+        for field in User._meta.concrete_fields if field.attname != 'password'
+    }
+
+
+def _from_cache(fields):
+    return User.from_db('default', list(fields), list(fields.values()))
+
+
+def revoke_tokens(user):
+    """
+    Invalidate every token issued to the user so far. The new version is
+    also published in the cache for the claims-only path, for as long as
+    an old access token could still be alive.
+    """
+    forget_user(user)
+    User.objects.filter(pk=user.pk).update(token_version=F('token_version') + 1)
+    user.refresh_from_db(fields=['token_version'])
+    cache.set(
+        revoked_version_key(user.pk),
+        user.token_version,
+        int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps the resolved user in the cache for
+    JWT_USER_CACHE_SECONDS, keyed on user id and token version, instead
+    of loading it from the database on every request. The cached copy
+    leaves out the password hash, which is loaded on first access.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = validated_token.get('ver', 0)
+        key = user_cache_key(user_id, version)
+
+        fields = cache.get(key)
+        if fields is None:
+            user = super().get_user(validated_token)
+            if user.token_version != version:
+                raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+            cache.set(key, _cached_fields(user), settings.JWT_USER_CACHE_SECONDS)
+            return user
+
+        user = _from_cache(fields)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Opt-in authentication for read endpoints that only need the user's id
+    and role. request.user is a TokenUser built from the token claims, so
+    views must use request.user.id rather than treating it as a User.
+    Revocation is checked against the cache only.
+    """
+
+    def get_user(self, validated_token):
+        revoked = cache.get(revoked_version_key(validated_token.get(api_settings.USER_ID_CLAIM)))
+        if revoked is not None and validated_token.get('ver', 0) < revoked:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return super().get_user(validated_token)
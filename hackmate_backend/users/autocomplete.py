@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Count
+
+KINDS = ('skill', 'tech_stack', 'theme')
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []  # Best completions under this prefix, highest weight first
+
+
+class PrefixIndex:
+    """
+    In-memory trie from normalized prefixes to display names. Every node
+    caches its top `top_k` completions, so a lookup costs one step per typed
+    character and never scans the matching subtree. Several keys can point
+    at one name (aliases: typing 'k8' suggests Kubernetes).
+    """
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.root = _Node()
+        self.weights = {}
+        self.keys = {}
+        self.spellings = {}  # normalized name -> first display spelling seen
+
+    def _rank(self, name):
+        return (-self.weights[name], name.lower())
+
+    def _bump_path(self, key, name):
+        node = self.root
+        for char in ' '.join(key.split()).lower():
+            node = node.children.setdefault(char, _Node())
+            top = node.top
+            if name in top:
+                top = sorted(top, key=self._rank)
+            elif len(top) < self.top_k or self._rank(name) < self._rank(top[-1]):
+                top = sorted(top + [name], key=self._rank)[:self.top_k]
+            else:
+                continue
+            # Swap in a new list so concurrent readers never see a half-sorted one
+            node.top = top
+
+    def add(self, name, weight=0, aliases=()):
+        """Insert `name` (and any alias spellings) or raise its weight by `weight`"""
+        display = ' '.join(str(name).split())
+        if not display:
+            return
+        name = self.spellings.setdefault(display.lower(), display)
+        self.weights[name] = self.weights.get(name, 0) + weight
+        keys = self.keys.setdefault(name, set())
+        keys.update(key for key in (name, *aliases) if key)
+        for key in keys:
+            self._bump_path(key, name)
+
+    def complete(self, prefix, limit=10):
+        node = self.root
+        for char in ' '.join(prefix.split()).lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [(name, self.weights[name]) for name in node.top[:limit]]
+
+
+_lock = threading.Lock()
+_indexes = None
+_built_at = 0.0
+
+
+def build_indexes():
+    """Build the skill, tech stack and theme indexes from what is stored today"""
+    from hackathons.models import Hackathon, HackathonApplication
+    from teams.models import TeamSkill
+    from .models import Skill, SkillAlias, UserSkill
+
+    skill_names = dict(Skill.objects.values_list('id', 'name'))
+    aliases = {}
+    for alias, skill_id in SkillAlias.objects.values_list('alias', 'skill_id'):
+        aliases.setdefault(skill_id, []).append(alias)
+
+    skill_use = Counter()
+    for queryset in (UserSkill.objects.filter(kind='skill'), TeamSkill.objects.all()):
+        skill_use.update(dict(
+            queryset.order_by().values('skill_id').annotate(n=Count('pk')).values_list('skill_id', 'n')
+        ))
+    for ids in HackathonApplication.objects.values_list('skill_ids', flat=True):
+        skill_use.update(ids or [])
+
+    tech_use = Counter()
+    theme_use = Counter()
+    for ids, themes in Hackathon.objects.values_list('tech_stack_ids', 'themes'):
+        tech_use.update(ids or [])
+        if isinstance(themes, list):
+            theme_use.update(str(theme) for theme in themes)
+
+    top_k = getattr(settings, 'AUTOCOMPLETE_TOP_K', 10)
+    indexes = {kind: PrefixIndex(top_k) for kind in KINDS}
+    for skill_id, name in skill_names.items():
+        indexes['skill'].add(name, skill_use[skill_id], aliases.get(skill_id, ()))
+        indexes['tech_stack'].add(name, tech_use[skill_id], aliases.get(skill_id, ()))
+    for theme, count in theme_use.items():
+        indexes['theme'].add(theme, count)
+    return indexes
+
+
+def get_index(kind):
+    """
+    The live index for `kind`, built on first use. It is rebuilt every
+    AUTOCOMPLETE_REBUILD_SECONDS so changes made by other processes show up.
+    Between rebuilds, record() keeps it current in this process.
+    """
+    global _indexes, _built_at
+    max_age = getattr(settings, 'AUTOCOMPLETE_REBUILD_SECONDS', 600)
+    if _indexes is None or time.monotonic() - _built_at > max_age:
+        with _lock:
+            if _indexes is None or time.monotonic() - _built_at > max_age:
+                _indexes = build_indexes()
+                _built_at = time.monotonic()
+    return _indexes[kind]
+
+
+def record(kind, names):
+    """Count new uses of `names`, adding any that aren't indexed yet"""
+    if _indexes is None or not names:
+        return
+    with _lock:
+        index = _indexes[kind]
+        for name in names:
+            index.add(name, 1)
+
+
+def reset():
+    global _indexes
+    with _lock:
+        _indexes = None
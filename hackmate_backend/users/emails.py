@@ -0,0 +1,125 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def normalize_email(email):
+    return str(email).strip().lower()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. `in` never misses a member that
+    was added; it can report a false positive at roughly the configured
+    rate while it holds no more than `capacity` members.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Kirsch-Mitzenmacher: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+_lock = threading.Lock()
+_filter = None
+_built_at = 0.0
+
+
+def _recent_key(email):
+    return 'email-registered:' + hashlib.sha256(email.encode()).hexdigest()
+
+
+def build_filter():
+    from .models import User
+
+    emails = User.objects.values_list('email', flat=True)
+    # Room to double before the false positive rate degrades
+    bloom = BloomFilter(emails.count() * 2 + 1024, getattr(settings, 'EMAIL_FILTER_ERROR_RATE', 0.01))
+    for email in emails.iterator():
+        bloom.add(normalize_email(email))
+    return bloom
+
+
+def get_filter():
+    """
+    The registered-email filter for this process, built on first use and
+    rebuilt every EMAIL_FILTER_REBUILD_SECONDS so deleted addresses drop out.
+    """
+    global _filter, _built_at
+    max_age = getattr(settings, 'EMAIL_FILTER_REBUILD_SECONDS', 3600)
+    if _filter is None or time.monotonic() - _built_at > max_age:
+        with _lock:
+            if _filter is None or time.monotonic() - _built_at > max_age:
+                _filter = build_filter()
+                _built_at = time.monotonic()
+    return _filter
+
+
+def is_registered(email):
+    """
+    Whether an account uses `email`, case-insensitively. Addresses the
+    filter has never seen are answered without a query; possible hits are
+    confirmed against the database.
+    """
+    from .models import User
+
+    email = normalize_email(email)
+    if email in get_filter():
+        return User.objects.filter(email__iexact=email).exists()
+    # Registered in another process since this filter was built
+    return bool(cache.get(_recent_key(email)))
+
+
+def record(email):
+    """Add a newly registered address to this process's filter and announce it to the others"""
+    email = normalize_email(email)
+    if _filter is not None:
+        with _lock:
+            _filter.add(email)
+    cache.set(_recent_key(email), True, getattr(settings, 'EMAIL_FILTER_REBUILD_SECONDS', 3600))
+
+
+def forget(email):
+    """
+    Bloom filters can't remove members, so a deleted address stays a
+    possible hit (and is checked in the database) until the next rebuild.
+    Only the cross-process announcement needs clearing.
+    """
+    cache.delete(_recent_key(normalize_email(email)))
+
+
+def reset():
+    global _filter
+    with _lock:
+        _filter = None
+
+
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        email = instance.email
+        transaction.on_commit(lambda: record(email))
+
+
+def user_deleted(sender, instance, **kwargs):
+    email = instance.email
+    transaction.on_commit(lambda: forget(email))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, must_update_salt
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from
+    PASSWORD_PBKDF2_ITERATIONS. It keeps the pbkdf2_sha256 algorithm name,
+    so existing hashes still verify. Hashes with fewer iterations are
+    rewritten with the configured count on the user's next successful
+    login; stronger ones (e.g. Django's default 1,000,000) are kept as is.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return decoded['iterations'] < self.iterations or must_update_salt(decoded['salt'], self.salt_entropy)
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from users.models import User
+
+BENCH_EMAIL = 'bench-logins@example.invalid'
+BENCH_PASSWORD = 'correct horse battery staple'
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure successful POST /api/auth/login/ requests per second on one core for each hasher profile. '
+        'The requests go through the full view (password check, token issue), inside a transaction '
+        'that is rolled back, so nothing is left in the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=list(settings.PASSWORD_HASHER_PROFILES),
+            help='Profiles from PASSWORD_HASHER_PROFILES to measure (default: all)'
+        )
+        parser.add_argument(
+            '--seconds', type=float, default=3.0,
+            help='How long to run each profile (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        baseline = baseline_name = None
+        for profile in options['profiles']:
+            try:
+                rate, algorithm = self._bench_profile(profile, options['seconds'])
+            except ValueError as e:
+                # e.g. argon2-cffi not installed
+                self.stdout.write(self.style.WARNING(f'{profile:<10} skipped: {e}'))
+                continue
+
+            if baseline is None:
+                baseline, baseline_name = rate, profile
+            self.stdout.write(
+                f'{profile:<10} {rate:8.1f} logins/sec/core  ({rate / baseline:.2f}x {baseline_name})  {algorithm}'
+            )
+
+    def _bench_profile(self, profile, seconds):
+        """(logins per second, hash algorithm) for one profile"""
+        # The login throttles only count failures, so the run needs no exemption
+        with override_settings(PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES[profile], ALLOWED_HOSTS=['testserver']), \
+                transaction.atomic():
+            try:
+                user = User.objects.create_user(
+                    username=BENCH_EMAIL, email=BENCH_EMAIL, password=BENCH_PASSWORD, name='Bench'
+                )
+                return self._measure(seconds), user.password.split('$', 1)[0]
+            finally:
+                transaction.set_rollback(True)
+
+    def _measure(self, seconds):
+        client = Client()
+        body = {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}
+        logins = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            response = client.post('/api/auth/login/', body, content_type='application/json')
+            if response.status_code != 200:
+                raise RuntimeError(f'Login failed with status {response.status_code}')
+            logins += 1
+        return logins / (time.perf_counter() - started)
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.stats import changed_user_ids, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute total_hackathons_participated and total_hackathons_organized '
+        'from applications and hackathons, writing only the users that drifted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only users whose applications or organized hackathons changed within --window'
+        )
+        parser.add_argument(
+            '--window', type=int, default=60,
+            help='Minutes to look back with --incremental; schedule runs more often than this (default: 60)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Users to update per statement (default: 500)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report how many users would change without writing anything'
+        )
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['incremental']:
+            user_ids = changed_user_ids(timezone.now() - timedelta(minutes=options['window']))
+
+        changed = reconcile(user_ids, batch_size=options['batch_size'], dry_run=options['dry_run'])
+
+        scope = 'all users' if user_ids is None else f'{len(user_ids)} recently changed users'
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'[dry run] {changed} of {scope} would be updated'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Updated {changed} of {scope}'))
@@ -0,0 +1,33 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from users.authentication import CachedJWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+
+@database_sync_to_async
+def get_user_from_token(raw_token):
+    """Resolve a raw access token to a user, or AnonymousUser if it is invalid"""
+    authenticator = CachedJWTAuthentication()
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+        return authenticator.get_user(validated_token)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate WebSocket connections with the same access token the REST API uses.
+    Browsers can't set headers on a WebSocket handshake, so the token is passed
+    as ?token=<access> in the query string.
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode())
+        token = query.get('token', [None])[0]
+
+        scope['user'] = await get_user_from_token(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def skill_terms(values):
+    # Frozen copy of users.skills.skill_terms as of this migration
+    return {' '.join(str(value).split()).lower()[:100] for value in values or [] if str(value).strip()}
+
+
+def build_skill_index(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    UserSkill = apps.get_model('users', 'UserSkill')
+    rows = []
+    for user in User.objects.only('id', 'skills').iterator():
+        rows.extend(UserSkill(user_id=user.id, term=term) for term in skill_terms(user.skills))
+    UserSkill.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_average_rating_user_hackathons_won_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'user'], name='users_users_term_6b598d_idx')],
+                'unique_together': {('user', 'term')},
+            },
+        ),
+        # Reversing the CreateModel drops the index rows with the table
+        migrations.RunPython(build_skill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from users.taxonomy import Resolver, normalize, seed_taxonomy
+
+
+def clear_skill_index(apps, schema_editor):
+    # UserSkill is derived data; it is rebuilt against the taxonomy below
+    apps.get_model('users', 'UserSkill').objects.all().delete()
+
+
+def rebuild_term_index(apps, schema_editor):
+    # Reverse of clear_skill_index: the 0007 index of normalized terms
+    User = apps.get_model('users', 'User')
+    UserSkill = apps.get_model('users', 'UserSkill')
+    rows = []
+    for user in User.objects.only('id', 'skills').iterator():
+        terms = {normalize(value) for value in user.skills or [] if str(value).strip()}
+        rows.extend(UserSkill(user_id=user.id, term=term) for term in terms)
+    UserSkill.objects.bulk_create(rows, batch_size=1000)
+
+
+def backfill_users(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    UserSkill = apps.get_model('users', 'UserSkill')
+    resolver = Resolver(apps)
+
+    rows = []
+    for user in User.objects.only('id', 'skills', 'interests').iterator():
+        skill_ids = resolver.ids(user.skills)
+        interest_ids = resolver.ids(user.interests)
+        User.objects.filter(pk=user.pk).update(
+            skills=resolver.names_for(skill_ids),
+            interests=resolver.names_for(interest_ids)
+        )
+        rows.extend(UserSkill(user_id=user.id, kind='skill', skill_id=i) for i in skill_ids)
+        rows.extend(UserSkill(user_id=user.id, kind='interest', skill_id=i) for i in interest_ids)
+    UserSkill.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_userskill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='users.skill')),
+            ],
+            options={
+                'verbose_name_plural': 'skill aliases',
+            },
+        ),
+        # Reversing the CreateModels drops the seeded taxonomy with its tables
+        migrations.RunPython(seed_taxonomy, migrations.RunPython.noop),
+        migrations.RunPython(clear_skill_index, rebuild_term_index),
+        migrations.RemoveIndex(
+            model_name='userskill',
+            name='users_users_term_6b598d_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='userskill',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='userskill',
+            name='term',
+        ),
+        migrations.AddField(
+            model_name='userskill',
+            name='kind',
+            field=models.CharField(choices=[('skill', 'Skill'), ('interest', 'Interest')], default='skill', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='userskill',
+            name='skill',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.skill'),
+        ),
+        # Going back, the skill-based rows are dropped so the term column can
+        # return; skills and interests keep their canonical spellings, since
+        # the original ones aren't stored anywhere
+        migrations.RunPython(backfill_users, clear_skill_index),
+        migrations.AlterField(
+            model_name='userskill',
+            name='skill',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.skill'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='userskill',
+            unique_together={('user', 'kind', 'skill')},
+        ),
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['skill', 'kind', 'user'], name='users_users_skill_i_f472d5_idx'),
+        ),
+    ]
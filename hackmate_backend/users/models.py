@@ -46,6 +46,9 @@ class User(AbstractUser):
     
     # Profile Settings
     availability_status = models.BooleanField(default=True)
+
+    # Bumped to revoke every token issued before it (e.g. on password change)
+    token_version = models.PositiveIntegerField(default=0)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -77,4 +80,58 @@ class User(AbstractUser):
     @property
     def total_hackathons(self):
         """For backward compatibility"""
-        return self.total_hackathons_participated
\ No newline at end of file
+        return self.total_hackathons_participated
+
+
+class Skill(models.Model):
+    """
+    Canonical entry in the skill/interest taxonomy. Free-text lists on users,
+    applications, teams and hackathons are resolved to these through
+    SkillAlias, so "react", "ReactJS" and "React.js" all become one id.
+    """
+    name = models.CharField(max_length=100)
+    slug = models.CharField(max_length=100, unique=True)  # normalized name
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Normalized spelling that resolves to a canonical Skill (every skill has one for its own slug)"""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name_plural = 'skill aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
+class UserSkill(models.Model):
+    """
+    Canonical skills and interests of a user, one row per skill id, so
+    directory searches and facets use indexed integer joins instead of
+    scanning JSON. Kept in sync by users.skills.index_user_skills.
+    """
+    KIND_CHOICES = [
+        ('skill', 'Skill'),
+        ('interest', 'Interest'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_index')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='skill')
+
+    class Meta:
+        unique_together = ['user', 'kind', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'kind', 'user']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.kind} {self.skill_id}"
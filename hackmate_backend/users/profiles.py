@@ -0,0 +1,92 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import User
+from .serializers import PublicProfileSerializer
+
+# Model fields behind PublicProfileSerializer; total_hackathons is a property
+# over total_hackathons_participated
+_ONLY = [
+    'id', 'email', 'name', 'bio', 'location', 'github_url', 'linkedin_url',
+    'portfolio_url', 'leetcode_url', 'skills', 'interests', 'experience_level',
+    'total_hackathons_participated', 'hackathons_won', 'average_rating',
+    'availability_status', 'date_joined', 'role'
+]
+
+# Cached in place of a deleted user's entry, so a reader that loaded the row
+# just before the delete committed can't put it back
+_DELETED = 'deleted'
+
+
+def profile_cache_key(user_id):
+    return f'public-profile:{user_id}'
+
+
+def _entry(user):
+    return _tagged(dict(PublicProfileSerializer(user).data))
+
+
+def _tagged(data):
+    digest = hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+    return {'data': data, 'etag': f'"{digest}"'}
+
+
+def get_profiles(ids):
+    """
+    {user id: {'data': public profile, 'etag': ...}} for the ids that
+    exist. Cached entries come back in one cache round trip; the rest are
+    loaded in one query and cached for PROFILE_CACHE_SECONDS.
+
+    Misses are cached with add(), never set(): the row may have been read
+    just before an edit committed, and refresh() has already cached the
+    newer entry by the time this one would land.
+    """
+    ids = list(dict.fromkeys(ids))
+    cached = cache.get_many([profile_cache_key(user_id) for user_id in ids])
+    profiles = {user_id: cached[profile_cache_key(user_id)] for user_id in ids if profile_cache_key(user_id) in cached}
+
+    missing = [user_id for user_id in ids if user_id not in profiles]
+    if missing:
+        loaded = {user.id: _entry(user) for user in User.objects.filter(id__in=missing).only(*_ONLY)}
+        for user_id, entry in loaded.items():
+            cache.add(profile_cache_key(user_id), entry, settings.PROFILE_CACHE_SECONDS)
+        profiles.update(loaded)
+    return {user_id: entry for user_id, entry in profiles.items() if entry != _DELETED}
+
+
+def select_fields(entries, request):
+    """
+    Narrow entries to the ?fields= the request asked for. Each narrowed
+    entry gets its own ETag so it never validates a full cached copy.
+    """
+    selected = PublicProfileSerializer(context={'request': request}).selected_field_names()
+    if selected is None:
+        return entries
+    return [_tagged({name: value for name, value in entry['data'].items() if name in selected}) for entry in entries]
+
+
+def combined_etag(entries):
+    """One validator for a batch response, changing if any member's profile does"""
+    digest = hashlib.md5(''.join(entry['etag'] for entry in entries).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def refresh(*user_ids):
+    """
+    Overwrite the cached entries with the committed rows. Deleting them
+    instead would let a concurrent get_profiles() cache the row it read
+    before the change, and serve it until the entry expires.
+    """
+    loaded = {user.id: _entry(user) for user in User.objects.filter(id__in=user_ids).only(*_ONLY)}
+    entries = {profile_cache_key(user_id): loaded.get(user_id, _DELETED) for user_id in user_ids}
+    cache.set_many(entries, settings.PROFILE_CACHE_SECONDS)
+
+
+def user_changed(sender, instance, **kwargs):
+    # Profile edits, stat updates and admin changes all go through save() or delete()
+    user_id = instance.pk
+    transaction.on_commit(lambda: refresh(user_id))
@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from hackmate_backend.serializers import DynamicFieldsMixin
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
 from .models import User
+from . import emails
+from .tokens import VersionedRefreshToken, is_blacklisted
+from .skills import canonical_names, index_user_skills
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
@@ -26,8 +33,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Passwords don't match.")
         return attrs
 
+    # Store canonical taxonomy names so 'reactjs' and 'React' are the same skill
+    def validate_skills(self, value):
+        return canonical_names(value)
+
+    def validate_interests(self, value):
+        return canonical_names(value)
+
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        # Same comparison as the availability check, so it never says yes to a taken address
+        if User.objects.filter(email__iexact=emails.normalize_email(value)).exists():
             raise serializers.ValidationError("A user with this email already exists.")
         return value
 
@@ -43,6 +58,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         validated_data['username'] = validated_data.get('email') 
 
         user = User.objects.create_user(**validated_data)
+        index_user_skills(user)
         return user
 
 class UserLoginSerializer(serializers.Serializer):
@@ -54,27 +70,20 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if email and password:
-            try:
-                # First find the user by email
-                user_obj = User.objects.get(email=email)
-                # Then authenticate using the username (not email)
-                user = authenticate(email=user_obj.email, password=password)
-                
-                if not user:
-                    raise serializers.ValidationError('Invalid credentials.')
-                
-                if not user.is_active:
-                    raise serializers.ValidationError('User account is disabled.')
-                
-                attrs['user'] = user
-                return attrs
-                
-            except User.DoesNotExist:
+            # email is the USERNAME_FIELD, so the backend looks the user up
+            # itself; it also rehashes the password if the hasher profile changed
+            user = authenticate(email=email, password=password)
+            
+            # Inactive accounts are refused by the backend as well
+            if not user:
                 raise serializers.ValidationError('Invalid credentials.')
+            
+            attrs['user'] = user
+            return attrs
         else:
             raise serializers.ValidationError('Email and password are required.')
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -84,10 +93,26 @@ class UserSerializer(serializers.ModelSerializer):
             'phone_number', 'github_url', 'linkedin_url', 'portfolio_url', 'leetcode_url',
             # 'hackerrank_url', 
             'skills', 'interests', 'experience_level', 'total_hackathons',
+            'total_hackathons_organized',
             'hackathons_won', 'average_rating', 'availability_status',
             'date_joined', 'created_at', 'updated_at', 'role'
         ]
-        read_only_fields = ['id', 'date_joined', 'created_at', 'updated_at']
+        sparse_columns = {'total_hackathons': ['total_hackathons_participated']}
+        read_only_fields = ['id', 'total_hackathons_organized', 'date_joined', 'created_at', 'updated_at']
+
+class PublicProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """What other users see on profile cards; cached by users/profiles.py"""
+    class Meta:
+        model = User
+        fields = [
+            'id', 'email', 'name', 'bio', 'location',
+            'github_url', 'linkedin_url', 'portfolio_url', 'leetcode_url',
+            'skills', 'interests', 'experience_level', 'total_hackathons',
+            'hackathons_won', 'average_rating', 'availability_status',
+            'date_joined', 'role'
+        ]
+        sparse_columns = {'total_hackathons': ['total_hackathons_participated']}
+        read_only_fields = fields
 
 class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -99,7 +124,45 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             'experience_level', 'availability_status', 'role'
         ]
 
+    # Store canonical taxonomy names so 'reactjs' and 'React' are the same skill
+    def validate_skills(self, value):
+        return canonical_names(value)
+
+    def validate_interests(self, value):
+        return canonical_names(value)
+
+    def update(self, instance, validated_data):
+        user = super().update(instance, validated_data)
+        if 'skills' in validated_data or 'interests' in validated_data:
+            index_user_skills(user)
+        return user
+
 class TokenSerializer(serializers.Serializer):
     access = serializers.CharField()
     refresh = serializers.CharField()
     user = UserSerializer(read_only=True)
+
+class VersionedTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = VersionedRefreshToken
+
+class VersionedTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuse to refresh tokens issued before the user's last revocation"""
+    token_class = VersionedRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        current = User.objects.filter(
+            pk=refresh.get(api_settings.USER_ID_CLAIM)
+        ).values_list('token_version', flat=True).first()
+        if current is not None and refresh.get('ver', 0) != current:
+            raise InvalidToken('Token has been revoked')
+        return super().validate(attrs)
+
+class CachedTokenVerifySerializer(TokenVerifySerializer):
+    """Token verification that checks the blacklist through the revocation cache"""
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs['token'])
+        if is_blacklisted(token):
+            raise serializers.ValidationError('Token is blacklisted')
+        return {}
@@ -0,0 +1,98 @@
+from . import autocomplete
+from .models import Skill, SkillAlias, UserSkill
+
+
+def normalize_term(value):
+    """Lowercase and collapse whitespace so 'Machine  Learning' matches 'machine learning'"""
+    return ' '.join(str(value).split()).lower()[:100]
+
+
+def _unique_terms(values):
+    """{normalized term: display spelling} in first-seen order"""
+    terms = {}
+    for value in values or []:
+        display = ' '.join(str(value).split())[:100]
+        term = display.lower()
+        if term and term not in terms:
+            terms[term] = display
+    return terms
+
+
+def resolve_skills(values, create=True):
+    """
+    Map free-text skill names to canonical Skills, in order and without
+    duplicates. Unknown names become new skills when `create` is set and are
+    dropped otherwise (e.g. for search filters).
+    """
+    terms = _unique_terms(values)
+    if not terms:
+        return []
+
+    found = {
+        alias.alias: alias.skill
+        for alias in SkillAlias.objects.select_related('skill').filter(alias__in=terms)
+    }
+    if create:
+        for term, display in terms.items():
+            if term not in found:
+                skill, _ = Skill.objects.get_or_create(slug=term, defaults={'name': display})
+                SkillAlias.objects.get_or_create(alias=term, defaults={'skill': skill})
+                found[term] = skill
+
+    skills = {}
+    for term in terms:
+        skill = found.get(term)
+        if skill is not None:
+            skills.setdefault(skill.id, skill)
+    return list(skills.values())
+
+
+def canonical_names(values):
+    """
+    Free-text list -> canonical display names, as stored on the JSON fields.
+    Read-only, so it is safe in validation: names the taxonomy doesn't know
+    yet keep their own spelling and become skills when the owner is indexed.
+    """
+    if not isinstance(values, list):
+        return values
+    terms = _unique_terms(values)
+    found = {
+        alias.alias: alias.skill
+        for alias in SkillAlias.objects.select_related('skill').filter(alias__in=terms)
+    }
+
+    names = {}
+    for term, display in terms.items():
+        skill = found.get(term)
+        names.setdefault(('skill', skill.id) if skill else ('new', term), skill.name if skill else display)
+    return list(names.values())
+
+
+def skill_ids(*lists, create=False):
+    ids = set()
+    for values in lists:
+        ids.update(skill.id for skill in resolve_skills(values, create=create))
+    return ids
+
+
+def parse_skill_ids(param):
+    """Comma separated query parameter -> (ids of the named skills, whether every name is known)"""
+    terms = _unique_terms((param or '').split(','))
+    found = dict(SkillAlias.objects.filter(alias__in=terms).values_list('alias', 'skill_id'))
+    return set(found.values()), len(found) == len(terms)
+
+
+def index_user_skills(user):
+    """Replace the user's rows in the skill index with their current skills and interests"""
+    skills = {skill.id: skill.name for skill in resolve_skills(user.skills)}
+    wanted = {('skill', skill_id) for skill_id in skills}
+    wanted |= {('interest', skill.id) for skill in resolve_skills(user.interests)}
+    existing = set(UserSkill.objects.filter(user=user).values_list('kind', 'skill_id'))
+
+    for kind, _ in UserSkill.KIND_CHOICES:
+        stale = [skill_id for k, skill_id in existing - wanted if k == kind]
+        if stale:
+            UserSkill.objects.filter(user=user, kind=kind, skill_id__in=stale).delete()
+    added = wanted - existing
+    UserSkill.objects.bulk_create([UserSkill(user=user, kind=kind, skill_id=skill_id) for kind, skill_id in added])
+    autocomplete.record('skill', [skills[skill_id] for kind, skill_id in added if kind == 'skill'])
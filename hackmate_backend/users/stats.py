@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models import Count
+
+from hackathons.directory import REGISTERED_STATUSES
+from hackathons.models import Hackathon, HackathonApplication
+
+from . import profiles
+from .models import User
+
+STAT_FIELDS = ['total_hackathons_participated', 'total_hackathons_organized']
+
+
+def changed_user_ids(since):
+    """Users whose applications or organized hackathons changed at or after `since`"""
+    ids = set(HackathonApplication.objects.filter(updated_at__gte=since).values_list('user_id', flat=True))
+    ids.update(Hackathon.objects.filter(updated_at__gte=since).values_list('organizer_id', flat=True))
+    return ids
+
+
+def _counts(queryset, field):
+    return dict(queryset.order_by().values(field).annotate(n=Count('pk')).values_list(field, 'n'))
+
+
+def reconcile(user_ids=None, batch_size=500, dry_run=False):
+    """
+    Recompute the denormalized hackathon counters from the applications
+    and hackathons tables, for every user or just `user_ids`, with one
+    aggregate query per counter. Only rows whose values differ are
+    written, in bulk. Returns the number of users that changed.
+
+    Participation counts applications that are still live (applied,
+    team pending, payment pending or confirmed), so withdrawn and
+    rejected ones drop out.
+    """
+    applications = HackathonApplication.objects.filter(status__in=REGISTERED_STATUSES)
+    hackathons = Hackathon.objects.all()
+    users = User.objects.only('id', *STAT_FIELDS).order_by('pk')
+    if user_ids is not None:
+        applications = applications.filter(user_id__in=user_ids)
+        hackathons = hackathons.filter(organizer_id__in=user_ids)
+        users = users.filter(pk__in=user_ids)
+
+    participated = _counts(applications, 'user_id')
+    organized = _counts(hackathons, 'organizer_id')
+
+    changed = []
+    for user in users.iterator(chunk_size=batch_size):
+        expected = (participated.get(user.pk, 0), organized.get(user.pk, 0))
+        if (user.total_hackathons_participated, user.total_hackathons_organized) != expected:
+            user.total_hackathons_participated, user.total_hackathons_organized = expected
+            changed.append(user)
+
+    if changed and not dry_run:
+        User.objects.bulk_update(changed, STAT_FIELDS, batch_size=batch_size)
+        # bulk_update skips post_save, so refresh the cached profile cards here
+        user_ids = [user.pk for user in changed]
+        transaction.on_commit(lambda: profiles.refresh(*user_ids))
+    return len(changed)
@@ -0,0 +1,94 @@
+"""
+Frozen helpers for the skill taxonomy data migrations in users, teams and
+hackathons. They work on historical models only, so migrations keep
+behaving the same however users.skills changes; treat this module as
+part of those migrations and don't change what it does.
+"""
+
+# Canonical name -> extra spellings. Each skill also gets an alias for its own
+# normalized name; anything not listed here becomes its own skill on first use.
+SEED_TAXONOMY = {
+    'JavaScript': ['js', 'java script', 'ecmascript'],
+    'TypeScript': ['ts'],
+    'React': ['reactjs', 'react.js', 'react js'],
+    'React Native': ['react-native', 'reactnative'],
+    'Node.js': ['node', 'nodejs', 'node js'],
+    'Next.js': ['next', 'nextjs'],
+    'Vue.js': ['vue', 'vuejs'],
+    'Angular': ['angularjs', 'angular.js'],
+    'HTML': ['html5'],
+    'CSS': ['css3'],
+    'Tailwind CSS': ['tailwind', 'tailwindcss'],
+    'Python': ['py', 'python3'],
+    'Django': ['django rest framework', 'drf'],
+    'Flask': [],
+    'Java': [],
+    'Kotlin': [],
+    'Swift': [],
+    'Flutter': [],
+    'Go': ['golang'],
+    'Rust': [],
+    'C++': ['cpp'],
+    'C#': ['csharp', 'c sharp'],
+    'Solidity': [],
+    'Web3.js': ['web3', 'web3js'],
+    'Blockchain': [],
+    'PostgreSQL': ['postgres', 'psql'],
+    'MySQL': [],
+    'MongoDB': ['mongo'],
+    'Docker': [],
+    'Kubernetes': ['k8s'],
+    'AWS': ['amazon web services'],
+    'Google Cloud': ['gcp', 'google cloud platform'],
+    'Machine Learning': ['ml', 'machine-learning'],
+    'Deep Learning': ['dl', 'deep-learning'],
+    'Artificial Intelligence': ['ai'],
+    'TensorFlow': ['tf'],
+    'PyTorch': ['torch'],
+    'UI/UX Design': ['ui/ux', 'ui', 'ux', 'ui design', 'ux design', 'ui/ux designer'],
+}
+
+
+def normalize(value):
+    return ' '.join(str(value).split()).lower()[:100]
+
+
+def seed_taxonomy(apps, schema_editor):
+    Skill = apps.get_model('users', 'Skill')
+    SkillAlias = apps.get_model('users', 'SkillAlias')
+    for name, aliases in SEED_TAXONOMY.items():
+        skill, _ = Skill.objects.get_or_create(slug=normalize(name), defaults={'name': name})
+        for alias in {normalize(name), *(normalize(a) for a in aliases)}:
+            SkillAlias.objects.get_or_create(alias=alias, defaults={'skill': skill})
+
+
+class Resolver:
+    """Resolves free-text skill lists against the taxonomy of a migration state"""
+
+    def __init__(self, apps):
+        self.Skill = apps.get_model('users', 'Skill')
+        self.SkillAlias = apps.get_model('users', 'SkillAlias')
+        self.aliases = dict(self.SkillAlias.objects.values_list('alias', 'skill_id'))
+        self.names = dict(self.Skill.objects.values_list('id', 'name'))
+
+    def ids(self, values):
+        ids = []
+        if not isinstance(values, list):
+            return ids
+        for value in values:
+            display = ' '.join(str(value).split())[:100]
+            term = display.lower()
+            if not term:
+                continue
+            skill_id = self.aliases.get(term)
+            if skill_id is None:
+                skill = self.Skill.objects.create(name=display, slug=term)
+                self.SkillAlias.objects.create(alias=term, skill=skill)
+                skill_id = self.aliases[term] = skill.id
+                self.names[skill_id] = display
+            if skill_id not in ids:
+                ids.append(skill_id)
+        return ids
+
+    def names_for(self, ids):
+        return [self.names[skill_id] for skill_id in ids]
@@ -1,3 +1,478 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, PBKDF2SHA1PasswordHasher, make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .models import Skill, User, UserSkill
+from hackathons.models import Hackathon, HackathonApplication
+from . import autocomplete, emails, profiles, stats
+from .authentication import user_cache_key
+from .skills import index_user_skills, resolve_skills
+from .throttles import LoginEmailThrottle, LoginIPThrottle
+from .tokens import VersionedRefreshToken
+from .views import get_tokens_for_user
+from hackmate_backend.testing import Budget, QueryBudgetMixin
+
+
+class SkillTaxonomyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_aliases_resolve_to_one_skill(self):
+        skills = resolve_skills(['ReactJS', 'react', 'React.js', 'k8s'])
+        self.assertEqual([skill.name for skill in skills], ['React', 'Kubernetes'])
+
+    def test_unknown_names_join_the_taxonomy(self):
+        [skill] = resolve_skills(['  Quantum   Basket Weaving '])
+        self.assertEqual(skill.name, 'Quantum Basket Weaving')
+        self.assertEqual(resolve_skills(['quantum basket weaving']), [skill])
+        self.assertEqual(resolve_skills(['Underwater Origami'], create=False), [])
+
+    def test_profile_update_stores_canonical_names_and_indexes_them(self):
+        response = self.client.patch('/api/auth/profile/update/', {
+            'skills': ['reactjs', 'py'], 'interests': ['ML']
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.skills, ['React', 'Python'])
+        self.assertEqual(
+            set(UserSkill.objects.filter(user=self.user).values_list('kind', 'skill__name')),
+            {('skill', 'React'), ('skill', 'Python'), ('interest', 'Machine Learning')}
+        )
+        self.assertFalse(Skill.objects.filter(slug='reactjs').exists())
+
+
+    def test_invalid_profile_update_creates_no_skills(self):
+        response = self.client.patch('/api/auth/profile/update/', {
+            'skills': ['Underwater Origami'], 'experience_level': 'wizard'
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Skill.objects.filter(slug='underwater origami').exists())
+
+        response = self.client.patch('/api/auth/profile/update/', {'skills': ['Underwater  Origami']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Skill.objects.get(slug='underwater origami').name, 'Underwater Origami')
+
+
+class SkillAutocompleteTests(TestCase):
+    def setUp(self):
+        autocomplete.reset()
+        self.addCleanup(autocomplete.reset)
+        for i, skills in enumerate([['React', 'Python'], ['React'], ['Rust']]):
+            user = User.objects.create_user(username=f'u{i}', email=f'u{i}@example.com', password='pass12345', skills=skills)
+            index_user_skills(user)
+
+    def suggest(self, q, kind='skill'):
+        response = self.client.get('/api/auth/skills/autocomplete/', {'q': q, 'kind': kind})
+        return [s['name'] for s in response.data['suggestions']]
+
+    def test_completions_ranked_by_use(self):
+        suggestions = self.suggest('r')
+        self.assertEqual(suggestions[:2], ['React', 'Rust'])
+
+    def test_aliases_complete_to_canonical_name(self):
+        self.assertEqual(self.suggest('k8')[0], 'Kubernetes')
+
+    def test_answers_from_memory_and_picks_up_new_uses(self):
+        self.suggest('r')  # build
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('ru'), ['Rust'])
+
+        user = User.objects.create_user(username='u9', email='u9@example.com', password='pass12345',
+                                        skills=['Rust', 'Zig Lang'])
+        index_user_skills(user)
+        self.assertEqual(self.suggest('zig'), ['Zig Lang'])
+
+    def test_prefix_index_keeps_top_k(self):
+        index = autocomplete.PrefixIndex(top_k=2)
+        for name, weight in [('Go', 1), ('GraphQL', 5), ('Git', 3)]:
+            index.add(name, weight)
+        self.assertEqual(index.complete('g'), [('GraphQL', 5), ('Git', 3)])
+        index.add('Go', 10)
+        self.assertEqual(index.complete('g'), [('Go', 11), ('GraphQL', 5)])
+
+
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        self.tokens = get_tokens_for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def test_user_is_loaded_once_then_served_from_cache(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+
+    def test_profile_update_invalidates_cached_user(self):
+        self.client.get('/api/auth/profile/')
+        self.client.patch('/api/auth/profile/update/', {'bio': 'Compilers'}, format='json')
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.data['user']['bio'], 'Compilers')
+
+    def test_cached_copy_leaves_out_the_password_hash(self):
+        self.client.get('/api/auth/profile/')
+        self.assertNotIn('password', cache.get(user_cache_key(self.user.pk, self.user.token_version)))
+        # Views that need it still get the real hash
+        response = self.client.post('/api/auth/change-password/', {
+            'current_password': 'pass12345', 'new_password': 'n3w-Passw0rd!', 'confirm_password': 'n3w-Passw0rd!'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/auth/profile/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=['is_active'])
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 401)
+
+    def test_cache_hit_still_checks_is_active(self):
+        self.client.get('/api/auth/profile/')
+        # Written behind the model's back, so nothing evicts the cached copy
+        key = user_cache_key(self.user.pk, self.user.token_version)
+        cache.set(key, {**cache.get(key), 'is_active': False})
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 401)
+
+    def test_stat_updates_refresh_the_cached_profile(self):
+        self.client.get('/api/auth/profile/')
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            user.total_hackathons_participated += 1
+            user.save(update_fields=['total_hackathons_participated'])
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.data['user']['total_hackathons'], 1)
+
+    def test_password_change_revokes_old_tokens(self):
+        response = self.client.post('/api/auth/change-password/', {
+            'current_password': 'pass12345', 'new_password': 'n3w-Passw0rd!', 'confirm_password': 'n3w-Passw0rd!'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 401)
+        self.assertEqual(self.client.get('/api/teams/unread/').status_code, 401)
+        refresh = self.client.post('/api/auth/token/refresh/', {'refresh': self.tokens['refresh']}, format='json')
+        self.assertEqual(refresh.status_code, 401)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['tokens']['access']}")
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+
+    def test_claims_only_endpoint_skips_user_lookup(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/teams/unread/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_unread'], 0)
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        self.client = APIClient()
+
+    def test_logged_out_refresh_token_is_rejected_from_cache(self):
+        refresh = get_tokens_for_user(self.user)['refresh']
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/auth/logout/', {'refresh': refresh}, format='json')
+
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/auth/token/verify/', {'token': refresh}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_clean_tokens_hit_the_blacklist_table_once(self):
+        refresh = get_tokens_for_user(self.user)['refresh']
+        with self.assertNumQueries(1):
+            self.client.post('/api/auth/token/verify/', {'token': refresh}, format='json')
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/auth/token/verify/', {'token': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_prune_tokens_deletes_only_expired_rows(self):
+        live = VersionedRefreshToken.for_user(self.user)
+        stale = VersionedRefreshToken.for_user(self.user)
+        stale.blacklist()
+        OutstandingToken.objects.filter(jti=stale['jti']).update(expires_at=timezone.now() - timedelta(days=1))
+
+        call_command('prune_tokens', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [live['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class LoginThroughputTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    @override_settings(PASSWORD_HASHERS=[
+        'users.hashers.TunedPBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ], PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_login_rehashes_with_the_active_profile(self):
+        user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        user.password = make_password('pass12345', hasher=PBKDF2SHA1PasswordHasher())
+        user.save(update_fields=['password'])
+
+        response = self.client.post('/api/auth/login/', {'email': 'ada@example.com', 'password': 'pass12345'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+    @mock.patch.object(LoginEmailThrottle, 'rate', '2/min', create=True)
+    def test_login_attempts_are_throttled_per_email(self):
+        for _ in range(2):
+            response = self.client.post('/api/auth/login/', {'email': 'nobody@example.com', 'password': 'x'}, format='json')
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/auth/login/', {'email': 'Nobody@example.com ', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post('/api/auth/login/', {'email': 'other@example.com', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch.object(LoginIPThrottle, 'rate', '2/min', create=True)
+    def test_failed_logins_are_throttled_per_ip(self):
+        for email in ['a@example.com', 'b@example.com']:
+            response = self.client.post('/api/auth/login/', {'email': email, 'password': 'x'}, format='json')
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/auth/login/', {'email': 'c@example.com', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_successful_logins_from_one_ip_are_not_throttled(self):
+        # More than the default 30/min login_ip rate, as at the start of an event behind one NAT
+        for i in range(31):
+            User.objects.create_user(username=f'u{i}', email=f'u{i}@example.com', password='pass12345', name='U')
+            response = self.client.post('/api/auth/login/', {'email': f'u{i}@example.com', 'password': 'pass12345'}, format='json')
+            self.assertEqual(response.status_code, 200, i)
+
+    @override_settings(PASSWORD_HASHERS=['users.hashers.TunedPBKDF2PasswordHasher'], PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_login_keeps_stronger_hashes(self):
+        user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        user.password = make_password('pass12345', hasher=PBKDF2PasswordHasher())
+        user.save(update_fields=['password'])
+        stored = user.password
+
+        response = self.client.post('/api/auth/login/', {'email': 'ada@example.com', 'password': 'pass12345'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertEqual(user.password, stored)
+
+    @mock.patch.object(LoginEmailThrottle, 'rate', '2/min', create=True)
+    def test_successful_logins_are_not_throttled(self):
+        User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        for _ in range(3):
+            response = self.client.post('/api/auth/login/', {'email': 'ada@example.com', 'password': 'pass12345'}, format='json')
+            self.assertEqual(response.status_code, 200)
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_bench_logins_times_the_login_endpoint(self):
+        out = StringIO()
+        call_command('bench_logins', profiles=['pbkdf2'], seconds=0.05, stdout=out)
+        self.assertIn('logins/sec/core', out.getvalue())
+        self.assertFalse(User.objects.exists())
+
+
+class EmailAvailabilityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        emails.reset()
+        self.addCleanup(emails.reset)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        self.client = APIClient()
+
+    def check(self, email):
+        return self.client.get('/api/auth/check-email/', {'email': email}).data['available']
+
+    def test_unknown_addresses_are_answered_without_a_query(self):
+        emails.get_filter()
+        with self.assertNumQueries(0):
+            self.assertTrue(self.check('grace@example.com'))
+
+    def test_registered_address_is_confirmed_in_the_database(self):
+        self.assertFalse(self.check(' ADA@example.com'))
+
+    def test_signup_rejects_a_taken_address_in_another_case(self):
+        response = self.client.post('/api/auth/signup/', {
+            'email': 'ADA@Example.com', 'name': 'Ada', 'password': 'S3cure-pass!', 'confirm_password': 'S3cure-pass!'
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.filter(email__iexact='ada@example.com').count(), 1)
+
+    def test_repeat_checks_from_one_client_are_debounced(self):
+        self.assertTrue(self.check('grace@example.com'))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.check('Grace@example.com'))
+
+    def test_filter_follows_user_creation_and_deletion(self):
+        emails.get_filter()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='grace', email='grace@example.com', password='pass12345', name='Grace')
+        self.assertTrue(emails.is_registered('grace@example.com'))
+
+        # Another process that built its filter before the signup still sees it
+        emails.reset()
+        with mock.patch.object(emails, 'build_filter', return_value=emails.BloomFilter(10)):
+            self.assertTrue(emails.is_registered('grace@example.com'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(email='grace@example.com').delete()
+        self.assertFalse(emails.is_registered('grace@example.com'))
+
+
+class PublicProfileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.ada = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada', phone_number='555')
+        self.grace = User.objects.create_user(username='grace', email='grace@example.com', password='pass12345', name='Grace')
+        self.client = APIClient()
+        self.client.force_authenticate(self.grace)
+
+    def test_profile_is_cached_and_revalidated_with_etag(self):
+        response = self.client.get(f'/api/auth/users/{self.ada.id}/')
+        self.assertEqual(response.data['user']['name'], 'Ada')
+        self.assertNotIn('phone_number', response.data['user'])
+
+        with self.assertNumQueries(0):
+            again = self.client.get(f'/api/auth/users/{self.ada.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        # The weak form compressed responses carry matches too
+        again = self.client.get(f'/api/auth/users/{self.ada.id}/', HTTP_IF_NONE_MATCH='W/' + response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_profile_update_invalidates_cached_projection(self):
+        etag = self.client.get(f'/api/auth/users/{self.grace.id}/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/auth/profile/update/', {'bio': 'COBOL'}, format='json')
+
+        response = self.client.get(f'/api/auth/users/{self.grace.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['bio'], 'COBOL')
+
+    def test_row_read_before_an_edit_is_not_cached_after_it(self):
+        entry = profiles._entry
+        edits = []
+
+        def edit_mid_read(user):
+            stale = entry(user)
+            if not edits:
+                # The edit commits between this reader's query and its cache write
+                edits.append(user.pk)
+                with self.captureOnCommitCallbacks(execute=True):
+                    grace = User.objects.get(pk=user.pk)
+                    grace.bio = 'COBOL'
+                    grace.save()
+            return stale
+
+        with mock.patch.object(profiles, '_entry', side_effect=edit_mid_read):
+            self.assertEqual(profiles.get_profiles([self.grace.id])[self.grace.id]['data']['bio'], '')
+        self.assertEqual(profiles.get_profiles([self.grace.id])[self.grace.id]['data']['bio'], 'COBOL')
+
+    def test_deleted_user_stays_out_of_the_cache(self):
+        profiles.get_profiles([self.ada.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.ada.id).delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(profiles.get_profiles([self.ada.id]), {})
+
+    def test_batch_returns_profiles_in_requested_order(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/users/', {'ids': f'{self.grace.id},999,{self.ada.id}'})
+        self.assertEqual([user['name'] for user in response.data['users']], ['Grace', 'Ada'])
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/auth/users/', {'ids': f'{self.ada.id},{self.grace.id}'})
+        self.assertEqual(self.client.get('/api/auth/users/', {'ids': 'a,b'}).status_code, 400)
+
+    def test_sparse_profile_has_its_own_etag(self):
+        full = self.client.get(f'/api/auth/users/{self.ada.id}/')
+        sparse = self.client.get(f'/api/auth/users/{self.ada.id}/', {'fields': 'id,name'})
+        self.assertEqual(sparse.data['user'], {'id': self.ada.id, 'name': 'Ada'})
+        self.assertNotEqual(sparse['ETag'], full['ETag'])
+
+        again = self.client.get(f'/api/auth/users/{self.ada.id}/?fields=id,name', HTTP_IF_NONE_MATCH=full['ETag'])
+        self.assertEqual(again.status_code, 200)
+
+
+class UserStatsReconcileTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='pass12345', name='Org')
+        self.ada = User.objects.create_user(username='ada', email='ada@example.com', password='pass12345', name='Ada')
+        self.hackathons = [
+            Hackathon.objects.create(
+                title=f'Hack {i}', organizer=self.organizer, max_participants=50,
+                start_date=now + timedelta(days=10), end_date=now + timedelta(days=12),
+                registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=5),
+            )
+            for i in range(3)
+        ]
+        for hackathon, application_status in zip(self.hackathons, ['confirmed', 'applied', 'cancelled']):
+            HackathonApplication.objects.create(user=self.ada, hackathon=hackathon, status=application_status)
+        # Drift the way the inline counters do: counted twice, never decremented
+        User.objects.filter(pk=self.ada.pk).update(total_hackathons_participated=5)
+
+    def test_full_pass_fixes_only_drifted_users(self):
+        self.assertEqual(stats.reconcile(dry_run=True), 2)
+        with self.assertNumQueries(4):
+            self.assertEqual(stats.reconcile(), 2)
+        self.assertEqual(stats.reconcile(), 0)
+
+        self.ada.refresh_from_db()
+        self.organizer.refresh_from_db()
+        self.assertEqual(self.ada.total_hackathons_participated, 2)
+        self.assertEqual(self.organizer.total_hackathons_organized, 3)
+
+    def test_incremental_pass_follows_application_changes(self):
+        stats.reconcile()
+        User.objects.filter(pk=self.organizer.pk).update(total_hackathons_organized=9)
+        HackathonApplication.objects.filter(user=self.ada, status='applied').update(
+            status='cancelled', updated_at=timezone.now()
+        )
+        HackathonApplication.objects.exclude(status='cancelled').update(updated_at=timezone.now() - timedelta(days=1))
+        Hackathon.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+        call_command('reconcile_user_stats', incremental=True, window=5, stdout=StringIO())
+
+        self.ada.refresh_from_db()
+        self.organizer.refresh_from_db()
+        self.assertEqual(self.ada.total_hackathons_participated, 1)
+        # Outside the window, so left for the next full pass
+        self.assertEqual(self.organizer.total_hackathons_organized, 9)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    prefix = 'api/auth/'
+    credentials = {'email': 'ada@example.com', 'password': 'pass12345'}
+    budgets = {
+        ('POST', 'api/auth/signup/'): Budget(9, 201, data={
+            'email': 'new@example.com', 'name': 'New', 'password': 'S3cure-pass!', 'confirm_password': 'S3cure-pass!',
+            'skills': ['Python']
+        }),
+        ('POST', 'api/auth/login/'): Budget(3, data=credentials),
+        ('POST', 'api/auth/logout/'): Budget(8, data=lambda seed: {'refresh': str(VersionedRefreshToken.for_user(seed.user))}),
+        ('POST', 'api/auth/token/'): Budget(2, data=credentials),
+        ('POST', 'api/auth/token/refresh/'): Budget(8, data=lambda seed: {'refresh': str(VersionedRefreshToken.for_user(seed.user))}),
+        ('POST', 'api/auth/token/verify/'): Budget(1, data=lambda seed: {'token': str(VersionedRefreshToken.for_user(seed.user))}),
+        ('GET', 'api/auth/profile/'): Budget(1),
+        ('PUT', 'api/auth/profile/update/'): Budget(8, data={'bio': 'Builds APIs', 'skills': ['Python', 'Go']}),
+        ('PATCH', 'api/auth/profile/update/'): Budget(3, data={'location': 'Pune'}),
+        ('GET', 'api/auth/users/'): Budget(2, data=lambda seed: {'ids': ','.join(str(m.id) for m in seed.members)}),
+        ('GET', 'api/auth/users/<int:user_id>/'): Budget(2),
+        ('POST', 'api/auth/change-password/'): Budget(5, data={
+            'current_password': 'pass12345', 'new_password': 'N3w-secure-pass', 'confirm_password': 'N3w-secure-pass'
+        }),
+        ('GET', 'api/auth/check-email/'): Budget(3, data={'email': 'taken@example.com'}),
+        ('GET', 'api/auth/skills/autocomplete/'): Budget(7, data={'q': 'py'}),
+    }
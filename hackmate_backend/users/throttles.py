@@ -0,0 +1,68 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class FailedLoginThrottle(SimpleRateThrottle):
+    """
+    Counts only failed logins, so people signing in successfully are never
+    throttled; user_login calls record_failure() when the credentials are
+    rejected. Subclasses say what the attempts are counted per.
+    """
+
+    def _recent_history(self, key):
+        return [stamp for stamp in self.cache.get(key, []) if stamp > self.now - self.duration]
+
+    def allow_request(self, request, view):
+        # Like SimpleRateThrottle.allow_request, but without recording the attempt
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        self.history = self._recent_history(self.key)
+        if len(self.history) >= self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    def record_failure(self, request):
+        key = self.get_cache_key(request, None)
+        if self.rate is None or key is None:
+            return
+        self.now = self.timer()
+        history = self._recent_history(key)
+        history.insert(0, self.now)
+        self.cache.set(key, history, self.duration)
+
+
+class LoginIPThrottle(FailedLoginThrottle):
+    """
+    Failed login attempts per client IP. Successful ones don't count, so a
+    venue full of people behind one NAT address can all sign in at once.
+    """
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginEmailThrottle(FailedLoginThrottle):
+    """Failed login attempts per account, however many IPs they come from"""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not email:
+            return None
+        # Hashed so raw addresses never end up in cache keys
+        ident = hashlib.sha256(str(email).strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class SignupIPThrottle(SimpleRateThrottle):
+    """Signups per client IP"""
+    scope = 'signup_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+
+def blacklist_cache_key(jti):
+    return f'jwt-blacklisted:{jti}'
+
+
+def _seconds_until(exp):
+    return max(int((datetime_from_epoch(exp) - aware_utcnow()).total_seconds()), 1)
+
+
+def is_blacklisted(token):
+    """
+    Blacklist lookup with a cache in front of the BlacklistedToken table.
+    Blacklisted jtis are remembered until the token expires; clean ones for
+    TOKEN_REVOCATION_CACHE_SECONDS, which bounds how long a blacklisting
+    made outside VersionedRefreshToken.blacklist() (e.g. the admin) can go
+    unnoticed.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    key = blacklist_cache_key(jti)
+    revoked = cache.get(key)
+    if revoked is None:
+        revoked = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        timeout = _seconds_until(token['exp']) if revoked else settings.TOKEN_REVOCATION_CACHE_SECONDS
+        cache.set(key, revoked, timeout)
+    return revoked
+
+
+class VersionedRefreshToken(RefreshToken):
+    """
+    Refresh token that carries the user's token_version and role. Access
+    tokens minted from it copy both claims, so CachedJWTAuthentication can
+    reject revoked tokens and ClaimsJWTAuthentication can serve read
+    endpoints without touching the database.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['ver'] = user.token_version
+        token['role'] = user.role
+        return token
+
+    def check_blacklist(self):
+        if is_blacklisted(self):
+            raise TokenError('Token is blacklisted')
+
+    def blacklist(self):
+        result = super().blacklist()
+        cache.set(blacklist_cache_key(self[api_settings.JTI_CLAIM]), True, _seconds_until(self['exp']))
+        return result
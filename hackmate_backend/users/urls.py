@@ -22,10 +22,12 @@ urlpatterns = [
     # Profile endpoints
     path('profile/', views.user_profile, name='profile'),
     path('profile/update/', views.update_profile, name='update_profile'),
+    path('users/', views.get_users_by_ids, name='get_users_by_ids'),
     path('users/<int:user_id>/', views.get_user_by_id, name='get_user_by_id'),
     
     # Utility endpoints
     path('change-password/', views.change_password, name='change_password'),
     path('check-email/', views.check_email_availability, name='check_email'),
+    path('skills/autocomplete/', views.skill_autocomplete, name='skill_autocomplete'),
     # path('check-username/', views.check_username_availability, name='check_username'),
 ]
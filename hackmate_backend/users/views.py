@@ -1,13 +1,20 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.throttling import BaseThrottle
 from rest_framework_simplejwt.views import TokenObtainPairView
 # from django.contrib.auth import update_last_login
+from django.conf import settings
+from django.core.cache import cache
 from django.db import IntegrityError
+import hashlib
 import logging
 from .models import User
+from . import autocomplete, emails, profiles
+from .authentication import forget_user, revoke_tokens
+from .throttles import LoginEmailThrottle, LoginIPThrottle, SignupIPThrottle
+from .tokens import VersionedRefreshToken
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
@@ -20,7 +27,7 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = VersionedRefreshToken.for_user(user)
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -28,6 +35,7 @@ def get_tokens_for_user(user):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([SignupIPThrottle])
 def user_signup(request):
     """
     User registration endpoint with proper error handling
@@ -73,6 +81,7 @@ def user_signup(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def user_login(request):
     """
     User login endpoint with proper error handling
@@ -95,6 +104,8 @@ def user_login(request):
             }, status=status.HTTP_200_OK)
         else:
             logger.warning(f"Login validation failed: {serializer.errors}")
+            for throttle in (LoginIPThrottle(), LoginEmailThrottle()):
+                throttle.record_failure(request)
             return Response({
                 'error': 'Login failed',
                 'details': serializer.errors
@@ -116,8 +127,9 @@ def user_logout(request):
     try:
         refresh_token = request.data.get('refresh')
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = VersionedRefreshToken(refresh_token)
             token.blacklist()
+            forget_user(request.user)
             return Response({
                 'message': 'Logout successful'
             }, status=status.HTTP_200_OK)
@@ -136,7 +148,7 @@ def user_profile(request):
     """
     Get current user profile
     """
-    serializer = UserSerializer(request.user)
+    serializer = UserSerializer(request.user, context={'request': request})
     return Response({
         'user': serializer.data
     }, status=status.HTTP_200_OK)
@@ -147,6 +159,8 @@ def update_profile(request):
     """
     Update user profile
     """
+    # request.user may be a cached copy; save on top of the current row
+    request.user.refresh_from_db()
     serializer = UserUpdateSerializer(
         request.user, 
         data=request.data, 
@@ -155,6 +169,7 @@ def update_profile(request):
     
     if serializer.is_valid():
         serializer.save()
+        forget_user(request.user)
         user_data = UserSerializer(request.user).data
         print(user_data)
         
@@ -194,10 +209,13 @@ def change_password(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     request.user.set_password(new_password)
-    request.user.save()
+    request.user.save(update_fields=['password'])
+    # Sign out every other session; the caller gets a fresh pair
+    revoke_tokens(request.user)
     
     return Response({
-        'message': 'Password changed successfully'
+        'message': 'Password changed successfully',
+        'tokens': get_tokens_for_user(request.user)
     }, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
@@ -212,7 +230,16 @@ def check_email_availability(request):
             'error': 'Email parameter is required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    is_available = not User.objects.filter(email=email).exists()
+    # The form re-checks the same address repeatedly; answer repeats from
+    # one client straight from the cache
+    key = 'email-check:%s:%s' % (
+        BaseThrottle().get_ident(request),
+        hashlib.sha256(emails.normalize_email(email).encode()).hexdigest()
+    )
+    is_available = cache.get(key)
+    if is_available is None:
+        is_available = not emails.is_registered(email)
+        cache.set(key, is_available, settings.EMAIL_CHECK_DEBOUNCE_SECONDS)
     
     return Response({
         'email': email,
@@ -239,19 +266,86 @@ def check_email_availability(request):
 #     }, status=status.HTTP_200_OK)
 
 
+def _conditional_response(request, payload, etag):
+    """200 with an ETag, or 304 if the client already holds this version"""
+    # Weak comparison: compression hands clients a W/ version of the tag
+    held = [tag.strip().removeprefix('W/') for tag in request.headers.get('If-None-Match', '').split(',')]
+    if etag in held:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(payload, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    # Let browsers keep the copy but revalidate it on every use
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_by_id(request, user_id):
     """
     Get user profile by ID
     """
-    try:
-        user = User.objects.get(id=user_id)
-        serializer = UserSerializer(user)
-        return Response({
-            'user': serializer.data
-        }, status=status.HTTP_200_OK)
-    except User.DoesNotExist:
+    profile = profiles.get_profiles([user_id]).get(user_id)
+    if profile is None:
         return Response({
             'error': 'User not found'
         }, status=status.HTTP_404_NOT_FOUND)
+
+    [profile] = profiles.select_fields([profile], request)
+    return _conditional_response(request, {'user': profile['data']}, profile['etag'])
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_users_by_ids(request):
+    """
+    Public profiles for ?ids=1,2,3 in one round trip, in the order asked.
+    Unknown ids are left out.
+    """
+    try:
+        ids = [int(value) for value in request.GET.get('ids', '').split(',') if value.strip()]
+    except ValueError:
+        return Response({
+            'error': 'ids must be a comma-separated list of user ids'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if not ids:
+        return Response({
+            'error': 'ids parameter is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > settings.PROFILE_BATCH_LIMIT:
+        return Response({
+            'error': f'At most {settings.PROFILE_BATCH_LIMIT} ids per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    found = profiles.get_profiles(ids)
+    entries = [found[user_id] for user_id in dict.fromkeys(ids) if user_id in found]
+    entries = profiles.select_fields(entries, request)
+    return _conditional_response(
+        request,
+        {'users': [entry['data'] for entry in entries]},
+        profiles.combined_etag(entries)
+    )
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def skill_autocomplete(request):
+    """
+    Suggestions for skill, tech stack and theme inputs, most used first.
+    Served from an in-memory prefix index, so keystrokes don't hit the database.
+    """
+    kind = request.query_params.get('kind', 'skill')
+    if kind not in autocomplete.KINDS:
+        return Response({
+            'error': f"kind must be one of: {', '.join(autocomplete.KINDS)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 8)), 1), 10)
+    except ValueError:
+        limit = 8
+
+    prefix = request.query_params.get('q', '')
+    suggestions = autocomplete.get_index(kind).complete(prefix, limit) if prefix.strip() else []
+    return Response({
+        'suggestions': [{'name': name, 'uses': weight} for name, weight in suggestions]
+    }, status=status.HTTP_200_OK)
@@ -21,6 +21,10 @@ const ENDPOINTS = {
     // Users (if you need user listing/search functionality)
     users: '/users/',
     userDetail: (id) => `auth/users/${id}/`,
+    usersByIds: 'auth/users/',
+
+    // Everything the dashboard shows, in one request
+    dashboard: '/dashboard/',
 };
 
 export const userServices = {
@@ -179,6 +183,26 @@ export const userServices = {
         }
     },
 
+    // Get several users' public profiles in one request
+    getUsersByIds: async (userIds) => {
+        try {
+            const response = await api.get(ENDPOINTS.usersByIds, { ids: userIds.join(',') });
+            return response.data.users;
+        } catch (error) {
+            throw new Error('Failed to fetch user details');
+        }
+    },
+
+    // Profile, applications, teams, requests and hackathons for the dashboard
+    getDashboard: async () => {
+        try {
+            const response = await api.get(ENDPOINTS.dashboard);
+            return { success: true, data: response.data };
+        } catch (error) {
+            return { success: false, error: error.message || 'Failed to fetch dashboard' };
+        }
+    },
+
     // Get current user profile
     getProfile: async () => {
         try {
@@ -212,6 +236,13 @@ export const userServices = {
     changePassword: async (passwordData) => {
         try {
             const response = await api.post(ENDPOINTS.changePassword, passwordData);
+
+            // Old tokens are revoked; keep this session on the fresh pair
+            if (response.data.tokens) {
+                api.setAuthToken(response.data.tokens.access);
+                api.setRefreshToken(response.data.tokens.refresh);
+            }
+
             return response.data;
         } catch (error) {
             throw new Error(
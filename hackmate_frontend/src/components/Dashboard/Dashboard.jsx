@@ -8,6 +8,7 @@ import {
 import { Link } from 'react-router-dom';
 import { useAuth } from '../../contexts/AuthContext';
 import hackathonServices from '../../api/hackathonServices';
+import userServices from '../../api/userServices';
 
 // Smaller, Better Banner Section
 const Banner = ({ user }) => {
@@ -388,30 +389,24 @@ const Dashboard = () => {
   useEffect(() => {
     const fetchDashboardData = async () => {
       try {
-        // Fetch hackathons
-        const hackathonsResponse = await hackathonServices.getHackathons();
+        // The public hackathon list feeds Explore; everything about the user comes from /api/dashboard/
+        const [hackathonsResponse, dashboardResponse] = await Promise.all([
+          hackathonServices.getHackathons(),
+          userServices.getDashboard(),
+        ]);
+
         if (hackathonsResponse.success) {
           setHackathons(hackathonsResponse.data.hackathons || []);
         }
 
-        // Fetch my hackathons data
-        try {
-          const myApplicationsResponse = await hackathonServices.getMyApplications();
-          const appliedCount = myApplicationsResponse.success ? (myApplicationsResponse.data.applications?.length || 0) : 0;
-
-          let organizedCount = 0;
-          if (user?.role === 'organizer' || user?.role === 'admin') { // Fixed comparison operators
-            const organizedResponse = await hackathonServices.getHackathons();
-            if (organizedResponse.success) {
-              organizedCount = (organizedResponse.data.hackathons || []).filter(h =>
-                h.organizer === user?.id || h.organizer_id === user?.id // Fixed comparison operators
-              ).length;
-            }
-          }
-
-          setMyHackathonsData({ applied: appliedCount, organized: organizedCount });
-        } catch (error) {
-          console.error('Failed to fetch my hackathons data:', error);
+        if (dashboardResponse.success) {
+          const { applications = [], user: profile } = dashboardResponse.data;
+          setMyHackathonsData({
+            applied: applications.length,
+            organized: profile?.total_hackathons_organized || 0,
+          });
+        } else {
+          console.error('Failed to fetch my hackathons data:', dashboardResponse.error);
         }
       } catch (error) {
         console.error('Failed to fetch dashboard data:', error);
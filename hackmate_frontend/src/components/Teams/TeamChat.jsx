@@ -15,18 +15,63 @@ const TeamChat = ({ teamId }) => {
   const inputRef = useRef(null);
   const { user } = useAuth();
   const pollingIntervalRef = useRef(null);
+  const socketRef = useRef(null);
 
   useEffect(() => {
     if (teamId) {
       fetchMessages();
-      startPolling();
+      connectSocket();
     }
-    return () => stopPolling();
+    return () => {
+      disconnectSocket();
+      stopPolling();
+    };
   }, [teamId]);
 
   // useEffect(() => { scrollToBottom(); }, [messages]);
 
+  // Live updates come over the team chat WebSocket; polling is only a fallback
+  // for when the socket can't be opened or drops.
+  const connectSocket = () => {
+    const token = localStorage.getItem('access_token');
+    if (!token || !window.WebSocket) {
+      startPolling();
+      return;
+    }
+    const backendUrl = import.meta.env.VITE_BACKEND_URL || 'http://localhost:8000';
+    const socket = new WebSocket(
+      `${backendUrl.replace(/^http/, 'ws')}/ws/teams/${teamId}/chat/?token=${token}`
+    );
+
+    socket.onopen = () => stopPolling();
+    socket.onmessage = (event) => handleSocketEvent(JSON.parse(event.data));
+    socket.onclose = () => {
+      if (socketRef.current === socket) {
+        socketRef.current = null;
+        startPolling();
+      }
+    };
+    socketRef.current = socket;
+  };
+
+  const disconnectSocket = () => {
+    const socket = socketRef.current;
+    socketRef.current = null;
+    if (socket) socket.close();
+  };
+
+  const handleSocketEvent = ({ type, message }) => {
+    if (type === 'message.created') {
+      setMessages(prev => prev.some(m => m.id === message.id) ? prev : [...prev, message]);
+    } else if (type === 'message.updated') {
+      setMessages(prev => prev.map(m => m.id === message.id ? message : m));
+    } else if (type === 'message.deleted') {
+      setMessages(prev => prev.filter(m => m.id !== message.id));
+    }
+  };
+
   const startPolling = () => {
+    if (pollingIntervalRef.current) return;
     pollingIntervalRef.current = setInterval(() => fetchMessages(false), 3000);
   };
 
@@ -73,9 +118,11 @@ const TeamChat = ({ teamId }) => {
     });
 
     if (res.success && res.message) {
-      // Replace temp message with real one
-      setMessages(prev => prev.filter(m => m.id !== tempMessage.id));
-      setTimeout(() => fetchMessages(false), 500);
+      // Replace temp message with real one (the socket may have delivered it already)
+      setMessages(prev => {
+        const withoutTemp = prev.filter(m => m.id !== tempMessage.id);
+        return withoutTemp.some(m => m.id === res.message.id) ? withoutTemp : [...withoutTemp, res.message];
+      });
     } else {
       // Remove temp message on error
       setMessages(prev => prev.filter(m => m.id !== tempMessage.id));